@@ -0,0 +1,114 @@
+# -*- coding: utf-8 -*-
+"""
+Compare the per-series DataFrame parser `retrieve_time_series` used before with
+the one-pass `_parse_time_series`, for decoding plus parsing of synthetic
+`cwms_ts.retrieve_time_series` JSON payloads.
+
+No database is needed.  Install `orjson` to time its decoder as well.
+
+    python benchmarks/bench_retrieve_time_series.py
+"""
+import datetime
+import json
+import timeit
+
+import numpy as np
+import pandas as pd
+
+from cwmspy.cwms_ts import _loads, _parse_time_series
+
+
+def make_payload(n_series, n_values, irregular=False, segments=4):
+    start = datetime.datetime(2000, 1, 1, tzinfo=datetime.timezone.utc)
+    step = datetime.timedelta(hours=1)
+    ts = []
+    for s in range(n_series):
+        name = f"Location{s}.Flow.Inst.1Hour.0.Best"
+        if irregular:
+            values = [
+                [(start + i * step).isoformat(), float(i), 0] for i in range(n_values)
+            ]
+            ts.append(
+                {
+                    "name": name,
+                    "irregular-interval-values": {"unit": "cms", "values": values},
+                }
+            )
+            continue
+        seg_list = []
+        for bounds in np.array_split(np.arange(n_values), segments):
+            values = [[float(i), 0] for i in bounds]
+            seg_list.append(
+                {
+                    "first-time": (start + int(bounds[0]) * step).isoformat(),
+                    "last-time": (start + int(bounds[-1]) * step).isoformat(),
+                    "value-count": len(values),
+                    "values": values,
+                }
+            )
+        ts.append(
+            {
+                "name": name,
+                "regular-interval-values": {
+                    "unit": "cms unit=cms",
+                    "segments": seg_list,
+                },
+            }
+        )
+    return json.dumps({"time-series": {"time-series": ts}})
+
+
+def per_series(payload, p_timezone="UTC"):
+    """The parser used by `retrieve_time_series` before `_parse_time_series`."""
+    ts = json.loads(payload)["time-series"]["time-series"]
+    df_list = []
+    for data in ts:
+        ts_id = data["name"]
+        riv = data.get("regular-interval-values")
+        if riv:
+            units = riv["unit"].split(" ")[0]
+            df_l = []
+            for segment in riv["segments"]:
+                date_range = pd.date_range(
+                    segment["first-time"], segment["last-time"], segment["value-count"]
+                )
+                df = pd.DataFrame(segment["values"], columns=["value", "quality_code"])
+                df.insert(0, "date_time", date_range)
+                df_l.append(df)
+            df = pd.concat(df_l)
+            df["units"] = units
+        else:
+            iiv = data["irregular-interval-values"]
+            units = iiv["unit"].split(" ")[0]
+            df = pd.DataFrame(np.array(iiv["values"]))
+            df.columns = ["date_time", "value", "quality_code"]
+            df["date_time"] = pd.to_datetime(df["date_time"])
+            df["units"] = units
+        df.insert(0, "ts_id", ts_id)
+        df_list.append(df)
+    df = pd.concat(df_list)
+    df["time_zone"] = p_timezone
+    df["value"] = df["value"].astype(float)
+    return df
+
+
+def one_pass(payload, p_timezone="UTC"):
+    return _parse_time_series(_loads(payload)["time-series"]["time-series"], p_timezone)
+
+
+if __name__ == "__main__":
+    cases = [
+        ("100 x 10k regular", 100, 10_000, False),
+        ("1000 x 100 regular", 1000, 100, False),
+        ("10 x 10k irregular", 10, 10_000, True),
+    ]
+    for label, n_series, n_values, irregular in cases:
+        payload = make_payload(n_series, n_values, irregular)
+        old_df = per_series(payload).reset_index(drop=True)
+        old_df["quality_code"] = old_df["quality_code"].astype("int64")
+        pd.testing.assert_frame_equal(old_df, one_pass(payload), check_dtype=False)
+        old = min(timeit.repeat(lambda: per_series(payload), number=1, repeat=3))
+        new = min(timeit.repeat(lambda: one_pass(payload), number=1, repeat=3))
+        print(
+            f"{label:>20}  per series: {old:.3f}s  one pass: {new:.3f}s  x{old / new:.1f}"
+        )
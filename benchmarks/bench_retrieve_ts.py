@@ -0,0 +1,63 @@
+# -*- coding: utf-8 -*-
+"""
+Compare the list-of-tuples ref cursor conversion used by `retrieve_ts` before
+the columnar fetch with `_fetch_ts_arrays`.
+
+No database is needed, rows come from an in-memory cursor that mimics the
+`fetchmany`/iteration interface of a cx_Oracle ref cursor.
+
+    python benchmarks/bench_retrieve_ts.py
+"""
+import datetime
+import timeit
+
+import pandas as pd
+
+from cwmspy.cwms_ts import _fetch_ts_arrays, _ts_frame
+
+
+class FakeRefCursor:
+    def __init__(self, rows):
+        self.rows = rows
+        self.position = 0
+        self.arraysize = 100
+        self.outputtypehandler = None
+
+    def __iter__(self):
+        while True:
+            batch = self.fetchmany(self.arraysize)
+            if not batch:
+                return
+            yield from batch
+
+    def fetchmany(self, size):
+        batch = self.rows[self.position : self.position + size]
+        self.position += len(batch)
+        return batch
+
+    def close(self):
+        pass
+
+
+def make_rows(n):
+    start = datetime.datetime(1990, 1, 1)
+    step = datetime.timedelta(minutes=15)
+    return [(start + i * step, float(i), 0) for i in range(n)]
+
+
+def list_of_tuples(rows):
+    output = [r for r in FakeRefCursor(rows)]
+    return pd.DataFrame(output, columns=["date_time", "value", "quality_code"])
+
+
+def columnar(rows):
+    return _ts_frame(*_fetch_ts_arrays(FakeRefCursor(rows)))
+
+
+if __name__ == "__main__":
+    for n in (10_000, 100_000, 1_000_000):
+        rows = make_rows(n)
+        pd.testing.assert_frame_equal(list_of_tuples(rows), columnar(rows), check_dtype=False)
+        old = min(timeit.repeat(lambda: list_of_tuples(rows), number=1, repeat=3))
+        new = min(timeit.repeat(lambda: columnar(rows), number=1, repeat=3))
+        print(f"{n:>9} rows  list: {old:.3f}s  columnar: {new:.3f}s  x{old / new:.1f}")
@@ -0,0 +1,55 @@
+# -*- coding: utf-8 -*-
+"""
+Compare the per-value time encoding `store_ts` used before with the
+vectorized `_utc_millis`, at 10k, 1M and 10M values.
+
+No database is needed, only the conversion of local times to the UTC
+millisecond arrays bound to `cwms_ts.store_ts` is timed.
+
+    python benchmarks/bench_store_ts.py
+"""
+import timeit
+
+import numpy as np
+import pandas as pd
+
+from cwmspy.cwms_ts import _utc_millis
+
+
+def per_value(times, timezone, qualities=None):
+    """The encoding used by `store_ts` before `_utc_millis`."""
+    ts = pd.to_datetime(times).tz_localize(timezone)
+    ts = [t.tz_convert("UTC") for t in ts]
+    zero = pd.Timestamp("1970-01-01", tz="UTC")
+    p_times = [((time - zero).total_seconds() * 1000) for time in ts]
+    if not qualities:
+        p_qualities = [0 for x in p_times]
+    else:
+        p_qualities = list(qualities)
+    return p_times, p_qualities
+
+
+def vectorized(times, timezone, qualities=None):
+    millis = _utc_millis(times, timezone)
+    if qualities is None or len(qualities) == 0:
+        qualities = np.zeros(len(millis), dtype="int64")
+    return millis.tolist(), np.asarray(qualities, dtype="int64").tolist()
+
+
+if __name__ == "__main__":
+    timezone = "Etc/GMT+8"
+    for n in (10_000, 1_000_000, 10_000_000):
+        times = pd.date_range("1990-01-01", periods=n, freq="15min")
+        old_times, _ = per_value(times, timezone)
+        new_times, _ = vectorized(times, timezone)
+        assert old_times == new_times
+        repeat = 3 if n < 10_000_000 else 1
+        old = min(
+            timeit.repeat(lambda: per_value(times, timezone), number=1, repeat=repeat)
+        )
+        new = min(
+            timeit.repeat(lambda: vectorized(times, timezone), number=1, repeat=repeat)
+        )
+        print(
+            f"{n:>10} values  per value: {old:.3f}s  vectorized: {new:.3f}s  x{old / new:.0f}"
+        )
@@ -63,6 +63,9 @@ Other methods include:
 
 - Pass a cx_Oracle connection to the CWMS object on instantiation
 - Pass the user, password, service_name, and host, as arguments to the connect method.
+- Pass `pool=True` to connect to back the instance with a session pool, so one
+  `CWMS` object can be shared between threads.  Pool sizing can be passed as
+  arguments or set per named profile in the `.env` file.
 
 
 ```python
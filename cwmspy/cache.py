@@ -0,0 +1,217 @@
+# -*- coding: utf-8 -*-
+"""
+In-memory result cache for time series retrievals
+
+Assign a `TsCache` to `CWMS.ts_cache` and `retrieve_ts` answers windows it has
+already seen without a round trip.  A request that only partly overlaps the
+cached windows fetches just the missing pieces.
+
+```python
+>>> from cwmspy import CWMS
+>>> from cwmspy.cache import TsCache
+>>> cwms = CWMS(ts_cache=TsCache(max_bytes=512 * 1024 ** 2))
+>>> cwms.connect()
+>>> df = cwms.retrieve_ts('Some.Fully.Qualified.Ts.Id', '2019/1/1', '2019/9/1')
+>>> df = cwms.retrieve_ts('Some.Fully.Qualified.Ts.Id', '2019/3/1', '2019/4/1')
+>>> cwms.ts_cache.stats()
+    {'hits': 1, 'partial_hits': 0, 'misses': 1, 'evictions': 0, 'entries': 1, 'bytes': 288}
+```
+"""
+import logging
+import threading
+import time
+from collections import OrderedDict
+
+import pandas as pd
+
+
+LOGGER = logging.getLogger(__name__)
+
+COLUMNS = ["date_time", "value", "quality_code"]
+
+
+class TsCache:
+    """LRU cache of retrieved time series windows, bounded by bytes.
+
+    Each key, (ts_id, units, time zone, version date, office, max version),
+    holds a sorted list of non-overlapping closed windows together with the
+    rows inside them and the last row before each window, so requests with
+    `p_previous="T"` can be answered from a sub-window too.  Windows without
+    data are cached like any other.  Whole keys are evicted, least recently
+    used first, once the cached rows exceed `max_bytes`.
+
+    Only stores made through the same `CWMS` invalidate cached windows; use
+    `max_age` when other writers keep changing recent data.
+
+    Parameters
+    ----------
+    max_bytes : int
+        Upper bound for the memory held by cached rows
+        (the default is 256 MiB).
+    max_age : float
+        Seconds after which a cached window is fetched again.  Merged
+        windows count from their oldest fetch.  None keeps windows until
+        they are evicted or invalidated (the default is None).
+    """
+
+    def __init__(self, max_bytes=256 * 1024 ** 2, max_age=None):
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.RLock()
+        self._counters = {"hits": 0, "partial_hits": 0, "misses": 0, "evictions": 0}
+
+    def retrieve(self, key, start, end, previous, fetch):
+        """Rows of `key` between `start` and `end`, fetching what is missing.
+
+        Parameters
+        ----------
+        key : tuple
+            Cache key.
+        start, end : datetime.datetime
+            Closed time window.
+        previous : bool
+            Also return the last row before `start`.
+        fetch : callable
+            `fetch(start, end)` retrieves the closed window from the database,
+            including the last row before `start`.
+
+        Returns
+        -------
+        pandas df
+            `date_time`, `value` and `quality_code` columns.
+        """
+        start, end = pd.Timestamp(start), pd.Timestamp(end)
+        with self._lock:
+            self._expire(key)
+            windows = self._entries.get(key, [])
+            gaps = _gaps(windows, start, end)
+            if key in self._entries:
+                self._entries.move_to_end(key)
+
+        if not gaps:
+            counter = "hits"
+        elif len(gaps) == 1 and gaps[0] == (start, end):
+            counter = "misses"
+        else:
+            counter = "partial_hits"
+        with self._lock:
+            self._counters[counter] += 1
+
+        for gap_start, gap_end in gaps:
+            fetched = time.monotonic()
+            df = fetch(gap_start.to_pydatetime(), gap_end.to_pydatetime())[COLUMNS]
+            before = df["date_time"] < gap_start
+            self._insert(
+                key, gap_start, gap_end, df[before].tail(1), df[~before], fetched
+            )
+
+        with self._lock:
+            for window_start, window_end, prior, df, _ in self._entries.get(key, []):
+                if window_start <= start and end <= window_end:
+                    return _slice(df, prior, start, end, previous)
+        # evicted before it could be read, the window is larger than max_bytes
+        df = fetch(start.to_pydatetime(), end.to_pydatetime())[COLUMNS]
+        before = df["date_time"] < start
+        return _slice(df[~before], df[before].tail(1), start, end, previous)
+
+    def invalidate(self, ts_id):
+        """Drop every cached window of `ts_id`, for example after a store."""
+        with self._lock:
+            ts_id = ts_id.upper()
+            for key in [k for k in self._entries if k[0].upper() == ts_id]:
+                self._bytes -= _size(self._entries.pop(key))
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self):
+        """Hit, partial hit, miss and eviction counters plus cached bytes."""
+        with self._lock:
+            stats = dict(self._counters)
+            stats["entries"] = len(self._entries)
+            stats["bytes"] = self._bytes
+        return stats
+
+    def _expire(self, key):
+        """Drop the windows of `key` older than `max_age`."""
+        if self.max_age is None or key not in self._entries:
+            return
+        oldest = time.monotonic() - self.max_age
+        windows = self._entries[key]
+        kept = [w for w in windows if w[4] >= oldest]
+        if len(kept) < len(windows):
+            self._bytes -= _size(windows) - _size(kept)
+            self._entries[key] = kept
+
+    def _insert(self, key, start, end, prior, df, fetched):
+        with self._lock:
+            windows = self._entries.pop(key, [])
+            self._bytes -= _size(windows)
+
+            merged = [start, end, prior, df, fetched]
+            before, after = [], []
+            kept = []
+            for window in windows:
+                if window[1] < merged[0] or window[0] > merged[1]:
+                    kept.append(window)
+                    continue
+                if window[0] < merged[0]:
+                    merged[2] = window[2]
+                merged[0] = min(merged[0], window[0])
+                merged[1] = max(merged[1], window[1])
+                merged[4] = min(merged[4], window[4])
+                # the fetched rows replace the cached ones inside their window
+                # and the rest is kept in database order, local times repeat
+                # in the fall back hour so they cannot be sorted or deduplicated
+                times = window[3]["date_time"]
+                before.append(window[3][times < start])
+                after.append(window[3][times > end])
+            merged[3] = pd.concat(before + [df] + after).reset_index(drop=True)
+            kept.append(tuple(merged))
+            kept.sort(key=lambda w: w[0])
+
+            self._entries[key] = kept
+            self._bytes += _size(kept)
+            while self._bytes > self.max_bytes and self._entries:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= _size(evicted)
+                self._counters["evictions"] += 1
+
+
+def _gaps(windows, start, end):
+    """Closed sub-windows of `start` to `end` not covered by `windows`."""
+    gaps = []
+    position = start
+    touched = False
+    for window_start, window_end, _, _, _ in windows:
+        if window_end < position:
+            continue
+        if window_start > end:
+            break
+        if window_start > position:
+            gaps.append((position, window_start))
+        position = max(position, window_end)
+        touched = True
+    if not touched or position < end:
+        gaps.append((position, end))
+    return gaps
+
+
+def _slice(df, prior, start, end, previous):
+    in_window = (df["date_time"] >= start) & (df["date_time"] <= end)
+    output = df[in_window]
+    if previous:
+        before = df[df["date_time"] < start].tail(1)
+        output = pd.concat([before if len(before) else prior, output])
+    return output.reset_index(drop=True)
+
+
+def _size(windows):
+    return sum(
+        int(w[3].memory_usage(index=False).sum() + w[2].memory_usage(index=False).sum())
+        for w in windows
+    )
@@ -1,11 +1,15 @@
 # -*- coding: utf-8 -*-
 
 import sys
+import re
 import cx_Oracle
 import os
 from os.path import join, dirname
 import logging
 from shutil import copyfile
+import threading
+import time
+from contextlib import contextmanager
 
 import yaml
 
@@ -14,16 +18,94 @@ from .cwms_loc import CwmsLocMixin
 from .cwms_level import CwmsLevelMixin
 from .cwms_sec import CwmsSecMixin
 from .utils import log_decorator
+from .writer import BufferedWriter
 
 
 LOGGER = logging.getLogger(__name__)
 LD = log_decorator(LOGGER)
 FORMAT = "%(levelname)s - %(asctime)s - %(name)s - %(message)s"
 
+# Session pool sizing used when neither the arguments nor the profile set it
+POOL_DEFAULTS = {"pool_min": 1, "pool_max": 4, "pool_increment": 1}
+
+# Object types used on hot paths, described and cached by `connect` so the
+# first calls do not pay for the describes
+OBJECT_TYPES = (
+    "CWMS_20.DATE_TABLE_TYPE",
+    "CWMS_20.TIMESERIES_REQ_TYPE",
+    "CWMS_20.TIMESERIES_REQ_ARRAY",
+)
+
+# Statements cached per session by the driver, the mixins use more than the
+# driver default of 20 distinct statements
+STMT_CACHE_SIZE = 40
+
+# Idle cursors kept per session by `cursor` for reuse
+MAX_FREE_CURSORS = 8
+
+# Session statistics read by `statement_cache_stats`
+STATEMENT_STATS_SQL = """
+select n.name, s.value
+from v$mystat s
+join v$statname n on n.statistic# = s.statistic#
+where n.name in ('execute count', 'parse count (total)',
+                 'parse count (hard)', 'session cursor cache hits')
+"""
+
+# Seconds after the last successful call before `is_open` pings again
+PING_INTERVAL = 60.0
+
+# Errors meaning the session is gone: end-of-file on channel, not connected,
+# connection lost, no listener, session killed, not logged on, TNS error,
+# idle time exceeded and the client side not-connected errors
+DISCONNECT_ERRORS = re.compile(
+    r"\b(ORA-03113|ORA-03114|ORA-03135|ORA-12541|ORA-00028|ORA-01012|"
+    r"ORA-12537|ORA-02396|DPI-1010|DPI-1080)\b"
+)
+ORACLE_ERROR = re.compile(r"\b(ORA|DPI)-\d{4,5}\b")
+
 
 class CWMS(CwmsLocMixin, CwmsTsMixin, CwmsLevelMixin, CwmsSecMixin):
-    def __init__(self, conn=None, verbose=False):
+    def __init__(
+        self,
+        conn=None,
+        verbose=False,
+        ts_cache=None,
+        fingerprints=None,
+        track_cursors=False,
+        ping_interval=PING_INTERVAL,
+    ):
         self.conn = conn
+        self.ts_cache = ts_cache
+        self.fingerprints = fingerprints
+        self.pool = None
+        self._local = threading.local()
+        self._pool_lock = threading.Lock()
+        self._pool_counters = {"acquired": 0, "waits": 0, "wait_seconds": 0.0}
+        # pooled sessions kept acquired between calls with their free cursors
+        self._parked = []
+        self._type_lock = threading.Lock()
+        self._types = {}
+        self._type_conn = None
+        self._type_counters = {"hits": 0, "describes": 0}
+        self._cursor_lock = threading.Lock()
+        self._cursors = {}
+        self._cursor_counters = {"opened": 0, "reused": 0}
+        # debug count of cursors handed out by `cursor` and `ref_cursor`
+        self.track_cursors = track_cursors
+        self._open_cursors = 0
+        # liveness from the outcome of real calls, see `health`
+        self.ping_interval = ping_interval
+        self._live_lock = threading.Lock()
+        self._live = {
+            "alive": None,
+            "last_ok": None,
+            "latency": None,
+            "ping_latency": None,
+            "last_error": None,
+            "failures": 0,
+            "pings": 0,
+        }
         if verbose:
             logging.basicConfig(stream=sys.stderr, level=logging.DEBUG, format=FORMAT)
         else:
@@ -39,6 +121,11 @@ class CWMS(CwmsLocMixin, CwmsTsMixin, CwmsLevelMixin, CwmsSecMixin):
         user=None,
         password=None,
         dsn=None,
+        pool=None,
+        pool_min=None,
+        pool_max=None,
+        pool_increment=None,
+        stmtcachesize=None,
     ):
         """Make connection to Oracle CWMS database. Oracle connections are
             expensive, so it is best to have a class connection for all methods.
@@ -62,6 +149,27 @@ class CWMS(CwmsLocMixin, CwmsTsMixin, CwmsLevelMixin, CwmsSecMixin):
             DB username.
         password : str
             User password.
+        pool : bool
+            Back the connection with a `cx_Oracle.SessionPool` instead of a
+            single session.  Every mixin call acquires a session from the pool
+            and releases it when it returns, so one `CWMS` instance can be
+            shared between threads.  Can also be set with `pool: true` in a
+            named `.env` profile.
+        pool_min : int
+            Number of sessions the pool opens up front (the default is 1).
+        pool_max : int
+            Maximum number of sessions in the pool (the default is 4).  The
+            pool opens one more session, held for `object_type`.
+        pool_increment : int
+            Number of sessions opened each time the pool has to grow
+            (the default is 1).
+        stmtcachesize : int
+            Number of statements the driver keeps parsed per session, so
+            repeated calls of the same shape skip the parse
+            (the default is `STMT_CACHE_SIZE`).
+
+        `pool_min`, `pool_max`, `pool_increment` and `stmtcachesize` may
+        also be set per profile in the `.env` YAML file.
 
 
         Returns
@@ -99,6 +207,14 @@ class CWMS(CwmsLocMixin, CwmsTsMixin, CwmsLevelMixin, CwmsSecMixin):
         cwms.connect(dsn='dns_string', user='user',password='password')
         `True`
 
+        # pooled sessions for threaded callers
+        import CWMS
+        cwms = CWMS()
+        cwms.connect(name='profile', pool=True, pool_min=2, pool_max=8)
+        `True`
+        cwms.pool_stats()
+        {'min': 2, 'max': 8, 'increment': 1, 'opened': 2, 'busy': 0, ...}
+
         ```
 
         """
@@ -173,19 +289,61 @@ class CWMS(CwmsLocMixin, CwmsTsMixin, CwmsLevelMixin, CwmsSecMixin):
         elif os.getenv("CWMSPY_PASSWORD"):
             conn_dict.update({"password": os.getenv("CWMSPY_PASSWORD")})
 
+        if pool is None:
+            pool = config.get("pool", False) if config else False
+        pool_dict = {}
+        for key, value in (
+            ("pool_min", pool_min),
+            ("pool_max", pool_max),
+            ("pool_increment", pool_increment),
+        ):
+            if value is None and config:
+                value = config.get(key)
+            if value is None:
+                value = POOL_DEFAULTS[key]
+            pool_dict[key] = int(value)
+        if stmtcachesize is None and config:
+            stmtcachesize = config.get("stmtcachesize")
+        if stmtcachesize is None:
+            stmtcachesize = STMT_CACHE_SIZE
+        stmtcachesize = int(stmtcachesize)
+
         # close any current open connection to minimize # of connections to DB
-        if self.is_open:
+        if self._conn is not None or self.pool is not None:
             self.close()
 
         try:
-            self.conn = cx_Oracle.connect(**conn_dict)
-            msg = f"Connected to {host}"
+            if pool:
+                # one more session than asked for holds the object types
+                self.pool = cx_Oracle.SessionPool(
+                    min=pool_dict["pool_min"] + 1,
+                    max=pool_dict["pool_max"] + 1,
+                    increment=pool_dict["pool_increment"],
+                    threaded=True,
+                    getmode=cx_Oracle.SPOOL_ATTRVAL_WAIT,
+                    **conn_dict,
+                )
+                self.pool.stmtcachesize = stmtcachesize
+                self.conn = None
+                self._type_conn = self.pool.acquire()
+                self._warm_types()
+                msg = f"Connected to {host} with a pool of {pool_dict}"
+            else:
+                # threaded so background retrievals can share the session
+                self.conn = cx_Oracle.connect(threaded=True, **conn_dict)
+                self.conn.stmtcachesize = stmtcachesize
+                self._warm_types()
+                msg = f"Connected to {host}"
             LOGGER.info(msg)
+            self._record_call(None)
             return True
         except Exception as e:
             msg = f"Failed to connect to {host}"
             LOGGER.error(msg)
             LOGGER.error(e)
+            # do not leave a half made pool or connection behind
+            self._discard_connection()
+            self._record_call(None, e, disconnected=True)
             return False
 
     @LD
@@ -199,33 +357,580 @@ class CWMS(CwmsLocMixin, CwmsTsMixin, CwmsLevelMixin, CwmsSecMixin):
             bool: The return value. True for success, False otherwise.
 
         """
-        host = self.host
-        if self.is_closed():
+        host = getattr(self, "host", None)
+        self._forget_sessions()
+        with self._live_lock:
+            self._live["alive"] = None
+            self._live["last_ok"] = None
+        if self.pool is not None:
+            try:
+                self.pool.close()
+                LOGGER.info(f"Closed session pool for {host}.")
+            except Exception as e:
+                LOGGER.error(f"Error closing session pool for {host}")
+                LOGGER.error(e)
+            self.pool = None
+            return True
+        if self._conn is None:
             LOGGER.info(f"Already disconnectd from {host}.")
             return True
-        if not self.conn:
-            return False
         try:
-            self.conn.close()
+            self._conn.close()
             LOGGER.info(f"Disconnected from {host}.")
         except Exception as e:
             LOGGER.error(f"Error disconnecting from {host}")
             LOGGER.error(e)
+        self.conn = None
         return True
 
     @LD
     def is_open(self):
-        try:
-            return self.conn.ping() is None
-        except:
+        """Whether the connection is usable, without a round trip when a call
+        succeeded in the last `ping_interval` seconds.
+
+        A connection whose last call failed with a disconnect error is
+        reported closed straight away; a pool pings one of its sessions
+        instead, since it replaces broken sessions itself.
+        """
+        if self._conn is None and self.pool is None:
             return False
+        with self._live_lock:
+            alive = self._live["alive"]
+            last_ok = self._live["last_ok"]
+        if alive is False and self.pool is None:
+            return False
+        if alive and time.monotonic() - last_ok < self.ping_interval:
+            return True
+        return self.ping()
 
     @LD
     def is_closed(self):
+        return not self.is_open()
+
+    def ping(self):
+        """Ping the database and record the round trip time.
+
+        Returns
+        -------
+        bool
+            True when the ping succeeded.
+        """
+        start = time.perf_counter()
         try:
-            return self.conn.ping() is not None
-        except:
-            return True
+            with self.session() as conn:
+                conn.ping()
+        except Exception as e:
+            with self._live_lock:
+                self._live["pings"] += 1
+            self._record_call(None, e, disconnected=True)
+            return False
+        seconds = time.perf_counter() - start
+        with self._live_lock:
+            self._live["pings"] += 1
+            self._live["ping_latency"] = seconds
+        self._record_call(seconds)
+        return True
+
+    def health(self):
+        """Last known state of the connection, without a round trip.
+
+        Returns
+        -------
+        dict
+            `alive` (None before the first call), `pooled`, `idle_seconds`
+            since the last successful call, `latency` of the last call and
+            `ping_latency` of the last ping in seconds, `last_error`,
+            `failures` in a row and `pings` made so far.
+
+        Examples
+        -------
+        ```python
+        >>> cwms.health()
+            {'alive': True, 'pooled': False, 'idle_seconds': 2.1,
+             'latency': 0.004, 'ping_latency': None, 'last_error': None,
+             'failures': 0, 'pings': 0}
+        ```
+        """
+        with self._live_lock:
+            health = dict(self._live)
+        last_ok = health.pop("last_ok")
+        health["idle_seconds"] = (
+            time.monotonic() - last_ok if last_ok is not None else None
+        )
+        health["pooled"] = self.pool is not None
+        if health["last_error"] is not None:
+            health["last_error"] = str(health["last_error"])
+        return health
+
+    def _record_call(self, seconds, error=None, disconnected=False):
+        """Update the liveness state with the outcome of a call.
+
+        A successful call marks the connection alive.  An error marks it
+        dead when it carries a disconnect code, or when `disconnected` is
+        set; any other Oracle error still proves the server answered.
+        """
+        now = time.monotonic()
+        with self._live_lock:
+            live = self._live
+            if error is None:
+                live.update(alive=True, last_ok=now, last_error=None, failures=0)
+                if seconds is not None:
+                    live["latency"] = seconds
+                return
+            message = str(error)
+            lost = disconnected or bool(DISCONNECT_ERRORS.search(message))
+            if lost:
+                live.update(alive=False, last_error=message)
+                live["failures"] += 1
+            elif ORACLE_ERROR.search(message):
+                live.update(alive=True, last_ok=now, last_error=message, failures=0)
+        if lost:
+            LOGGER.warning(f"Connection lost: {message}")
+            self._local.lost = True
+            self._renew_types()
+
+    @property
+    def conn(self):
+        """The session for the calling thread.
+
+        When pooled this is the session acquired by the innermost
+        `session()` block of the current thread, otherwise the single
+        connection made by `connect`.
+        """
+        session = getattr(self._local, "conn", None)
+        if session is not None:
+            return session
+        return self._conn
+
+    @conn.setter
+    def conn(self, conn):
+        old = getattr(self, "_conn", None)
+        if old is not None and hasattr(self, "_types"):
+            self._forget_session(old)
+        self._conn = conn
+
+    @contextmanager
+    def session(self):
+        """Acquire a pooled session for the duration of the block.
+
+        Nested blocks on the same thread reuse the session that is already
+        held, so a mixin method calling other mixin methods only takes one
+        session from the pool.  Without a pool this simply yields `conn`.
+
+        A session is parked when the block ends instead of being released,
+        and the next block on any thread takes a parked session before
+        acquiring one, so the free cursors of `cursor` survive between
+        calls.  Uncommitted work is rolled back before a session is parked.
+        Sessions of a call that lost its connection are dropped from the
+        pool, parked sessions are released by `close`.
+
+        Examples
+        -------
+        ```python
+        >>> cwms.connect(pool=True)
+        >>> with cwms.session() as conn:
+        >>>     cwms.store_ts(...)
+        >>>     conn.commit()
+        ```
+        """
+        if self.pool is None or getattr(self._local, "conn", None) is not None:
+            yield self.conn
+            return
+
+        pool = self.pool
+        with self._pool_lock:
+            conn = self._parked.pop() if self._parked else None
+            self._pool_counters["acquired"] += 1
+        if conn is None:
+            # no idle session in the pool, the acquire opens one or waits
+            waits = pool.busy >= pool.opened
+            start = time.perf_counter()
+            conn = pool.acquire()
+            waited = time.perf_counter() - start
+            with self._pool_lock:
+                self._pool_counters["wait_seconds"] += waited
+                if waits:
+                    self._pool_counters["waits"] += 1
+
+        self._local.conn = conn
+        self._local.lost = False
+        failed = False
+        try:
+            yield conn
+        except BaseException:
+            failed = True
+            raise
+        finally:
+            self._local.conn = None
+            self._park(pool, conn, failed)
+
+    def pool_stats(self):
+        """Session pool counters for sizing the pool under load.
+
+        Returns
+        -------
+        dict
+            `min`, `max`, `increment`, `opened` and `busy` as reported by the
+            pool, without the session held for `object_type`, the number of
+            `parked` sessions kept for reuse, plus `acquired`, `waits` and
+            `wait_seconds` counted by this instance.  `waits` counts the
+            acquires made while every opened session was busy, which had to
+            open a session or wait for one; `busy` and `opened` are read
+            before acquiring, so concurrent acquires may be counted either
+            way.  Empty when the connection is not pooled.
+        """
+        if self.pool is None:
+            return {}
+        held = 1 if self._type_conn is not None else 0
+        with self._pool_lock:
+            parked = len(self._parked)
+            counters = dict(self._pool_counters)
+        stats = {
+            "min": self.pool.min - 1,
+            "max": self.pool.max - 1,
+            "increment": self.pool.increment,
+            "opened": self.pool.opened - held,
+            "busy": self.pool.busy - held - parked,
+            "parked": parked,
+        }
+        stats.update(counters)
+        return stats
+
+    def object_type(self, name):
+        """The `cx_Oracle.ObjectType` `name`, described once and cached.
+
+        Hot paths do not pay a describe round trip per call, and `connect`
+        describes the `OBJECT_TYPES` they use up front.  A single
+        connection keeps its types until it is closed or replaced.  A pool
+        describes its types on an extra session held for that, so they
+        outlive the release of the sessions using them.  When a call loses
+        its connection the types are forgotten and the held session is
+        replaced; until then types are described on the calling thread's
+        session without caching.
+
+        Parameters
+        ----------
+        name : str
+            Fully qualified type name, e.g. "CWMS_20.DATE_TABLE_TYPE".
+
+        Returns
+        -------
+        cx_Oracle.ObjectType
+
+        Examples
+        -------
+        ```python
+        >>> date_table_type = cwms.object_type("CWMS_20.DATE_TABLE_TYPE")
+        >>> date_table_type.newobject([datetime.datetime(2019, 1, 1)])
+        ```
+        """
+        with self._type_lock:
+            object_type = self._types.get(name)
+            if object_type is not None:
+                self._type_counters["hits"] += 1
+                return object_type
+            conn = self._conn if self.pool is None else self._type_conn
+            if conn is not None:
+                object_type = conn.gettype(name)
+                self._types[name] = object_type
+                self._type_counters["describes"] += 1
+                return object_type
+            self._type_counters["describes"] += 1
+        with self.session() as conn:
+            return conn.gettype(name)
+
+    def type_cache_stats(self):
+        """`hits` and `describes` of `object_type` and the number of cached
+        `types`."""
+        with self._type_lock:
+            stats = dict(self._type_counters)
+            stats["types"] = len(self._types)
+        return stats
+
+    @contextmanager
+    def cursor(self, reuse=True):
+        """A cursor of the calling thread's session, closed or reused when
+        the block ends.
+
+        The cursor goes back to a per session free list when the block ends
+        without an error and is closed otherwise.  Free cursors are closed
+        when their session is closed, replaced or released to the pool.
+        Outside a `session()` block a pooled instance holds a session for the
+        block.
+
+        Parameters
+        ----------
+        reuse : bool
+            Take the cursor from and return it to the free list; use False
+            for cursors that keep state between executions, such as
+            `setinputsizes` (the default is True).
+
+        Examples
+        -------
+        ```python
+        >>> with cwms.cursor() as cur:
+        ...     cur.callfunc("cwms_ts.get_ts_code", str, [ts_id, None])
+        ```
+        """
+        with self.session(), self._session_cursor(reuse) as cur:
+            yield cur
+
+    @contextmanager
+    def _session_cursor(self, reuse):
+        conn = self.conn
+        key = id(conn)
+        cur = None
+        if reuse:
+            with self._cursor_lock:
+                free = self._cursors.setdefault(key, [])
+                cur = free.pop() if free else None
+        with self._cursor_lock:
+            self._cursor_counters["reused" if cur else "opened"] += 1
+        if cur is None:
+            try:
+                cur = conn.cursor()
+            except Exception as e:
+                self._record_call(None, e)
+                raise
+        self._track_cursor(1)
+        start = time.perf_counter()
+        try:
+            yield cur
+        except BaseException as e:
+            self._record_call(None, e)
+            try:
+                cur.close()
+            except Exception:
+                pass
+            raise
+        finally:
+            self._track_cursor(-1)
+        self._record_call(time.perf_counter() - start)
+        if reuse:
+            with self._cursor_lock:
+                free = self._cursors.get(key)
+                if free is not None and len(free) < MAX_FREE_CURSORS:
+                    free.append(cur)
+                    cur = None
+        if cur is not None:
+            cur.close()
+
+    @contextmanager
+    def ref_cursor(self, cur):
+        """A `cx_Oracle.CURSOR` variable of `cur` whose ref cursor is closed
+        when the block ends.
+
+        Examples
+        -------
+        ```python
+        >>> with cwms.cursor() as cur, cwms.ref_cursor(cur) as p_rc:
+        ...     cur.callproc("cwms_ts.retrieve_ts", [p_rc, ...])
+        ...     rows = p_rc.getvalue().fetchall()
+        ```
+        """
+        var = cur.var(cx_Oracle.CURSOR)
+        self._track_cursor(1)
+        try:
+            yield var
+        finally:
+            self._track_cursor(-1)
+            try:
+                rc = var.getvalue()
+                if rc is not None:
+                    rc.close()
+            except Exception:
+                pass
+
+    def open_cursors(self):
+        """Number of cursors handed out by `cursor` and `ref_cursor` that are
+        still in use, counted when created with `track_cursors=True`."""
+        with self._cursor_lock:
+            return self._open_cursors
+
+    def _track_cursor(self, n):
+        if not self.track_cursors:
+            return
+        with self._cursor_lock:
+            self._open_cursors += n
+        self._local.open_cursors = getattr(self._local, "open_cursors", 0) + n
+
+    def _thread_cursors(self):
+        return getattr(self._local, "open_cursors", 0)
+
+    def statement_cache_stats(self):
+        """Cursor reuse and statement parse counters of this session.
+
+        Returns
+        -------
+        dict
+            `cursors_opened` and `cursors_reused` by `cursor`, the
+            `stmtcachesize` of the session and, when the user may read
+            `v$mystat`, the session's `execute count`, `parse count (total)`,
+            `parse count (hard)` and `session cursor cache hits`.
+            `executions_without_parse` is `execute count` less
+            `parse count (total)`, the executions the driver statement cache
+            spared a parse call.
+        """
+        with self._cursor_lock:
+            stats = {f"cursors_{k}": v for k, v in self._cursor_counters.items()}
+        try:
+            with self.session() as conn, self.cursor() as cur:
+                stats["stmtcachesize"] = conn.stmtcachesize
+                cur.execute(STATEMENT_STATS_SQL)
+                stats.update(dict(cur.fetchall()))
+        except Exception as e:
+            LOGGER.warning(f"Could not read session statistics: {e}")
+            return stats
+        if "execute count" in stats and "parse count (total)" in stats:
+            stats["executions_without_parse"] = (
+                stats["execute count"] - stats["parse count (total)"]
+            )
+        return stats
+
+    def _forget_session(self, conn):
+        if self.pool is None:
+            self._forget_types()
+        with self._cursor_lock:
+            free = self._cursors.pop(id(conn), [])
+        for cur in free:
+            try:
+                cur.close()
+            except Exception:
+                pass
+
+    def _forget_sessions(self):
+        self._forget_types()
+        with self._cursor_lock:
+            free = [c for cursors in self._cursors.values() for c in cursors]
+            self._cursors.clear()
+        for cur in free:
+            try:
+                cur.close()
+            except Exception:
+                pass
+        with self._pool_lock:
+            parked, self._parked = self._parked, []
+        for conn in parked:
+            try:
+                self.pool.release(conn)
+            except Exception:
+                pass
+
+    def _park(self, pool, conn, failed):
+        """Keep a pooled session for the next `session()` block, or drop it
+        from the pool when a call on it lost the connection."""
+        lost = getattr(self._local, "lost", False)
+        # release used to roll back uncommitted work, keep that for parking
+        if not lost and (failed or getattr(conn, "transaction_in_progress", True)):
+            try:
+                conn.rollback()
+            except Exception:
+                lost = True
+        if not lost and pool is self.pool:
+            with self._pool_lock:
+                self._parked.append(conn)
+            return
+        self._forget_session(conn)
+        try:
+            if lost:
+                pool.drop(conn)
+            else:
+                pool.release(conn)
+        except Exception:
+            pass
+
+    def _forget_types(self):
+        with self._type_lock:
+            self._types.clear()
+            conn, self._type_conn = self._type_conn, None
+        if conn is not None:
+            try:
+                self.pool.release(conn)
+            except Exception:
+                pass
+
+    def _renew_types(self):
+        """Forget the types after a lost connection and replace the session
+        a pool holds for them."""
+        with self._type_lock:
+            self._types.clear()
+            conn, self._type_conn = self._type_conn, None
+        pool = self.pool
+        if pool is None:
+            return
+        if conn is not None:
+            try:
+                pool.drop(conn)
+            except Exception:
+                pass
+        try:
+            conn = pool.acquire()
+        except Exception as e:
+            LOGGER.warning(f"Could not replace the object type session: {e}")
+            return
+        with self._type_lock:
+            if self._type_conn is None and self.pool is pool:
+                self._type_conn, conn = conn, None
+        if conn is not None:
+            pool.release(conn)
+        else:
+            self._warm_types()
+
+    def _discard_connection(self):
+        pool, self.pool = self.pool, None
+        with self._type_lock:
+            self._types.clear()
+            self._type_conn = None
+        if pool is not None:
+            try:
+                pool.close(force=True)
+            except Exception:
+                pass
+        with self._pool_lock:
+            self._parked = []
+        conn = self._conn
+        self.conn = None
+        if conn is not None:
+            try:
+                conn.close()
+            except Exception:
+                pass
+
+    def _warm_types(self):
+        for name in OBJECT_TYPES:
+            try:
+                self.object_type(name)
+            except Exception as e:
+                LOGGER.warning(f"Could not describe {name}: {e}")
+
+    def buffered_writer(self, **kwargs):
+        """Create a `cwmspy.writer.BufferedWriter` storing through this
+        instance.
+
+        Parameters
+        ----------
+        **kwargs
+            Flush thresholds, backpressure limit and `store_by_df` arguments,
+            see `cwmspy.writer.BufferedWriter`.
+
+        Returns
+        -------
+        cwmspy.writer.BufferedWriter
+            Running writer, close it or use it as a context manager.
+
+        Examples
+        -------
+        ```python
+        >>> from cwmspy import CWMS
+        >>> cwms = CWMS()
+        >>> cwms.connect(pool=True)
+            True
+        >>> with cwms.buffered_writer(max_rows=5000, max_age=2.0) as writer:
+        ...     writer.write('Some.Fully.Qualified.Cwms.Ts.ID', 'cms',
+        ...                  ['2019/1/1 01:00'], [1.5])
+        ```
+        """
+        return BufferedWriter(self, **kwargs)
 
     @staticmethod
     def add_env(filename):
@@ -16,7 +16,7 @@ from .utils import log_decorator
 
 
 LOGGER = logging.getLogger(__name__)
-LD = log_decorator(LOGGER)
+LD = log_decorator(LOGGER, session=True)
 
 
 class CwmsLevelMixin:
@@ -87,34 +87,31 @@ class CwmsLevelMixin:
         p_end_time = pd.to_datetime(p_end_time).to_pydatetime().strftime("%Y-%m-%d")
 
         try:
-            cur = self.conn.cursor()
-
-            bind_vars = {
-                "p_location_level_id": p_location_level_id,
-                "p_level_units": p_level_units,
-                "p_start_time": p_start_time,
-                "p_end_time": p_end_time,
-                "p_timezone_id": p_timezone_id,
-                "p_office_id": p_office_id,
-            }
-
-            LOGGER.info("Start retrieve_location_level_values.")
-            cur.execute(
-                """
-                select * from table( cwms_level.retrieve_location_level_values(
-                p_location_level_id =>:p_location_level_id,
-                p_level_units       =>:p_level_units,
-                p_start_time        =>to_date( :p_start_time, 'yyyy-mm-dd' ),
-                p_end_time          =>to_date( :p_end_time, 'yyyy-mm-dd' ),
-                p_timezone_id       =>:p_timezone_id,
-                p_office_id         =>:p_office_id ) )""",
-                bind_vars,
-            )
-            records = cur.fetchall()
-            cur.close()
+            with self.cursor() as cur:
+                bind_vars = {
+                    "p_location_level_id": p_location_level_id,
+                    "p_level_units": p_level_units,
+                    "p_start_time": p_start_time,
+                    "p_end_time": p_end_time,
+                    "p_timezone_id": p_timezone_id,
+                    "p_office_id": p_office_id,
+                }
+
+                LOGGER.info("Start retrieve_location_level_values.")
+                cur.execute(
+                    """
+                    select * from table( cwms_level.retrieve_location_level_values(
+                    p_location_level_id =>:p_location_level_id,
+                    p_level_units       =>:p_level_units,
+                    p_start_time        =>to_date( :p_start_time, 'yyyy-mm-dd' ),
+                    p_end_time          =>to_date( :p_end_time, 'yyyy-mm-dd' ),
+                    p_timezone_id       =>:p_timezone_id,
+                    p_office_id         =>:p_office_id ) )""",
+                    bind_vars,
+                )
+                records = cur.fetchall()
         except Exception as e:
             LOGGER.error("Error in retrieve_location_level_values.")
-            cur.close()
             # print bind_vars
             raise ValueError(e.__str__())
         result = []
@@ -156,14 +153,6 @@ class CwmsLevelMixin:
         if p_units:
             p_units = "|".join(p_units)
 
-        cur = self.conn.cursor()
-
-        p_results = cur.var(cx_Oracle.CLOB)
-        p_date_time = cur.var(cx_Oracle.DATETIME)
-        p_query_time = cur.var(int)
-        p_format_time = cur.var(int)
-        p_count = cur.var(int)
-
         if p_start:
             p_start = pd.to_datetime(p_start).strftime("%Y-%m-%d")
         if p_end:
@@ -173,31 +162,34 @@ class CwmsLevelMixin:
             )
 
         try:
-
-            clob = cur.callproc(
-                "cwms_level.retrieve_location_levels",
-                [
-                    p_results,
-                    p_date_time,
-                    p_query_time,
-                    p_format_time,
-                    p_count,
-                    p_names,
-                    p_format,
-                    p_units,
-                    p_datums,
-                    p_start,
-                    p_end,
-                    p_timezone,
-                    p_office_id,
-                ],
-            )
-
+            with self.cursor() as cur:
+                p_results = cur.var(cx_Oracle.CLOB)
+                p_date_time = cur.var(cx_Oracle.DATETIME)
+                p_query_time = cur.var(int)
+                p_format_time = cur.var(int)
+                p_count = cur.var(int)
+
+                clob = cur.callproc(
+                    "cwms_level.retrieve_location_levels",
+                    [
+                        p_results,
+                        p_date_time,
+                        p_query_time,
+                        p_format_time,
+                        p_count,
+                        p_names,
+                        p_format,
+                        p_units,
+                        p_datums,
+                        p_start,
+                        p_end,
+                        p_timezone,
+                        p_office_id,
+                    ],
+                )
         except Exception as e:
             LOGGER.error("Error in retrieving time series")
-            cur.close()
             raise ValueError(e)
-        cur.close()
         try:
             result = json.loads(clob[0].read())
             if as_json:
@@ -8,7 +8,7 @@ import cx_Oracle
 import pandas as pd
 
 LOGGER = logging.getLogger(__name__)
-LD = log_decorator(LOGGER)
+LD = log_decorator(LOGGER, session=True)
 
 
 class CwmsLocMixin:
@@ -94,36 +94,34 @@ class CwmsLocMixin:
         ```
 
         """
-        cur = self.conn.cursor()
         LOGGER.info("Start store_location.")
         try:
-            cur.callproc(
-                "cwms_loc.store_location",
-                [
-                    p_location_id,
-                    p_location_type,
-                    p_elevation,
-                    p_elev_unit_id,
-                    p_vertical_datum,
-                    p_latitude,
-                    p_longitude,
-                    p_horizontal_datum,
-                    p_public_name,
-                    p_long_name,
-                    p_description,
-                    p_time_zone_id,
-                    p_country_name,
-                    p_state_initial,
-                    p_active,
-                    p_ignorenulls,
-                    p_db_office_id,
-                ],
-            )
+            with self.cursor() as cur:
+                cur.callproc(
+                    "cwms_loc.store_location",
+                    [
+                        p_location_id,
+                        p_location_type,
+                        p_elevation,
+                        p_elev_unit_id,
+                        p_vertical_datum,
+                        p_latitude,
+                        p_longitude,
+                        p_horizontal_datum,
+                        p_public_name,
+                        p_long_name,
+                        p_description,
+                        p_time_zone_id,
+                        p_country_name,
+                        p_state_initial,
+                        p_active,
+                        p_ignorenulls,
+                        p_db_office_id,
+                    ],
+                )
         except Exception as e:
             LOGGER.error("Error in store location.")
-            cur.close()
             raise ValueError(e)
-        cur.close()
         return True
 
     @LD
@@ -183,16 +181,14 @@ class CwmsLocMixin:
 
         """
         LOGGER.info("Start delete_location")
-        cur = self.conn.cursor()
         try:
-            cur.callproc(
-                "cwms_loc.delete_location",
-                [p_location_id, p_delete_action, p_db_office_id],
-            )
+            with self.cursor() as cur:
+                cur.callproc(
+                    "cwms_loc.delete_location",
+                    [p_location_id, p_delete_action, p_db_office_id],
+                )
         except Exception as e:
             LOGGER.error(e)
-            cur.close()
-        cur.close()
         LOGGER.info("End delete_location")
         return True
 
@@ -231,57 +227,54 @@ class CwmsLocMixin:
 
         LOGGER.info("Start retrieve_location")
 
-        cur = self.conn.cursor()
-        # The below are out parameters.  You need to pass in out parameters to the
-        # procedure if they are listed of the correct type.
-        p_location_type = cur.var(cx_Oracle.STRING)
-        p_elevation = cur.var(cx_Oracle.NUMBER)
-        p_vertical_datum = cur.var(cx_Oracle.STRING)
-        p_latitude = cur.var(cx_Oracle.NUMBER)
-        p_longitude = cur.var(cx_Oracle.NUMBER)
-        p_horizontal_datum = cur.var(cx_Oracle.STRING)
-        p_public_name = cur.var(cx_Oracle.STRING)
-        p_long_name = cur.var(cx_Oracle.STRING)
-        p_description = cur.var(cx_Oracle.STRING)
-        p_time_zone_id = cur.var(cx_Oracle.STRING)
-        p_county_name = cur.var(cx_Oracle.STRING)
-        p_state_initial = cur.var(cx_Oracle.STRING)
-        p_active = cur.var(cx_Oracle.STRING)
-        p_alias_cursor = cur.var(cx_Oracle.CURSOR)
+        with self.cursor() as cur, self.ref_cursor(cur) as p_alias_cursor:
+            # The below are out parameters.  You need to pass in out parameters to the
+            # procedure if they are listed of the correct type.
+            p_location_type = cur.var(cx_Oracle.STRING)
+            p_elevation = cur.var(cx_Oracle.NUMBER)
+            p_vertical_datum = cur.var(cx_Oracle.STRING)
+            p_latitude = cur.var(cx_Oracle.NUMBER)
+            p_longitude = cur.var(cx_Oracle.NUMBER)
+            p_horizontal_datum = cur.var(cx_Oracle.STRING)
+            p_public_name = cur.var(cx_Oracle.STRING)
+            p_long_name = cur.var(cx_Oracle.STRING)
+            p_description = cur.var(cx_Oracle.STRING)
+            p_time_zone_id = cur.var(cx_Oracle.STRING)
+            p_county_name = cur.var(cx_Oracle.STRING)
+            p_state_initial = cur.var(cx_Oracle.STRING)
+            p_active = cur.var(cx_Oracle.STRING)
 
-        # These are all of the out parameters that will be returned
-        out_list = [
-            p_location_id,
-            p_location_type,
-            p_elevation,
-            p_vertical_datum,
-            p_latitude,
-            p_longitude,
-            p_horizontal_datum,
-            p_public_name,
-            p_long_name,
-            p_description,
-            p_time_zone_id,
-            p_county_name,
-            p_state_initial,
-            p_active,
-            p_alias_cursor,
-        ]
+            # These are all of the out parameters that will be returned
+            out_list = [
+                p_location_id,
+                p_location_type,
+                p_elevation,
+                p_vertical_datum,
+                p_latitude,
+                p_longitude,
+                p_horizontal_datum,
+                p_public_name,
+                p_long_name,
+                p_description,
+                p_time_zone_id,
+                p_county_name,
+                p_state_initial,
+                p_active,
+                p_alias_cursor,
+            ]
 
-        try:
-            in_list = out_list.copy()
-            in_list.insert(1, p_elev_unit_id)
-            in_list += [p_db_office_id]
-            cur.callproc(
-                "cwms_loc.retrieve_location", in_list,
-            )
-        except ValueError as e:
-            LOGGER.error("Error in retrieve_location.")
-            cur.close()
-            raise ValueError(e)
-        cur.close()
+            try:
+                in_list = out_list.copy()
+                in_list.insert(1, p_elev_unit_id)
+                in_list += [p_db_office_id]
+                cur.callproc(
+                    "cwms_loc.retrieve_location", in_list,
+                )
+            except ValueError as e:
+                LOGGER.error("Error in retrieve_location.")
+                raise ValueError(e)
+            alias = [r for r in p_alias_cursor.getvalue()]
         LOGGER.info("End retrieve_location")
-        alias = [r for r in p_alias_cursor.getvalue()]
 
         out_dict = [
             {
@@ -14,7 +14,7 @@ from .utils import log_decorator
 
 
 LOGGER = logging.getLogger(__name__)
-LD = log_decorator(LOGGER)
+LD = log_decorator(LOGGER, session=True)
 
 
 class CwmsSecMixin:
@@ -31,16 +31,14 @@ class CwmsSecMixin:
         list or pandas df
             USERNAME', 'ACCOUNT_STATUS', 'LOCK_DATE', 'EXPIRY_DATE'
         """
-        cur = self.conn.cursor()
         sql = "select * from table(cwms_sec.cat_locked_users_tab)"
 
         try:
-            locked_users = cur.execute(sql).fetchall()
+            with self.cursor() as cur:
+                locked_users = cur.execute(sql).fetchall()
         except ValueError as e:
             LOGGER.error("Error in retrieve_locked_users.")
-            cur.close()
             raise ValueError(e)
-        cur.close()
         if (return_df):
             df = pd.DataFrame(locked_users)
             df.columns = ['USERNAME', 'ACCOUNT_STATUS', 'LOCK_DATE', 'EXPIRY_DATE']
@@ -63,15 +61,13 @@ class CwmsSecMixin:
         -------
         Returns True if operation was successful
         """
-        cur = self.conn.cursor()
         try:
-            cur.callproc('cwms_sec.unlock_db_account', [p_username])
+            with self.cursor() as cur:
+                cur.callproc('cwms_sec.unlock_db_account', [p_username])
             LOGGER.info(f'Account {p_username} is unlocked successfully')
         except ValueError as e:
             LOGGER.error("Error in unlocking users.")
-            cur.close()
             raise ValueError(e)
-        cur.close()
         return True
 
 
@@ -90,13 +86,11 @@ class CwmsSecMixin:
         -------
         Returns True if operation was successful
         """
-        cur = self.conn.cursor()
         try:
-            cur.callproc('cwms_sec.lock_db_account', [p_username])
+            with self.cursor() as cur:
+                cur.callproc('cwms_sec.lock_db_account', [p_username])
             LOGGER.info(f'Account {p_username} is locked successfully')
         except ValueError as e:
             LOGGER.error("Error in locking users.")
-            cur.close()
             raise ValueError(e)
-        cur.close()
         return True
@@ -6,18 +6,608 @@ import cx_Oracle
 import datetime
 import pandas as pd
 from dateutil import tz
-import pytz
 import logging
 from itertools import combinations
 import numpy as np
 import json
+import re
+import threading
+import time
 from json import JSONDecodeError
+from concurrent.futures import ThreadPoolExecutor
 
-from .utils import log_decorator
+from .utils import log_decorator, run_concurrent
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 
 LOGGER = logging.getLogger(__name__)
-LD = log_decorator(LOGGER)
+LD = log_decorator(LOGGER, session=True)
+# Methods fanning out to workers hold no session, every worker takes its own
+LD_FANOUT = log_decorator(LOGGER)
+
+# Rows pulled per round trip when draining a time series ref cursor
+FETCH_BATCH_SIZE = 5000
+
+# dtypes of the date_time, value and quality_code arrays built from a fetch
+TS_DTYPES = ("datetime64[ns]", "float64", "int64")
+
+# Length of the sub-windows retrieved by iter_ts and iter_por
+ITER_WINDOW = datetime.timedelta(days=365)
+
+# Number of time series bound per executemany call in get_extents_bulk
+EXTENTS_BATCH_SIZE = 1000
+
+# Limits for one cwms_ts.retrieve_time_series call made by retrieve_time_series
+TIME_SERIES_BATCH_SIZE = 200
+TIME_SERIES_BATCH_VALUES = 2000000
+
+# Chunk sizes, in values, and wanted seconds per call of store_ts_chunked
+STORE_CHUNK_SIZE = 50000
+STORE_MIN_CHUNK_SIZE = 1000
+STORE_MAX_CHUNK_SIZE = 1000000
+STORE_CHUNK_SECONDS = 5.0
+
+# Values sent per cwms_ts.store_ts_multi call by store_ts_multi
+STORE_MULTI_BATCH_VALUES = 200000
+
+# Runs of at least this many values on a regular interval are rewritten
+# with "DELETE INSERT" by the run planner of store_by_df
+BLOCK_ROWS = 500
+
+# Times per DATE_TABLE_TYPE collection tried first by delete_by_df; halved
+# on DELETE_SIZE_ERRORS down to DELETE_SAFE_BATCH_SIZE, which the server
+# always accepted
+DELETE_BATCH_SIZE = 10000
+DELETE_SAFE_BATCH_SIZE = 200
+
+# Errors of a collection too large for the server: too many expressions,
+# subscript beyond limit, index out of range, operand exceeds system limits
+# and out of process or PGA memory
+DELETE_SIZE_ERRORS = re.compile(
+    r"\b(ORA-01795|ORA-06532|ORA-22165|ORA-22813|ORA-04030|ORA-04036)\b"
+)
+_DELETE_SIZE_LOCK = threading.Lock()
+
+# Runs of at least this many values on a regular interval are deleted by
+# delete_by_df with one time window instead of a list of times
+DELETE_WINDOW_ROWS = 100
+
+# Minutes per interval unit of the interval part of a time series identifier
+INTERVAL_RE = re.compile(r"^~?(\d+)(Minute|Hour|Day|Week|Month|Year|Decade)s?$")
+INTERVAL_MINUTES = {
+    "Minute": 1,
+    "Hour": 60,
+    "Day": 1440,
+    "Week": 10080,
+    "Month": 43200,
+    "Year": 525600,
+    "Decade": 5256000,
+}
+# Irregular series and wildcards are estimated as hourly
+DEFAULT_INTERVAL_MINUTES = 60
+
+# Unknown identifiers get null extents, any other error is returned per row
+# instead of failing the whole batch
+EXTENTS_SQL = """
+begin
+    :error := null;
+    :min_date := cwms_ts.get_ts_min_date(:ts_id, :time_zone, :version_date, :office_id);
+    :max_date := cwms_ts.get_ts_max_date(:ts_id, :time_zone, :version_date, :office_id);
+exception
+    when no_data_found then
+        :min_date := null;
+        :max_date := null;
+    when others then
+        :min_date := null;
+        :max_date := null;
+        if sqlcode != -20001 or instr(sqlerrm, 'TS_ID_NOT_FOUND') = 0 then
+            :error := sqlerrm;
+        end if;
+end;
+"""
+
+# The TIMESERIES_ARRAY of cwms_ts.store_ts_multi built on the server from
+# flat arrays, so no object is made per value on the client; :counts is the
+# number of values of each series and the times are UTC milliseconds
+STORE_MULTI_SQL = """
+declare
+    l_ts_ids dbms_sql.varchar2_table := :ts_ids;
+    l_units dbms_sql.varchar2_table := :units;
+    l_counts dbms_sql.number_table := :counts;
+    l_times dbms_sql.number_table := :times;
+    l_values dbms_sql.binary_double_table := :vals;
+    l_qualities dbms_sql.number_table := :qualities;
+    l_array cwms_20.timeseries_array := cwms_20.timeseries_array();
+    l_data cwms_20.tsv_array;
+    l_row pls_integer := 0;
+begin
+    for i in 1 .. l_ts_ids.count loop
+        l_data := cwms_20.tsv_array();
+        l_data.extend(l_counts(i));
+        for j in 1 .. l_counts(i) loop
+            l_row := l_row + 1;
+            l_data(j) := cwms_20.tsv_type(
+                from_tz(cwms_util.to_timestamp(l_times(l_row)), 'UTC'),
+                l_values(l_row),
+                l_qualities(l_row)
+            );
+        end loop;
+        l_array.extend;
+        l_array(l_array.count) := cwms_20.timeseries_type(
+            l_ts_ids(i), l_units(i), l_data
+        );
+    end loop;
+    cwms_ts.store_ts_multi(
+        l_array, :store_rule, :override_prot, :version_date, :office_id
+    );
+end;
+"""
+
+
+def _ts_output_type_handler(cursor, name, default_type, size, precision, scale):
+    """Fetch `value` as a native double and `quality_code` as a native int
+    so no `Decimal` objects are built per row."""
+    if default_type != cx_Oracle.NUMBER:
+        return None
+    if name.lower() == "quality_code":
+        return cursor.var(cx_Oracle.NATIVE_INT, arraysize=cursor.arraysize)
+    return cursor.var(cx_Oracle.NATIVE_FLOAT, arraysize=cursor.arraysize)
+
+
+def _fetch_ts_arrays(ref_cursor, batch_size=FETCH_BATCH_SIZE):
+    """Drain a `date_time, value, quality_code` ref cursor into NumPy arrays.
+
+    Rows are fetched `batch_size` at a time and written straight into
+    preallocated `datetime64[ns]`, `float64` and `int64` arrays, so the full
+    result never exists as a list of tuples.  cx_Oracle only fetches rows,
+    so one tuple and one datetime per row still exist for the length of a
+    batch.  The arrays returned are views of those buffers, not copies.
+    Quality codes are kept as `int64` because protected data sets bit 31.
+
+    Parameters
+    ----------
+    ref_cursor : cx_Oracle.Cursor
+        Ref cursor returned by a `cwms_ts.retrieve_ts*` procedure.
+    batch_size : int
+        Number of rows fetched per round trip.
+
+    Returns
+    -------
+    tuple of np.ndarray
+        `date_time`, `value` and `quality_code` arrays of equal length.
+    """
+    ref_cursor.arraysize = batch_size
+    ref_cursor.outputtypehandler = _ts_output_type_handler
+
+    capacity = batch_size
+    date_time, value, quality_code = [np.empty(capacity, dtype) for dtype in TS_DTYPES]
+    n = 0
+    while True:
+        rows = ref_cursor.fetchmany(batch_size)
+        if not rows:
+            break
+        m = len(rows)
+        if n + m > capacity:
+            capacity = max(2 * capacity, n + m)
+            date_time = _grow(date_time, capacity)
+            value = _grow(value, capacity)
+            quality_code = _grow(quality_code, capacity)
+        times, values, qualities = zip(*rows)
+        # pandas converts datetime objects far faster than a NumPy assignment
+        date_time[n : n + m] = pd.DatetimeIndex(times).values
+        # None values become NaN on assignment to a float64 array
+        value[n : n + m] = values
+        try:
+            quality_code[n : n + m] = qualities
+        except TypeError:
+            quality_code[n : n + m] = [q or 0 for q in qualities]
+        n += m
+    ref_cursor.close()
+
+    # views, the unused tail of the buffers is at most one growth step
+    return date_time[:n], value[:n], quality_code[:n]
+
+
+def _grow(array, capacity):
+    grown = np.empty(capacity, dtype=array.dtype)
+    grown[: len(array)] = array
+    return grown
+
+
+def _utc_millis(times, timezone, format=None):
+    """Times localized to `timezone` as int64 UTC milliseconds since the
+    epoch, the time encoding of `cwms_ts.store_ts`, in one NumPy operation."""
+    ts = pd.DatetimeIndex(pd.to_datetime(times, format=format))
+    if ts.tz is None:
+        ts = ts.tz_localize(timezone)
+    ts = ts.tz_convert("UTC").tz_localize(None)
+    return ts.values.astype("datetime64[ms]").view("int64")
+
+
+def _store_arrays(times, values, timezone, qualities=None, format=None):
+    """UTC milliseconds, float64 values and int64 qualities for
+    `cwms_ts.store_ts`; missing qualities are 0."""
+    millis = _utc_millis(times, timezone, format)
+    values = np.asarray(values, dtype="float64")
+    if qualities is None or len(qualities) == 0:
+        qualities = np.zeros(len(millis), dtype="int64")
+    return millis, values, np.asarray(qualities, dtype="int64")
+
+
+def _store_groups(df, timezone=None):
+    """`((ts_id, units, time_zone), df)` groups of a frame to store.
+
+    Every column is coerced once, `date_time` to naive `datetime64[ns]`,
+    `value` to float64 and `quality_code` to int64 (0 when missing), without
+    copying `df`.  The rows are put in group and time order with a single
+    sort, skipped when they already are, and each group frame wraps slices of
+    those arrays.
+    """
+    if "time_zone" in df.columns or not timezone:
+        time_zone = df["time_zone"]
+    else:
+        time_zone = pd.Series(timezone, index=df.index)
+    codes = df.groupby([df["ts_id"], df["units"], time_zone], sort=True).ngroup()
+    codes = codes.values
+    if codes.dtype.kind == "f":
+        # rows with a missing key are not stored, like groupby drops them
+        codes = np.where(np.isnan(codes), -1, codes).astype("int64")
+
+    date_time = pd.to_datetime(df["date_time"])
+    if date_time.dt.tz is not None:
+        date_time = date_time.dt.tz_localize(None)
+    columns = {
+        "date_time": date_time.values.astype("datetime64[ns]", copy=False),
+        "value": np.asarray(df["value"].values, dtype="float64"),
+        "quality_code": (
+            np.asarray(df["quality_code"].fillna(0).values, dtype="int64")
+            if "quality_code" in df.columns
+            else np.zeros(len(df), dtype="int64")
+        ),
+    }
+    keys = [df["ts_id"].values, df["units"].values, time_zone.values]
+
+    times = columns["date_time"]
+    if len(codes) and np.any(
+        (codes[1:] < codes[:-1])
+        | ((codes[1:] == codes[:-1]) & (times[1:] < times[:-1]))
+    ):
+        order = np.lexsort((times, codes))
+        codes = codes[order]
+        columns = {k: v[order] for k, v in columns.items()}
+        keys = [k[order] for k in keys]
+
+    starts = np.flatnonzero(np.diff(codes, prepend=-2))
+    ends = np.append(starts[1:], len(codes))
+    groups = []
+    for start, end in zip(starts, ends):
+        if codes[start] < 0:
+            continue
+        group = pd.DataFrame({k: v[start:end] for k, v in columns.items()}, copy=False)
+        groups.append((tuple(k[start] for k in keys), group))
+    return groups
+
+
+def _changed_rows(new, current, tolerance=0.0):
+    """Rows of `new` that are not stored in `current` yet.
+
+    Both frames are matched on `date_time` by sorting and a binary search.  A
+    row is unchanged when the stored value is within `tolerance`, both values
+    are missing, and, unless both values are missing, the quality codes are
+    equal.
+    """
+    if current is None or current.empty:
+        return new
+    new = new.sort_values("date_time", kind="mergesort")
+    current = current.sort_values("date_time", kind="mergesort")
+
+    new_times = new["date_time"].values.astype("datetime64[ns]")
+    stored_times = current["date_time"].values.astype("datetime64[ns]")
+    position = np.searchsorted(stored_times, new_times)
+    position = np.minimum(position, len(stored_times) - 1)
+    found = stored_times[position] == new_times
+
+    new_values = new["value"].values.astype("float64")
+    stored_values = current["value"].values.astype("float64")[position]
+    both_missing = np.isnan(new_values) & np.isnan(stored_values)
+    same_value = both_missing | (np.abs(new_values - stored_values) <= tolerance)
+    same_quality = (
+        new["quality_code"].values.astype("int64")
+        == current["quality_code"].values.astype("int64")[position]
+    )
+    unchanged = found & same_value & (same_quality | both_missing)
+    return new[~unchanged]
+
+
+def _interval_ms(ts_id):
+    """Fixed interval of `ts_id` in milliseconds, None for irregular and
+    calendar (month and longer) intervals."""
+    parts = ts_id.split(".")
+    match = INTERVAL_RE.match(parts[3]) if len(parts) == 6 else None
+    if not match or parts[3].startswith("~"):
+        return None
+    minutes = int(match.group(1)) * INTERVAL_MINUTES[match.group(2)]
+    if not minutes or minutes > INTERVAL_MINUTES["Week"]:
+        return None
+    return minutes * 60000
+
+
+def _plan_runs(
+    new_data, interval_ms, p_store_rule="REPLACE ALL", block_rows=BLOCK_ROWS
+):
+    """Split the changed rows of a time sorted group into contiguous runs and
+    pick a store rule for each.
+
+    `new_data` keeps the positional index of the group it was taken from, so
+    a run ends where an unchanged row was dropped or, for regular series,
+    where the time step differs from `interval_ms`.  With `"REPLACE ALL"`,
+    runs of at least `block_rows` regular values are rewritten with
+    `"DELETE INSERT"`, one window delete plus insert; every other run keeps
+    `p_store_rule`.
+
+    Returns
+    -------
+    list of dict
+        `start`, `end` (row positions in `new_data`), `start_time`,
+        `end_time`, `rows` and `action` of every run.
+    """
+    positions = new_data.index.values
+    times = new_data["date_time"].values.astype("datetime64[ms]").view("int64")
+    breaks = np.diff(positions) != 1
+    if interval_ms:
+        breaks |= np.diff(times) != interval_ms
+    starts = np.flatnonzero(np.r_[True, breaks])
+    ends = np.append(starts[1:], len(positions))
+
+    runs = []
+    for start, end in zip(starts.tolist(), ends.tolist()):
+        rows = end - start
+        block = p_store_rule == "REPLACE ALL" and interval_ms and rows >= block_rows
+        runs.append(
+            {
+                "start": start,
+                "end": end,
+                "start_time": new_data["date_time"].iloc[start],
+                "end_time": new_data["date_time"].iloc[end - 1],
+                "rows": rows,
+                "action": "DELETE INSERT" if block else p_store_rule,
+            }
+        )
+    return runs
+
+
+def _delete_plan(date_time, time_zone, interval_ms, window_rows=DELETE_WINDOW_ROWS):
+    """Split the times of a group to delete into time windows and lists.
+
+    Times are compared in UTC, so runs never span a repeated hour.  A run of
+    at least `window_rows` times `interval_ms` apart becomes an inclusive
+    window; a regular series has no value between two of its interval
+    times, so the window deletes exactly the times of the run.
+
+    Returns
+    -------
+    tuple
+        `[(start, end)]` windows and the other times, both as naive UTC
+        datetimes, and the times that could not be put in UTC (ambiguous or
+        missing in `time_zone`, or an unknown `time_zone`) as given.
+    """
+    local = pd.DatetimeIndex(pd.to_datetime(date_time)).tz_localize(None)
+    local = local.unique().sort_values()
+    try:
+        utc = local.tz_localize(time_zone, ambiguous="NaT", nonexistent="NaT")
+    except Exception:
+        return [], [], list(local.to_pydatetime())
+    valid = ~utc.isna()
+    others = list(local[~valid].to_pydatetime())
+    utc = utc[valid].tz_convert("UTC").tz_localize(None).sort_values()
+
+    millis = utc.values.astype("datetime64[ms]").view("int64")
+    windows = []
+    in_window = np.zeros(len(utc), dtype=bool)
+    if interval_ms and len(utc):
+        starts = np.flatnonzero(np.r_[True, np.diff(millis) != interval_ms])
+        ends = np.append(starts[1:], len(utc))
+        for start, end in zip(starts.tolist(), ends.tolist()):
+            if end - start >= window_rows:
+                windows.append(
+                    (utc[start].to_pydatetime(), utc[end - 1].to_pydatetime())
+                )
+                in_window[start:end] = True
+    return windows, list(utc[~in_window].to_pydatetime()), others
+
+
+def _millis_to_datetime(millis):
+    return pd.Timestamp(int(millis), unit="ms").to_pydatetime()
+
+
+def _estimate_values(ts_id, start, end):
+    """Rough number of values of `ts_id` between `start` and `end`, from the
+    interval part of the identifier."""
+    parts = ts_id.split(".")
+    match = INTERVAL_RE.match(parts[3]) if len(parts) == 6 else None
+    if match:
+        minutes = int(match.group(1)) * INTERVAL_MINUTES[match.group(2)]
+    else:
+        minutes = DEFAULT_INTERVAL_MINUTES
+    return int((end - start).total_seconds() // 60 // max(minutes, 1)) + 1
+
+
+def _batch_ts_ids(ts_ids, units, start, end, batch_size, batch_values):
+    """Split `ts_ids` and their `units` into `(ts_ids, units)` batches of at
+    most `batch_size` identifiers and, where possible, `batch_values`
+    estimated values."""
+    units = list(units or [])
+    if units:
+        # the last unit applies to all remaining identifiers
+        units = [units[min(i, len(units) - 1)] for i in range(len(ts_ids))]
+
+    batches = []
+    ids, values = [], 0
+    for i, ts_id in enumerate(ts_ids):
+        estimate = _estimate_values(ts_id, start, end)
+        if ids and (len(ids) == batch_size or values + estimate > batch_values):
+            batches.append(ids)
+            ids, values = [], 0
+        ids.append(i)
+        values += estimate
+    if ids:
+        batches.append(ids)
+
+    output = []
+    for ids in batches:
+        batch_units = [units[i] for i in ids] if units else []
+        while len(batch_units) > 1 and batch_units[-1] == batch_units[-2]:
+            batch_units.pop()
+        output.append(([ts_ids[i] for i in ids], batch_units))
+    return output
+
+
+def _split_window(start, end, window):
+    """Split `start` to `end` into consecutive `(start, end)` windows no
+    longer than `window`; each window ends where the next one starts."""
+    windows = []
+    while start + window < end:
+        windows.append((start, start + window))
+        start = start + window
+    windows.append((start, end))
+    return windows
+
+
+def _loads(payload):
+    """Decode JSON with orjson when it is installed."""
+    if orjson is not None:
+        # orjson.JSONDecodeError subclasses json.JSONDecodeError
+        return orjson.loads(payload)
+    return json.loads(payload)
+
+
+def _parse_times(strings):
+    """Parse time strings in one call.
+
+    Returns the times as int64 nanoseconds, in UTC when the strings carry an
+    offset, and the time zone of the strings, if any.
+    """
+    try:
+        times = pd.to_datetime(strings)
+    except ValueError:
+        times = None
+    if not isinstance(times, pd.DatetimeIndex):
+        # mixed offsets, e.g. across a daylight saving change
+        times = pd.to_datetime(strings, utc=True)
+    tz = times.tz
+    if tz is not None:
+        times = times.tz_convert("UTC").tz_localize(None)
+    return times.values.astype("datetime64[ns]").view("int64"), tz
+
+
+def _parse_time_series(ts, p_timezone):
+    """Build one DataFrame from the `time-series` list of a
+    `cwms_ts.retrieve_time_series` JSON payload.
+
+    Sizes are counted first so every segment of every series is written into
+    single preallocated arrays; regular segment times are computed for all
+    segments at once from their first and last times.  Times keep the UTC
+    offset they carry in the payload, as `pd.to_datetime` gives them.
+    """
+    names = []
+    units = []
+    counts = []
+    reg_firsts = []
+    reg_lasts = []
+    reg_counts = []
+    # (position in the output, values) for regular and irregular blocks
+    reg_blocks = []
+    irr_blocks = []
+    position = 0
+    for data in ts:
+        n = 0
+        riv = data.get("regular-interval-values")
+        if riv:
+            unit = riv["unit"]
+            for segment in riv["segments"]:
+                values = segment["values"]
+                reg_firsts.append(segment["first-time"])
+                reg_lasts.append(segment["last-time"])
+                reg_counts.append(len(values))
+                reg_blocks.append((position + n, values))
+                n += len(values)
+        else:
+            iiv = data["irregular-interval-values"]
+            unit = iiv["unit"]
+            values = iiv["values"]
+            irr_blocks.append((position + n, values))
+            n += len(values)
+        names.append(data["name"])
+        units.append(unit.split(" ")[0])
+        counts.append(n)
+        position += n
+
+    if not names:
+        return pd.DataFrame()
+
+    total = position
+    date_time = np.empty(total, dtype="int64")
+    value = np.empty(total, dtype="float64")
+    quality_code = np.empty(total, dtype="int64")
+    tz = None
+
+    if reg_blocks:
+        reg_counts = np.asarray(reg_counts, dtype="int64")
+        first, tz = _parse_times(reg_firsts)
+        last, _ = _parse_times(reg_lasts)
+        step = (last - first) // np.maximum(reg_counts - 1, 1)
+        starts = np.asarray([p for p, _ in reg_blocks], dtype="int64")
+        segment = np.repeat(np.arange(len(reg_blocks)), reg_counts)
+        offset = np.arange(len(segment)) - np.repeat(
+            np.cumsum(reg_counts) - reg_counts, reg_counts
+        )
+        rows = np.repeat(starts, reg_counts) + offset
+        date_time[rows] = first[segment] + offset * step[segment]
+        pairs = np.array(
+            [pair for _, values in reg_blocks for pair in values], dtype="float64"
+        ).reshape(-1, 2)
+        value[rows] = pairs[:, 0]
+        quality_code[rows] = np.nan_to_num(pairs[:, 1]).astype("int64")
+
+    if irr_blocks:
+        rows = np.concatenate(
+            [np.arange(p, p + len(values)) for p, values in irr_blocks]
+        )
+        triples = [triple for _, values in irr_blocks for triple in values]
+        times, irr_tz = _parse_times([t[0] for t in triples])
+        tz = tz or irr_tz
+        date_time[rows] = times
+        pairs = np.array([t[1:] for t in triples], dtype="float64").reshape(-1, 2)
+        value[rows] = pairs[:, 0]
+        quality_code[rows] = np.nan_to_num(pairs[:, 1]).astype("int64")
+
+    date_time = pd.DatetimeIndex(date_time.view("datetime64[ns]"))
+    if tz is not None:
+        # times keep the offset of the payload, `p_timezone` only names it
+        date_time = date_time.tz_localize("UTC").tz_convert(tz)
+
+    return pd.DataFrame(
+        {
+            "ts_id": np.repeat(np.array(names, dtype=object), counts),
+            "date_time": date_time,
+            "value": value,
+            "quality_code": quality_code,
+            "units": np.repeat(np.array(units, dtype=object), counts),
+            "time_zone": p_timezone,
+        }
+    )
+
+
+def _ts_frame(date_time, value, quality_code):
+    """Wrap fetched arrays in a DataFrame without copying them."""
+    return pd.DataFrame(
+        {"date_time": date_time, "value": value, "quality_code": quality_code},
+        copy=False,
+    )
 
 
 class CwmsTsMixin:
@@ -52,20 +642,17 @@ class CwmsTsMixin:
         ```
         """
 
-        cur = self.conn.cursor()
         try:
-
-            ts_code = cur.callfunc(
-                "cwms_ts.get_ts_code",
-                cx_Oracle.STRING,
-                [p_cwms_ts_id, p_db_office_code],
-            )
+            with self.cursor() as cur:
+                ts_code = cur.callfunc(
+                    "cwms_ts.get_ts_code",
+                    cx_Oracle.STRING,
+                    [p_cwms_ts_id, p_db_office_code],
+                )
         except Exception as e:
             LOGGER.error("Error retrieving ts_code")
-            cur.close()
             raise ValueError(e.__str__())
         LOGGER.info(f"get_ts_code returned {ts_code}")
-        cur.close()
 
         return ts_code
 
@@ -109,20 +696,17 @@ class CwmsTsMixin:
         ```
         """
         p_version_date = datetime.datetime.strptime(version_date, "%Y/%m/%d")
-        cur = self.conn.cursor()
         try:
-
-            max_date = cur.callfunc(
-                "cwms_ts.get_ts_max_date",
-                cx_Oracle.DATETIME,
-                [p_cwms_ts_id, p_time_zone, p_version_date, p_office_id],
-            )
+            with self.cursor() as cur:
+                max_date = cur.callfunc(
+                    "cwms_ts.get_ts_max_date",
+                    cx_Oracle.DATETIME,
+                    [p_cwms_ts_id, p_time_zone, p_version_date, p_office_id],
+                )
         except Exception as e:
-            cur.close()
             LOGGER.error("Error retrieving get_ts_max_date")
             raise ValueError(e.__str__())
         LOGGER.info(f"max_date returned {max_date}")
-        cur.close()
 
         return max_date
 
@@ -170,20 +754,17 @@ class CwmsTsMixin:
         """
 
         p_version_date = datetime.datetime.strptime(version_date, "%Y/%m/%d")
-        cur = self.conn.cursor()
         try:
-
-            min_date = cur.callfunc(
-                "cwms_ts.get_ts_min_date",
-                cx_Oracle.DATETIME,
-                [p_cwms_ts_id, p_time_zone, p_version_date, p_office_id],
-            )
+            with self.cursor() as cur:
+                min_date = cur.callfunc(
+                    "cwms_ts.get_ts_min_date",
+                    cx_Oracle.DATETIME,
+                    [p_cwms_ts_id, p_time_zone, p_version_date, p_office_id],
+                )
         except Exception as e:
             LOGGER.error("Error in retrieving get_ts_min_date")
-            cur.close()
             raise ValueError(e.__str__())
         LOGGER.info(f"get_ts_min_date returned {min_date}")
-        cur.close()
 
         return min_date
 
@@ -195,20 +776,17 @@ class CwmsTsMixin:
         p_start_time = pd.to_datetime(start_time).to_pydatetime()
         p_end_time = pd.to_datetime(end_time).to_pydatetime()
         # FUNCTION DATE TIME EXAMPLE
-        cur = self.conn.cursor()
-        date_table_type = self.conn.gettype("CWMS_20.DATE_TABLE_TYPE")
+        date_table_type = self.object_type("CWMS_20.DATE_TABLE_TYPE")
         try:
-            date_table_time = cur.callfunc(
-                "cwms_ts.get_times_for_time_window",
-                date_table_type,
-                [p_start_time, p_end_time, p_ts_id, p_time_zone, p_office_id],
-            )
-            cur.close()
-            return date_table_time
-
+            with self.cursor() as cur:
+                date_table_time = cur.callfunc(
+                    "cwms_ts.get_times_for_time_window",
+                    date_table_type,
+                    [p_start_time, p_end_time, p_ts_id, p_time_zone, p_office_id],
+                )
+                return date_table_time
         except Exception as e:
             LOGGER.error(f"Error retrieving ts_code {e}")
-            cur.close()
             raise ValueError(e.__str__())
         return 0
 
@@ -303,56 +881,53 @@ class CwmsTsMixin:
         else:
             p_version_date = pd.to_datetime(version_date).to_pydatetime()
 
-        cur = self.conn.cursor()
-        p_at_tsv_rc = self.conn.cursor().var(cx_Oracle.CURSOR)
-        p_units_out = cur.var(cx_Oracle.STRING)
-        p_cwms_ts_id_out = cur.var(cx_Oracle.STRING)
-        try:
-
-            cur.callproc(
-                "cwms_ts.retrieve_ts_out",
-                [
-                    p_at_tsv_rc,
-                    p_cwms_ts_id_out,
-                    p_units_out,
-                    p_cwms_ts_id,
-                    p_units,
-                    p_start_time,
-                    p_end_time,
-                    p_timezone,
-                    p_trim,
-                    p_start_inclusive,
-                    p_end_inclusive,
-                    p_previous,
-                    p_next,
-                    p_version_date,
-                    p_max_version,
-                    p_office_id,
-                ],
-            )
-
-        except Exception as e:
-            LOGGER.error("Error in retrieving time series.")
-            cur.close()
-            raise ValueError(e.__str__())
-        cur.close()
+        with self.cursor() as cur, self.ref_cursor(cur) as p_at_tsv_rc:
+            p_units_out = cur.var(cx_Oracle.STRING)
+            p_cwms_ts_id_out = cur.var(cx_Oracle.STRING)
+            try:
+                cur.callproc(
+                    "cwms_ts.retrieve_ts_out",
+                    [
+                        p_at_tsv_rc,
+                        p_cwms_ts_id_out,
+                        p_units_out,
+                        p_cwms_ts_id,
+                        p_units,
+                        p_start_time,
+                        p_end_time,
+                        p_timezone,
+                        p_trim,
+                        p_start_inclusive,
+                        p_end_inclusive,
+                        p_previous,
+                        p_next,
+                        p_version_date,
+                        p_max_version,
+                        p_office_id,
+                    ],
+                )
+            except Exception as e:
+                LOGGER.error("Error in retrieving time series.")
+                raise ValueError(e.__str__())
 
-        output = [r for r in p_at_tsv_rc.getvalue()]
+            if return_df:
+                output = _ts_frame(*_fetch_ts_arrays(p_at_tsv_rc.getvalue()))
+            else:
+                output = [r for r in p_at_tsv_rc.getvalue()]
+            ts_id_out = p_cwms_ts_id_out.getvalue()
+            units_out = p_units_out.getvalue()
         output_len = len(output)
         LOGGER.info(f"Found {output_len} records.")
 
         if return_df:
-            output = pd.DataFrame(
-                output, columns=["date_time", "value", "quality_code"]
-            )
             output["time_zone"] = p_timezone
-            output["ts_id"] = p_cwms_ts_id_out.getvalue()
+            output["ts_id"] = ts_id_out
             output["alias"] = p_cwms_ts_id
-            output["units"] = p_units_out.getvalue()
+            output["units"] = units_out
 
         return output
 
-    @LD
+    @LD_FANOUT
     def retrieve_time_series(
         self,
         ts_ids,
@@ -363,6 +938,9 @@ class CwmsTsMixin:
         p_timezone="UTC",
         p_office_id=None,
         as_json=False,
+        batch_size=TIME_SERIES_BATCH_SIZE,
+        batch_values=TIME_SERIES_BATCH_VALUES,
+        max_workers=1,
     ):
         """Retreives time series in a number of formats for a combination 
         time window, timezone, formats, and vertical datums 
@@ -418,6 +996,20 @@ class CwmsTsMixin:
             The office to retrieve time series for. 
             If unspecified or NULL, time series for all offices in the database 
             that match the other criteria will be retrieved.
+        as_json : bool
+            Return the decoded JSON instead of a dataframe. The
+            `time-series` lists of all batches are merged into the first one.
+        batch_size : int
+            Maximum number of identifiers sent in one request
+            (the default is `TIME_SERIES_BATCH_SIZE`).
+        batch_values : int
+            Approximate maximum number of values requested at once, estimated
+            from the interval of each identifier and the time window
+            (the default is `TIME_SERIES_BATCH_VALUES`). An identifier that
+            alone exceeds it gets a batch of its own.
+        max_workers : int
+            Number of batches retrieved at the same time, each on its own
+            session when connected with `pool=True` (the default is 1).
 
         Returns
         -------
@@ -443,19 +1035,6 @@ class CwmsTsMixin:
         ```
         """
 
-        p_names = "|".join(ts_ids)
-        p_units = "|".join(units)
-
-        cur = self.conn.cursor()
-
-        p_results = cur.var(cx_Oracle.CLOB)
-        p_date_time = cur.var(cx_Oracle.DATETIME)
-        p_query_time = cur.var(int)
-        p_format_time = cur.var(int)
-        p_ts_count = cur.var(int)
-        p_value_count = cur.var(int)
-
-        p_format = "JSON"
         if p_start:
             p_start = pd.to_datetime(p_start).strftime("%Y-%m-%d")
         if p_end:
@@ -464,90 +1043,103 @@ class CwmsTsMixin:
                 "%Y-%m-%d"
             )
 
-        try:
+        end = (
+            pd.to_datetime(p_end)
+            if p_end
+            else pd.Timestamp.now("UTC").tz_localize(None)
+        )
+        start = pd.to_datetime(p_start) if p_start else end - datetime.timedelta(1)
+        batches = _batch_ts_ids(ts_ids, units, start, end, batch_size, batch_values)
+        if len(batches) > 1:
+            LOGGER.info(
+                f"Retrieving {len(ts_ids)} time series in {len(batches)} batches"
+            )
 
-            clob = cur.callproc(
-                "cwms_ts.retrieve_time_series",
-                [
-                    p_results,
-                    p_date_time,
-                    p_query_time,
-                    p_format_time,
-                    p_ts_count,
-                    p_value_count,
-                    p_names,
-                    p_format,
-                    p_units,
-                    p_datums,
-                    p_start,
-                    p_end,
-                    p_timezone,
-                    p_office_id,
-                ],
+        def retrieve(batch):
+            batch_ts_ids, batch_units = batch
+            return self._retrieve_time_series(
+                batch_ts_ids,
+                batch_units,
+                p_datums,
+                p_start,
+                p_end,
+                p_timezone,
+                p_office_id,
             )
 
-        except Exception as e:
+        results, failed = run_concurrent(retrieve, batches, max_workers=max_workers)
+        if failed:
             LOGGER.error("Error in retrieving time series")
-            cur.close()
-            raise ValueError(e.__str__())
-        cur.close()
-        try:
-            result = json.loads(clob[0].read())
-            if as_json:
-                return result
-        except JSONDecodeError as e:
+            raise failed[0][1]
+        results = [result for result in results if result is not None]
+        if not results:
             LOGGER.info("No data for the requested pathnames and dates.")
             return pd.DataFrame()
 
-        try:
-            ts = result["time-series"]["time-series"]
-        except KeyError:
-            LOGGER.warning("No data found")
-            return pd.DataFrame()
+        ts = []
+        for result in results:
+            try:
+                ts.extend(result["time-series"]["time-series"])
+            except KeyError:
+                continue
 
-        df_list = []
-        for data in ts:
-            ts_id = data["name"]
+        if as_json:
+            if len(results) > 1 and "time-series" in results[0]:
+                results[0]["time-series"]["time-series"] = ts
+            return results[0]
 
-            riv = data.get("regular-interval-values")
-            if riv:
+        if not ts:
+            LOGGER.warning("No data found")
+            return pd.DataFrame()
 
-                segments = riv["segments"]
-                units = riv["unit"].split(" ")[0]
-                df_l = []
-                for segment in segments:
-                    first_time = segment["first-time"]
-                    last_time = segment["last-time"]
-                    value_count = segment["value-count"]
+        return _parse_time_series(ts, p_timezone)
 
-                    values = segment["values"]
+    @LD
+    def _retrieve_time_series(
+        self, ts_ids, units, p_datums, p_start, p_end, p_timezone, p_office_id
+    ):
+        """One `cwms_ts.retrieve_time_series` call, returning the decoded
+        JSON or None when the response is not JSON."""
+        p_names = "|".join(ts_ids)
+        p_units = "|".join(units)
 
-                    date_range = pd.date_range(first_time, last_time, value_count)
-                    df = pd.DataFrame(values, columns=["value", "quality_code"])
-                    df.insert(0, "date_time", date_range)
-                    df_l.append(df)
-                df = pd.concat(df_l)
-                df["units"] = units
+        p_format = "JSON"
 
-            else:
-                iiv = data["irregular-interval-values"]
-                units = iiv["unit"].split(" ")[0]
-                values = np.array(iiv["values"])
-                df = pd.DataFrame(values)
-                df.columns = ["date_time", "value", "quality_code"]
-                df["date_time"] = pd.to_datetime(df["date_time"])
-                df["units"] = units
-
-            df.insert(0, "ts_id", ts_id)
-            df_list.append(df)
         try:
-            df = pd.concat(df_list)
-            df["time_zone"] = p_timezone
-            df["value"] = df["value"].astype(float)
-        except ValueError:
-            df = pd.DataFrame()
-
-        return df
+            with self.cursor() as cur:
+                p_results = cur.var(cx_Oracle.CLOB)
+                p_date_time = cur.var(cx_Oracle.DATETIME)
+                p_query_time = cur.var(int)
+                p_format_time = cur.var(int)
+                p_ts_count = cur.var(int)
+                p_value_count = cur.var(int)
+
+                clob = cur.callproc(
+                    "cwms_ts.retrieve_time_series",
+                    [
+                        p_results,
+                        p_date_time,
+                        p_query_time,
+                        p_format_time,
+                        p_ts_count,
+                        p_value_count,
+                        p_names,
+                        p_format,
+                        p_units,
+                        p_datums,
+                        p_start,
+                        p_end,
+                        p_timezone,
+                        p_office_id,
+                    ],
+                )
+        except Exception as e:
+            LOGGER.error("Error in retrieving time series")
+            raise ValueError(e.__str__())
+        try:
+            return _loads(clob[0].read())
+        except JSONDecodeError:
+            return None
 
     @LD
     def retrieve_ts(
@@ -608,6 +1200,10 @@ class CwmsTsMixin:
         return_df : bool
             Return result as pandas df.
 
+        If `ts_cache` is set (see `cwmspy.cache.TsCache`) data frame
+        requests with `p_trim="F"`, `p_next="F"` and inclusive start and end
+        are answered from the cache where possible.
+
         Returns
         -------
         list or pandas df
@@ -645,44 +1241,56 @@ class CwmsTsMixin:
         else:
             p_version_date = pd.to_datetime(version_date).to_pydatetime()
 
-        cur = self.conn.cursor()
-        p_at_tsv_rc = self.conn.cursor().var(cx_Oracle.CURSOR)
-        try:
+        args = [
+            p_cwms_ts_id,
+            p_units,
+            p_start_time,
+            p_end_time,
+            p_timezone,
+            p_trim,
+            p_start_inclusive,
+            p_end_inclusive,
+            p_previous,
+            p_next,
+            p_version_date,
+            p_max_version,
+            p_office_id,
+        ]
 
-            cur.callproc(
-                "cwms_ts.retrieve_ts",
-                [
-                    p_at_tsv_rc,
-                    p_cwms_ts_id,
-                    p_units,
-                    p_start_time,
-                    p_end_time,
-                    p_timezone,
-                    p_trim,
-                    p_start_inclusive,
-                    p_end_inclusive,
-                    p_previous,
-                    p_next,
-                    p_version_date,
-                    p_max_version,
-                    p_office_id,
-                ],
+        cache = getattr(self, "ts_cache", None)
+        cacheable = (
+            return_df
+            and p_trim == "F"
+            and p_start_inclusive == "T"
+            and p_end_inclusive == "T"
+            and p_next == "F"
+        )
+        if cache is not None and cacheable:
+            key = (
+                p_cwms_ts_id,
+                p_units,
+                p_timezone,
+                p_version_date,
+                p_office_id,
+                p_max_version,
             )
 
-        except Exception as e:
-            LOGGER.error("Error in retrieving time series.")
-            cur.close()
-            raise ValueError(e.__str__())
-        cur.close()
+            def fetch(start, end):
+                # always ask for the previous value so sub-windows can use it
+                window = args.copy()
+                window[2:4] = [start, end]
+                window[8] = "T"
+                return self._retrieve_ts(window, return_df=True)
 
-        output = [r for r in p_at_tsv_rc.getvalue()]
+            output = cache.retrieve(
+                key, p_start_time, p_end_time, p_previous == "T", fetch
+            )
+        else:
+            output = self._retrieve_ts(args, return_df=return_df)
         output_len = len(output)
         LOGGER.info(f"Found {output_len} records.")
 
         if return_df:
-            output = pd.DataFrame(
-                output, columns=["date_time", "value", "quality_code"]
-            )
             output["time_zone"] = p_timezone
             output["ts_id"] = p_cwms_ts_id
             if p_units:
@@ -690,6 +1298,191 @@ class CwmsTsMixin:
 
         return output
 
+    def _invalidate_cache(self, p_cwms_ts_id):
+        """Forget cached windows of a time series after it was changed."""
+        cache = getattr(self, "ts_cache", None)
+        if cache is not None:
+            cache.invalidate(p_cwms_ts_id)
+
+    def _fingerprint_filter(
+        self, p_cwms_ts_id, p_units, version_date, p_office_id, arrays
+    ):
+        """Drop the days of `(millis, values, qualities)` that were stored
+        unchanged before, see `cwmspy.fingerprint.TsFingerprints`.
+
+        Returns the remaining arrays and the hashes to record once they are
+        stored; without `fingerprints` everything is kept.
+        """
+        fingerprints = getattr(self, "fingerprints", None)
+        if fingerprints is None:
+            return arrays, None
+        key = (p_cwms_ts_id, p_units, version_date, p_office_id)
+        mask, hashes = fingerprints.changed(key, *arrays)
+        return tuple(a[mask] for a in arrays), (key, hashes)
+
+    def _fingerprint_update(self, update):
+        if update is not None:
+            self.fingerprints.update(*update)
+
+    def _fingerprint_invalidate(self, p_cwms_ts_id):
+        fingerprints = getattr(self, "fingerprints", None)
+        if fingerprints is not None:
+            fingerprints.invalidate(p_cwms_ts_id)
+
+    def _retrieve_ts(self, args, return_df=True):
+        """Call `cwms_ts.retrieve_ts` with everything but the ref cursor."""
+        with self.cursor() as cur, self.ref_cursor(cur) as p_at_tsv_rc:
+            try:
+                cur.callproc("cwms_ts.retrieve_ts", [p_at_tsv_rc] + args)
+            except Exception as e:
+                LOGGER.error("Error in retrieving time series.")
+                raise ValueError(e.__str__())
+
+            if return_df:
+                return _ts_frame(*_fetch_ts_arrays(p_at_tsv_rc.getvalue()))
+            return [r for r in p_at_tsv_rc.getvalue()]
+
+    @LD
+    def retrieve_ts_multi(
+        self,
+        ts_ids,
+        start_time,
+        end_time,
+        units=None,
+        p_timezone="UTC",
+        p_trim="F",
+        p_start_inclusive="T",
+        p_end_inclusive="T",
+        p_previous="T",
+        p_next="F",
+        version_date=None,
+        p_max_version="T",
+        p_office_id=None,
+        return_df=True,
+    ):
+        """Retrieves many time series for one time window in a single round
+            trip with `cwms_ts.retrieve_ts_multi`.
+
+        Parameters
+        ----------
+        ts_ids : list
+            The time series identifiers to retrieve data for.
+        start_time : str "%Y/%m/%d" or list
+            The start time of the time window, either one for all time series
+            or one per time series identifier.
+        end_time : str "%Y/%m/%d" or list
+            The end time of the time window, either one for all time series
+            or one per time series identifier.
+        units : str or list
+            The unit to retrieve the data values in, either one unit for all
+            time series or one unit per time series identifier.
+        p_timezone : str
+            The time zone for the time window and retrieved times.
+
+        The remaining parameters are the same as `retrieve_ts`.
+
+        Returns
+        -------
+        pandas df or dict
+            Long format data with the same columns as `retrieve_ts`,
+            date_time, value, quality_code, time_zone, ts_id, units.  With
+            `return_df=False` a dict of ts_id to (date_time, value,
+            quality_code) arrays.
+
+        Examples
+        -------
+        ```python
+        >>> df = cwms.retrieve_ts_multi(['Some.Fully.Qualified.Ts.Id',
+                                         'Another.Fully.Qualified.Ts.Id'],
+                                        '2019/1/1', '2019/9/1', units='cms')
+        >>> df.groupby('ts_id')['value'].mean()
+        ```
+        """
+        if isinstance(units, str) or units is None:
+            units = [units] * len(ts_ids)
+        if not isinstance(start_time, (list, tuple)):
+            start_time = [start_time] * len(ts_ids)
+        if not isinstance(end_time, (list, tuple)):
+            end_time = [end_time] * len(ts_ids)
+
+        p_start_times = [pd.to_datetime(t).to_pydatetime() for t in start_time]
+        # add one day to make it inclusive to 24:00
+        p_end_times = [
+            (pd.to_datetime(t) + datetime.timedelta(days=1)).to_pydatetime()
+            for t in end_time
+        ]
+
+        if not version_date:
+            version_date = "1111/11/11"
+            p_version_date = datetime.datetime.strptime(version_date, "%Y/%m/%d")
+        else:
+            p_version_date = pd.to_datetime(version_date).to_pydatetime()
+
+        req_type = self.object_type("CWMS_20.TIMESERIES_REQ_TYPE")
+        p_timeseries_info = self.object_type("CWMS_20.TIMESERIES_REQ_ARRAY").newobject()
+        for ts_id, unit, p_start_time, p_end_time in zip(
+            ts_ids, units, p_start_times, p_end_times
+        ):
+            req = req_type.newobject()
+            req.TSID = ts_id
+            req.UNIT = unit
+            req.START_TIME = p_start_time
+            req.END_TIME = p_end_time
+            p_timeseries_info.append(req)
+
+        try:
+            with self.cursor() as cur, self.ref_cursor(cur) as p_at_tsv_rc:
+                cur.callproc(
+                    "cwms_ts.retrieve_ts_multi",
+                    [
+                        p_at_tsv_rc,
+                        p_timeseries_info,
+                        p_timezone,
+                        p_trim,
+                        p_start_inclusive,
+                        p_end_inclusive,
+                        p_previous,
+                        p_next,
+                        p_version_date,
+                        p_max_version,
+                        p_office_id,
+                    ],
+                )
+                rc = p_at_tsv_rc.getvalue()
+                columns = [d[0].lower() for d in rc.description]
+                results = {}
+                for row in rc:
+                    row = dict(zip(columns, row))
+                    results[row["sequence"]] = (
+                        row["tsid"],
+                        row["units"],
+                        _fetch_ts_arrays(row["data"]),
+                    )
+        except Exception as e:
+            LOGGER.error("Error in retrieving time series.")
+            raise ValueError(e.__str__())
+
+        ordered = [results[k] for k in sorted(results)]
+        LOGGER.info(
+            f"Found {sum(len(a[0]) for _, _, a in ordered)} records "
+            f"for {len(ordered)} time series."
+        )
+        if not return_df:
+            return {ts_id: arrays for ts_id, _, arrays in ordered}
+
+        output = _ts_frame(
+            *[
+                np.concatenate([a[i] for _, _, a in ordered] or [np.empty(0, dtype)])
+                for i, dtype in enumerate(TS_DTYPES)
+            ]
+        )
+        counts = [len(a[0]) for _, _, a in ordered]
+        output["time_zone"] = p_timezone
+        output["ts_id"] = np.repeat([ts_id for ts_id, _, _ in ordered], counts)
+        output["units"] = np.repeat([unit for _, unit, _ in ordered], counts)
+
+        return output
+
     @LD
     def store_ts(
         self,
@@ -737,6 +1530,10 @@ class CwmsTsMixin:
             The office owning the time series. If not specified or NULL, the
             session user's default office is used.
 
+        If `fingerprints` is set (see `cwmspy.fingerprint.TsFingerprints`),
+        days stored unchanged before are skipped, except for the
+        `"DELETE INSERT"` store rule.
+
         Returns
         -------
         Boolean
@@ -761,58 +1558,213 @@ class CwmsTsMixin:
         ```
         """
 
-        cur = self.conn.cursor()
-        # values.insert(0, values[0])
-        p_values = cur.arrayvar(cx_Oracle.NATIVE_FLOAT, values)
-
-        ts = pd.to_datetime(
-            times, infer_datetime_format=True, format=format
-        ).tz_localize(timezone)
-        ts = [t.tz_convert("UTC") for t in ts]
+        arrays = _store_arrays(times, values, timezone, qualities, format)
+        update = None
+        # deleting the window of the call needs all of its values
+        if p_store_rule != "DELETE INSERT":
+            arrays, update = self._fingerprint_filter(
+                p_cwms_ts_id, p_units, version_date, p_office_id, arrays
+            )
+        millis, values, qualities = arrays
+        if update is not None and not len(values):
+            LOGGER.info(f"No new data to load for {p_cwms_ts_id}")
+            return True
 
-        # Get the UTC times of the data values in Java milliseconds
-        # this is what actually goes into Store_Ts
-        zero = datetime.datetime(1970, 1, 1, tzinfo=pytz.utc)
-        p_times = [((time - zero).total_seconds() * 1000) for time in ts]
-        # p_times.insert(0, p_times[0])
+        LOGGER.info(f"Loading {len(values)} values for {p_cwms_ts_id}")
+        try:
+            self._store_ts_arrays(
+                p_cwms_ts_id,
+                p_units,
+                millis,
+                values,
+                qualities,
+                p_store_rule,
+                p_override_prot,
+                version_date,
+                p_office_id,
+            )
+        finally:
+            self._invalidate_cache(p_cwms_ts_id)
+        self._fingerprint_update(update)
+        return True
 
+    def _store_ts_arrays(
+        self,
+        p_cwms_ts_id,
+        p_units,
+        millis,
+        values,
+        qualities,
+        p_store_rule="REPLACE ALL",
+        p_override_prot="F",
+        version_date=None,
+        p_office_id=None,
+    ):
+        """One `cwms_ts.store_ts` call for arrays prepared by `_store_arrays`."""
         if not version_date:
             p_version_date = datetime.datetime(1111, 11, 11)
         else:
             p_version_date = version_date
-        if not qualities:
-            p_qualities = [0 for x in p_times]
-        else:
-            p_qualities = qualities
 
         try:
-            data_len = len(values)
-            LOGGER.info(f"Loading {data_len} values for {p_cwms_ts_id}")
-
-            test = cur.callproc(
-                "cwms_ts.store_ts",
-                [
-                    p_cwms_ts_id,
-                    p_units,
-                    p_times,
-                    p_values,
-                    p_qualities,
-                    p_store_rule,
-                    p_override_prot,
-                    p_version_date,
-                    p_office_id,
-                ],
-            )
+            with self.cursor() as cur:
+                p_times = cur.arrayvar(cx_Oracle.NUMBER, millis.tolist())
+                p_values = cur.arrayvar(cx_Oracle.NATIVE_FLOAT, values.tolist())
+                p_qualities = cur.arrayvar(cx_Oracle.NUMBER, qualities.tolist())
+                cur.callproc(
+                    "cwms_ts.store_ts",
+                    [
+                        p_cwms_ts_id,
+                        p_units,
+                        p_times,
+                        p_values,
+                        p_qualities,
+                        p_store_rule,
+                        p_override_prot,
+                        p_version_date,
+                        p_office_id,
+                    ],
+                )
 
         except Exception as e:
             LOGGER.error("Error in store_ts.")
-            cur.close()
             raise ValueError(e.__str__())
-        cur.close()
-        return True
 
     @LD
-    def store_by_df(
+    def store_ts_chunked(
+        self,
+        p_cwms_ts_id,
+        p_units,
+        times,
+        values,
+        timezone,
+        qualities=None,
+        format=None,
+        p_store_rule="REPLACE ALL",
+        p_override_prot="F",
+        version_date=None,
+        p_office_id=None,
+        chunk_size=STORE_CHUNK_SIZE,
+        target_seconds=STORE_CHUNK_SECONDS,
+        min_chunk_size=STORE_MIN_CHUNK_SIZE,
+        max_chunk_size=STORE_MAX_CHUNK_SIZE,
+        retries=2,
+    ):
+        """Stores time series data like `store_ts`, in consecutive chunks.
+
+        The size of each chunk is adapted to the latency of the previous one
+        so every `cwms_ts.store_ts` call takes about `target_seconds`, at most
+        doubling or halving from one chunk to the next.  A failed chunk is
+        retried at half its size, the chunks already stored are kept.
+
+        Note that store rules working on the time window of a call, like
+        `"DELETE INSERT"`, see one chunk at a time.
+
+        Parameters
+        ----------
+        p_cwms_ts_id, p_units, times, values, timezone, qualities, format,
+        p_store_rule, p_override_prot, version_date, p_office_id
+            As for `store_ts`.
+        chunk_size : int
+            Number of values in the first chunk
+            (the default is `STORE_CHUNK_SIZE`).
+        target_seconds : float
+            Wanted duration of one call
+            (the default is `STORE_CHUNK_SECONDS`).
+        min_chunk_size, max_chunk_size : int
+            Bounds for the adapted chunk size.
+        retries : int
+            Number of times a failed chunk is retried before giving up.
+
+        Returns
+        -------
+        pandas df
+            One row per stored chunk with `start_time`, `end_time`, `values`,
+            `seconds` and `attempts` columns.
+
+        Examples
+        -------
+        ```python
+        >>> from cwmspy import CWMS
+        >>> import pandas as pd
+        >>> cwms = CWMS()
+        >>> cwms.connect()
+            True
+        >>> times = pd.date_range("2000-01-01", "2020-01-01", freq="15min")
+        >>> values = np.random.rand(len(times))
+        >>> report = cwms.store_ts_chunked('Some.Fully.Qualified.Cwms.Ts.ID',
+                                           'cms', times, values, 'UTC')
+        ```
+        """
+        millis, values, qualities = _store_arrays(
+            times, values, timezone, qualities, format
+        )
+        LOGGER.info(f"Loading {len(values)} values for {p_cwms_ts_id} in chunks")
+
+        report = []
+        position = 0
+        size = max(min_chunk_size, min(chunk_size, max_chunk_size))
+        attempts = 0
+        try:
+            while position < len(values):
+                end = min(position + size, len(values))
+                attempts += 1
+                started = time.perf_counter()
+                try:
+                    self._store_ts_arrays(
+                        p_cwms_ts_id,
+                        p_units,
+                        millis[position:end],
+                        values[position:end],
+                        qualities[position:end],
+                        p_store_rule,
+                        p_override_prot,
+                        version_date,
+                        p_office_id,
+                    )
+                except ValueError as e:
+                    if attempts > retries:
+                        LOGGER.error(
+                            f"Giving up on {p_cwms_ts_id} after storing "
+                            f"{position} of {len(values)} values"
+                        )
+                        raise
+                    size = max(min_chunk_size, (end - position) // 2)
+                    LOGGER.warning(
+                        f"Chunk of {end - position} values failed, "
+                        f"retrying with {size}: {e}"
+                    )
+                    continue
+                seconds = time.perf_counter() - started
+
+                report.append(
+                    {
+                        "start_time": _millis_to_datetime(millis[position]),
+                        "end_time": _millis_to_datetime(millis[end - 1]),
+                        "values": end - position,
+                        "seconds": seconds,
+                        "attempts": attempts,
+                    }
+                )
+                LOGGER.debug(
+                    f"Stored {end - position} values of {p_cwms_ts_id} "
+                    f"in {seconds:.2f}s"
+                )
+                position = end
+                attempts = 0
+
+                rate = report[-1]["values"] / max(seconds, 1e-3)
+                size = int(min(max(rate * target_seconds, size / 2), size * 2))
+                size = max(min_chunk_size, min(size, max_chunk_size))
+        finally:
+            self._invalidate_cache(p_cwms_ts_id)
+
+        return pd.DataFrame(
+            report, columns=["start_time", "end_time", "values", "seconds", "attempts"]
+        )
+
+    @LD
+    def store_ts_multi(
         self,
         df,
         timezone=None,
@@ -820,148 +1772,609 @@ class CwmsTsMixin:
         p_override_prot="F",
         version_date=None,
         p_office_id=None,
-        only_add_different=True,
+        batch_values=STORE_MULTI_BATCH_VALUES,
     ):
-        """Stores time series data to the database with pandas.core.dataframe as input.
+        """Stores many time series with `cwms_ts.store_ts_multi`, sending as
+        many series per call as fit in `batch_values` values.
 
         Parameters
         ----------
         df : pandas.core.DataFrame
-            Pandas DataFrame that requires `ts_id`, `date_time`, `units`,
-            and `value` columns.  If optional column `quality_code` does not exist,
-            all quality codes are assumed equal to 0.
-        p_store_rule : type
+            Pandas DataFrame with `ts_id`, `date_time`, `units` and `value`
+            columns, like `store_by_df`.  `quality_code` defaults to 0 and
+            `time_zone` to `timezone`.
+        timezone : str
+            Time zone of `date_time` when there is no `time_zone` column.
+        p_store_rule : str
             The store rule to use.
         p_override_prot : str
             A flag ('T' or 'F') specifying whether to override the protection
             flag on any existing data value.
-        p_version_date : datetime
-            Description of parameter `p_office_id`.
-        p_office_id : type
+        version_date : datetime
+            The version date of the data.
+        p_office_id : str
             The office owning the time series. If not specified or NULL, the
             session user's default office is used.
-        only_add_different : boolean
-            Check what is currently in database and only commit changes
+        batch_values : int
+            Maximum number of values sent in one call
+            (the default is `STORE_MULTI_BATCH_VALUES`). A series is never
+            split across calls.
 
         Returns
         -------
         Boolean
-            `True` for success
+            True for success.
 
         Examples
         -------
         ```python
         >>> from cwmspy import CWMS
-        >>> import datetime
         >>> cwms = CWMS()
         >>> cwms.connect()
             True
-        >>> p_cwms_ts_id = 'Some.Fully.Qualified.Pathname'
-        >>> p_units = 'cms'
-        >>> start_time = '2019/1/1'
-        >>> end_time = '2019/8/1'
-        >>> df = cwms.retrieve_ts(p_cwms_ts_id=p_cwms_ts_id,
-        >>>                     start_time=start_time,
-        >>>                     end_time=end_time,
-        >>>                     p_units=p_units
-        >>>                     )
-        >>> df['units'] = p_units
-        >>> df['ts_id'] = p_cwms_ts_id
-        >>> df['value'] = df['value'] / 1.1
-        >>> cwms.store_by_df(df)
+        >>> cwms.store_ts_multi(df, timezone="UTC")
             True
         ```
-
         """
-        df = df.copy()
-        if "time_zone" not in df.columns and timezone:
-            df["time_zone"] = timezone
+        groups = _store_groups(df, timezone)
+        failed = self._store_ts_multi_groups(
+            groups,
+            p_store_rule,
+            p_override_prot,
+            version_date,
+            p_office_id,
+            batch_values,
+        )
+        if failed:
+            ts_ids = ", ".join(g[0] for g, _ in failed)
+            raise ValueError(f"store_ts_multi failed for {ts_ids}")
+        return True
 
-        if "quality_code" in df.columns:
-            df["quality_code"] = [int(x) for x in df["quality_code"].values]
+    def _store_ts_multi_groups(
+        self,
+        groups,
+        p_store_rule="REPLACE ALL",
+        p_override_prot="F",
+        version_date=None,
+        p_office_id=None,
+        batch_values=STORE_MULTI_BATCH_VALUES,
+        fingerprint=True,
+    ):
+        """Store `((ts_id, units, time_zone), df)` groups with
+        `cwms_ts.store_ts_multi` and return the groups that failed.
+
+        When a call fails, each of its series is sent again on its own, so
+        only the series the database rejects are returned.  Groups left
+        without values to store are never failed.  With `fingerprint=False`
+        the groups are sent as given and no hashes are recorded, for callers
+        that record the hashes themselves.
+        """
+        if not version_date:
+            p_version_date = datetime.datetime(1111, 11, 11)
         else:
-            df["quality_code"] = 0
+            p_version_date = version_date
+
+        def call(series):
+            try:
+                self._store_multi_arrays(
+                    [(g[0], g[1]) + arrays for g, arrays, _ in series],
+                    p_store_rule,
+                    p_override_prot,
+                    p_version_date,
+                    p_office_id,
+                )
+            except Exception as e:
+                LOGGER.error("Error in store_ts_multi.")
+                LOGGER.error(e)
+                return False
+            for _, _, update in series:
+                self._fingerprint_update(update)
+            return True
+
+        batches = []
+        batch, count = [], 0
+        for group in groups:
+            n = len(group[1])
+            if batch and count + n > batch_values:
+                batches.append(batch)
+                batch, count = [], 0
+            batch.append(group)
+            count += n
+        if batch:
+            batches.append(batch)
+
+        failed = []
+        for batch in batches:
+            # (group, arrays, update) of the series with values to store
+            series = []
+            for g, v in batch:
+                ts_id, units, timezone = g
+                arrays = _store_arrays(
+                    v["date_time"].values,
+                    v["value"].values,
+                    timezone,
+                    v["quality_code"].values,
+                )
+                update = None
+                if fingerprint and p_store_rule != "DELETE INSERT":
+                    arrays, update = self._fingerprint_filter(
+                        ts_id, units, version_date, p_office_id, arrays
+                    )
+                if not len(arrays[0]):
+                    LOGGER.info(f"No new data to load for {ts_id}")
+                    self._fingerprint_update(update)
+                    continue
+                series.append((g, arrays, update))
+            if not series:
+                continue
 
-        # I want to make sure everything is the right type for cx_Oracle
-        df["date_time"] = pd.to_datetime(df["date_time"])
-        df["date_time"] = df["date_time"].dt.tz_localize(None)
-        df["value"] = df["value"].astype(float)
+            n_values = sum(len(arrays[0]) for _, arrays, _ in series)
+            LOGGER.info(f"Loading {n_values} values for {len(series)} time series")
+            try:
+                if call(series):
+                    continue
+                rejected = series
+                if len(series) > 1:
+                    LOGGER.warning(
+                        f"Storing the {len(series)} time series of the failed "
+                        f"store_ts_multi call one by one"
+                    )
+                    rejected = [item for item in series if not call([item])]
+                frames = dict(batch)
+                failed.extend((g, frames[g]) for g, _, _ in rejected)
+            finally:
+                for g, _, _ in series:
+                    self._invalidate_cache(g[0])
+        return failed
+
+    def _store_multi_arrays(
+        self, series, p_store_rule, p_override_prot, p_version_date, p_office_id
+    ):
+        """One `cwms_ts.store_ts_multi` call for `(ts_id, units, millis,
+        values, qualities)` series prepared by `_store_arrays`, sent as flat
+        arrays, see `STORE_MULTI_SQL`."""
+        ts_ids = [item[0] for item in series]
+        units = [item[1] for item in series]
+        counts = [len(item[2]) for item in series]
+        with self.cursor() as cur:
+            cur.execute(
+                STORE_MULTI_SQL,
+                ts_ids=cur.arrayvar(str, ts_ids, max(map(len, ts_ids))),
+                units=cur.arrayvar(str, units, max(map(len, units))),
+                counts=cur.arrayvar(cx_Oracle.NUMBER, counts),
+                times=cur.arrayvar(
+                    cx_Oracle.NUMBER, np.concatenate([s[2] for s in series]).tolist()
+                ),
+                vals=cur.arrayvar(
+                    cx_Oracle.NATIVE_FLOAT,
+                    np.concatenate([s[3] for s in series]).tolist(),
+                ),
+                qualities=cur.arrayvar(
+                    cx_Oracle.NUMBER, np.concatenate([s[4] for s in series]).tolist()
+                ),
+                store_rule=p_store_rule,
+                override_prot=p_override_prot,
+                version_date=p_version_date,
+                office_id=p_office_id,
+            )
 
-        grouped = df.groupby(["ts_id", "units", "time_zone"])
-        failures = 0
-        for g, v in grouped:
-            p_cwms_ts_id, p_units, timezone = g
+    def _fingerprint_groups(self, groups, version_date=None, p_office_id=None):
+        """Drop the rows of `((ts_id, units, time_zone), df)` groups on days
+        stored unchanged before, and groups left without rows, so they are
+        neither compared nor stored.
 
+        Returns the remaining groups and, per group, the hashes of its whole
+        input days to record once they are stored or found unchanged.
+        """
+        if getattr(self, "fingerprints", None) is None:
+            return groups, {}
+        output = []
+        updates = {}
+        for g, v in groups:
+            p_cwms_ts_id, p_units, timezone = g
+            arrays = _store_arrays(
+                v["date_time"].values,
+                v["value"].values,
+                timezone,
+                v["quality_code"].values,
+            )
+            key = (p_cwms_ts_id, p_units, version_date, p_office_id)
+            mask, hashes = self.fingerprints.changed(key, *arrays)
+            if not mask.any():
+                LOGGER.info(f"No new data to load for {p_cwms_ts_id}")
+                continue
+            output.append((g, v[mask]))
+            updates[g] = (key, hashes)
+        return output, updates
+
+    def _comparison_data(self, groups, version_date=None, p_office_id=None):
+        """Stored data for `((ts_id, units, time_zone), df)` groups, one
+        `retrieve_ts_multi` call per time zone, each series over its own
+        window.
+
+        A series the bulk retrieval fails on, for example a new time series,
+        maps to None and the others are retrieved again without it.  If the
+        error names none of the series, the groups of that time zone are
+        retrieved one by one.
+        """
+        current = {}
+        by_timezone = {}
+        for g, v in groups:
             # Add a little overlap to get current data
-            min_date = (v["date_time"].min() - datetime.timedelta(days=1)).strftime(
+            start = (v["date_time"].min() - datetime.timedelta(days=1)).strftime(
                 "%Y/%m/%d"
             )
-            max_date = (v["date_time"].max() + datetime.timedelta(days=1)).strftime(
+            end = (v["date_time"].max() + datetime.timedelta(days=1)).strftime(
                 "%Y/%m/%d"
             )
-            if only_add_different:
-                # Only want to write new data to disk
-                # Get current data, merge it for comparison
-                # Will throw an error if time series identifier does not exist
-                new_data = v.copy()
+            by_timezone.setdefault(g[2], []).append((g, start, end))
+
+        for timezone, tz_groups in by_timezone.items():
+            while tz_groups:
                 try:
+                    df = self.retrieve_ts_multi(
+                        [g[0] for g, _, _ in tz_groups],
+                        [start for _, start, _ in tz_groups],
+                        [end for _, _, end in tz_groups],
+                        units=[g[1] for g, _, _ in tz_groups],
+                        p_timezone=timezone,
+                        p_previous="F",
+                        version_date=version_date,
+                        p_office_id=p_office_id,
+                    )
+                except Exception as e:
+                    message = str(e).upper()
+                    missing = [
+                        item
+                        for item in tz_groups
+                        if f'"{item[0][0].upper()}"' in message
+                    ]
+                    if not missing:
+                        LOGGER.warning(
+                            f"Bulk retrieval for comparison failed, "
+                            f"retrieving {len(tz_groups)} time series one by one: {e}"
+                        )
+                        break
+                    for item in missing:
+                        LOGGER.info(f"{item[0][0]} not retrieved for comparison: {e}")
+                        current[item[0]] = None
+                        tz_groups.remove(item)
+                    continue
+                stored = dict(list(df.groupby(df["ts_id"].str.upper())))
+                for g, _, _ in tz_groups:
+                    current[g] = stored.get(g[0].upper(), df.iloc[:0])
+                tz_groups = []
 
-                    current_data = self.retrieve_ts(
+            for g, start, end in tz_groups:
+                p_cwms_ts_id, p_units, _ = g
+                try:
+                    current[g] = self.retrieve_ts(
                         p_cwms_ts_id=p_cwms_ts_id,
-                        start_time=min_date,
-                        end_time=max_date,
+                        start_time=start,
+                        end_time=end,
                         p_units=p_units,
                         p_timezone=timezone,
+                        p_previous="F",
                         version_date=version_date,
+                        p_office_id=p_office_id,
                     )
                 except Exception as e:
                     LOGGER.error(f"Error retrieveing {p_cwms_ts_id} for comparison.")
-                    current_data = pd.DataFrame()
+                    current[g] = None
+        return current
 
-                if not current_data.empty:
-                    try:
-                        merged = v.merge(
-                            current_data,
-                            on=["date_time", "value"],
-                            how="outer",
-                            suffixes=["", "_"],
-                            indicator=True,
-                        )
-                        # The data to store after comparing to current data
-                        new_data = merged[merged["_merge"] == "left_only"]
-                    except:
-                        LOGGER.error(
-                            f"Failed to merge {p_cwms_ts_id} with existing data."
-                        )
+    @LD_FANOUT
+    def store_by_df(
+        self,
+        df,
+        timezone=None,
+        p_store_rule="REPLACE ALL",
+        p_override_prot="F",
+        version_date=None,
+        p_office_id=None,
+        only_add_different=True,
+        multi=False,
+        tolerance=0.0,
+        max_workers=1,
+        return_report=False,
+        plan_runs=False,
+        block_rows=BLOCK_ROWS,
+        journal=None,
+    ):
+        """Stores time series data to the database with pandas.core.dataframe as input.
+
+        Parameters
+        ----------
+        df : pandas.core.DataFrame
+            Pandas DataFrame that requires `ts_id`, `date_time`, `units`,
+            and `value` columns.  If optional column `quality_code` does not exist,
+            all quality codes are assumed equal to 0.
+        p_store_rule : type
+            The store rule to use.
+        p_override_prot : str
+            A flag ('T' or 'F') specifying whether to override the protection
+            flag on any existing data value.
+        p_version_date : datetime
+            Description of parameter `p_office_id`.
+        p_office_id : type
+            The office owning the time series. If not specified or NULL, the
+            session user's default office is used.
+        only_add_different : boolean
+            Check what is currently in database and only commit changes
+        tolerance : float
+            Absolute difference up to which a value equals the stored value
+            when `only_add_different` is used (the default is 0.0).
+        multi : boolean
+            Store the series with `cwms_ts.store_ts_multi`, many per call,
+            falling back to one `store_ts` call per series for any call that
+            fails.
+        max_workers : int
+            Number of groups stored at the same time, each on its own session
+            when connected with `pool=True` (the default is 1).
+        return_report : boolean
+            Return the per group report instead of the number of failures.
+        plan_runs : boolean
+            Split the rows to store of every series into contiguous runs on
+            its interval. Runs of `block_rows` or more regular values are
+            stored with `"DELETE INSERT"` when `p_store_rule` is
+            `"REPLACE ALL"`, each in its own call; all other runs go together
+            in one call with `p_store_rule`. The plan is logged at debug
+            level and returned in the `plan` column of the report. With
+            `multi`, series with a `"DELETE INSERT"` run are stored on their
+            own and the others with `cwms_ts.store_ts_multi`.
+        block_rows : int
+            Minimum length of a run rewritten with `"DELETE INSERT"`
+            (the default is `BLOCK_ROWS`).
+        journal : cwmspy.journal.LoadJournal
+            Checkpoint journal. Groups it records as stored are skipped, and
+            groups a previous run began but did not finish are compared with
+            the database even without `only_add_different`.
+
+        If `fingerprints` is set (see `cwmspy.fingerprint.TsFingerprints`),
+        days stored unchanged before are neither read back nor stored, except
+        for the `"DELETE INSERT"` store rule.  The days of a group are
+        recorded once it is stored or found unchanged in the database.
+
+        Returns
+        -------
+        int or pandas df
+            The number of groups that failed to store, or with `return_report`
+            one row per stored group with `ts_id`, `units`, `time_zone`,
+            `values`, `runs`, `calls`, `seconds`, `plan` and `error` columns;
+            `plan` lists the `start_time`, `end_time`, `rows` and `action` of
+            every run with `plan_runs` and is None otherwise, `error` is None
+            for success.
+
+        Examples
+        -------
+        ```python
+        >>> from cwmspy import CWMS
+        >>> import datetime
+        >>> cwms = CWMS()
+        >>> cwms.connect()
+            True
+        >>> p_cwms_ts_id = 'Some.Fully.Qualified.Pathname'
+        >>> p_units = 'cms'
+        >>> start_time = '2019/1/1'
+        >>> end_time = '2019/8/1'
+        >>> df = cwms.retrieve_ts(p_cwms_ts_id=p_cwms_ts_id,
+        >>>                     start_time=start_time,
+        >>>                     end_time=end_time,
+        >>>                     p_units=p_units
+        >>>                     )
+        >>> df['units'] = p_units
+        >>> df['ts_id'] = p_cwms_ts_id
+        >>> df['value'] = df['value'] / 1.1
+        >>> cwms.store_by_df(df)
+            True
+        ```
+
+        """
+        grouped = _store_groups(df, timezone)
+        entries = {}
+        verify = set()
+        if journal is not None:
+            remaining = []
+            for g, v in grouped:
+                entry = journal.entry(g, v)
+                if journal.is_done(entry):
+                    LOGGER.info(f"Skipping {g[0]}, already stored by the journal")
+                    continue
+                if journal.was_in_flight(entry):
+                    verify.add(g)
+                entries[g] = entry
+                remaining.append((g, v))
+            grouped = remaining
+        updates = {}
+        if p_store_rule != "DELETE INSERT":
+            grouped, updates = self._fingerprint_groups(
+                grouped, version_date, p_office_id
+            )
+            unchanged = set(entries) - set(g for g, _ in grouped)
+            for g in unchanged:
+                journal.finish(entries[g])
+        if only_add_different:
+            current = self._comparison_data(grouped, version_date, p_office_id)
+        elif verify:
+            current = self._comparison_data(
+                [(g, v) for g, v in grouped if g in verify], version_date, p_office_id
+            )
+        to_store = []
+        for g, v in grouped:
+            p_cwms_ts_id, p_units, timezone = g
+
+            if only_add_different or g in verify:
+                # Only want to write new data to disk
+                new_data = _changed_rows(v, current.get(g), tolerance)
                 if new_data.empty:
+                    if journal is not None:
+                        journal.finish(entries[g])
+                    self._fingerprint_update(updates.get(g))
                     LOGGER.info(f"No new data to load for {p_cwms_ts_id}")
                     # Do not want to try and load empty data so continue
                     continue
             else:
-                new_data = v.copy()
+                new_data = v
 
             new_data_len = new_data.shape[0]
             LOGGER.info(f"Loading {new_data_len} new values")
+            to_store.append((g, new_data))
 
-            try:
-                self.store_ts(
-                    p_cwms_ts_id=p_cwms_ts_id,
-                    p_units=p_units,
-                    timezone=timezone,
-                    times=list(new_data["date_time"]),
-                    values=list(new_data["value"].astype(float)),
-                    qualities=list(new_data["quality_code"]),
-                    format=None,
-                    p_store_rule=p_store_rule,
-                    p_override_prot=p_override_prot,
-                    version_date=version_date,
-                    p_office_id=p_office_id,
+        plans = {}
+        if plan_runs:
+            for g, new_data in to_store:
+                runs = _plan_runs(
+                    new_data, _interval_ms(g[0]), p_store_rule, block_rows
                 )
+                for run in runs:
+                    LOGGER.debug(
+                        f"{g[0]} {run['start_time']} to {run['end_time']}: "
+                        f"{run['rows']} values, {run['action']}"
+                    )
+                plans[g] = runs
+
+        def plan_report(g):
+            if g not in plans:
+                return None
+            return [
+                {k: run[k] for k in ("start_time", "end_time", "rows", "action")}
+                for run in plans[g]
+            ]
+
+        def store(item):
+            (p_cwms_ts_id, p_units, timezone), new_data = item
+            started = time.perf_counter()
+            if plan_runs:
+                runs = plans[item[0]]
+                blocks = [r for r in runs if r["action"] != p_store_rule]
+                rest = [r for r in runs if r["action"] == p_store_rule]
+                calls = [(r["action"], np.arange(r["start"], r["end"])) for r in blocks]
+                if rest:
+                    rows = np.concatenate(
+                        [np.arange(r["start"], r["end"]) for r in rest]
+                    )
+                    calls.append((p_store_rule, rows))
+            else:
+                runs = [None]
+                calls = [(p_store_rule, slice(None))]
+
+            error = None
+            try:
+                if journal is not None:
+                    journal.begin(entries[item[0]])
+                # the rows were fingerprinted as a whole above, storing them
+                # directly keeps store_ts from recording partial days
+                with self.session():
+                    for rule, rows in calls:
+                        data = new_data.iloc[rows]
+                        arrays = _store_arrays(
+                            data["date_time"].values,
+                            data["value"].values,
+                            timezone,
+                            data["quality_code"].values,
+                        )
+                        try:
+                            self._store_ts_arrays(
+                                p_cwms_ts_id,
+                                p_units,
+                                *arrays,
+                                rule,
+                                p_override_prot,
+                                version_date,
+                                p_office_id,
+                            )
+                        finally:
+                            self._invalidate_cache(p_cwms_ts_id)
+                if journal is not None:
+                    journal.finish(entries[item[0]])
+                self._fingerprint_update(updates.get(item[0]))
             except Exception as e:
                 LOGGER.error(f"Error in store_ts for {p_cwms_ts_id}")
                 LOGGER.error(e)
-                failures += 1
-                continue
+                error = e
+            return {
+                "ts_id": p_cwms_ts_id,
+                "units": p_units,
+                "time_zone": timezone,
+                "values": len(new_data),
+                "runs": len(runs),
+                "calls": len(calls),
+                "seconds": time.perf_counter() - started,
+                "plan": plan_report(item[0]),
+                "error": error,
+            }
+
+        started = time.perf_counter()
+        report = []
+        if multi and to_store:
+            # series with a block run need calls of their own
+            single = [
+                (g, v)
+                for g, v in to_store
+                if any(run["action"] != p_store_rule for run in plans.get(g, []))
+            ]
+            single_groups = set(g for g, _ in single)
+            to_store = [(g, v) for g, v in to_store if g not in single_groups]
+            if journal is not None:
+                for g, _ in to_store:
+                    journal.begin(entries[g])
+            failed = self._store_ts_multi_groups(
+                to_store,
+                p_store_rule,
+                p_override_prot,
+                version_date,
+                p_office_id,
+                fingerprint=False,
+            )
+            seconds = time.perf_counter() - started
+            failed_groups = [g for g, _ in failed]
+            for g, new_data in to_store:
+                if g not in failed_groups:
+                    if journal is not None:
+                        journal.finish(entries[g])
+                    self._fingerprint_update(updates.get(g))
+                    report.append(
+                        {
+                            "ts_id": g[0],
+                            "units": g[1],
+                            "time_zone": g[2],
+                            "values": len(new_data),
+                            "runs": len(plans.get(g, [None])),
+                            "calls": 1,
+                            "seconds": seconds,
+                            "plan": plan_report(g),
+                            "error": None,
+                        }
+                    )
+            for g, _ in failed:
+                LOGGER.warning(f"Falling back to store_ts for {g[0]}")
+            to_store = single + failed
+        results, _ = run_concurrent(store, to_store, max_workers=max_workers)
+        report.extend(results)
+
+        stored = sum(r["values"] for r in report if r["error"] is None)
+        if stored:
+            seconds = time.perf_counter() - started
+            LOGGER.info(
+                f"Stored {stored} values for {len(report)} time series "
+                f"in {seconds:.1f}s ({stored / max(seconds, 1e-3):.0f} values/s)"
+            )
+        failures = sum(r["error"] is not None for r in report)
+        if return_report:
+            return pd.DataFrame(
+                report,
+                columns=[
+                    "ts_id",
+                    "units",
+                    "time_zone",
+                    "values",
+                    "runs",
+                    "calls",
+                    "seconds",
+                    "plan",
+                    "error",
+                ],
+            )
         return failures
 
     @LD
@@ -994,17 +2407,16 @@ class CwmsTsMixin:
         ```
         """
 
-        cur = self.conn.cursor()
         try:
-
-            cur.callproc(
-                "cwms_ts.delete_ts", [p_cwms_ts_id, p_delete_action, p_db_office_id]
-            )
+            with self.cursor() as cur:
+                cur.callproc(
+                    "cwms_ts.delete_ts", [p_cwms_ts_id, p_delete_action, p_db_office_id]
+                )
         except Exception as e:
             LOGGER.error("Error in delete_ts.")
-            cur.close()
             raise ValueError(e.__str__())
-        cur.close()
+        self._invalidate_cache(p_cwms_ts_id)
+        self._fingerprint_invalidate(p_cwms_ts_id)
         return True
 
     @LD
@@ -1055,18 +2467,17 @@ class CwmsTsMixin:
         ```
         """
 
-        cur = self.conn.cursor()
         try:
-
-            cur.callproc(
-                "cwms_ts.rename_ts",
-                [p_cwms_ts_id_old, p_cwms_ts_id_new, p_utc_offset_new, p_office_id],
-            )
+            with self.cursor() as cur:
+                cur.callproc(
+                    "cwms_ts.rename_ts",
+                    [p_cwms_ts_id_old, p_cwms_ts_id_new, p_utc_offset_new, p_office_id],
+                )
         except Exception as e:
             LOGGER.error("Error in rename_ts")
-            cur.close()
             raise ValueError(e.__str__())
-        cur.close()
+        self._invalidate_cache(p_cwms_ts_id_old)
+        self._fingerprint_invalidate(p_cwms_ts_id_old)
         return True
 
     @LD
@@ -1151,26 +2562,25 @@ class CwmsTsMixin:
         ]
         # If date times are not null modify argument list
         if date_times:
-            date_table_type = self.conn.gettype("CWMS_20.DATE_TABLE_TYPE")
-            p_date_times = date_table_type.newobject()
-            for time_item in date_times:
-                formatted_time = pd.to_datetime(time_item).to_pydatetime()
-                p_date_times.append(formatted_time)
+            date_table_type = self.object_type("CWMS_20.DATE_TABLE_TYPE")
+            p_date_times = date_table_type.newobject(
+                list(pd.to_datetime(list(date_times)).to_pydatetime())
+            )
             # Append other values to arg list
             args_list += [p_date_times, p_max_version, p_ts_item_mask, p_db_office_id]
 
         try:
-            cur = self.conn.cursor()
-            LOGGER.debug("Attempting to delete")
-            cur.callproc("cwms_ts.delete_ts", args_list)
+            with self.cursor() as cur:
+                LOGGER.debug("Attempting to delete")
+                cur.callproc("cwms_ts.delete_ts", args_list)
         except Exception as e:
             LOGGER.error(f"Error in delete_ts.{e}")
-            cur.close()
             raise ValueError(e.__str__())
-        cur.close()
+        self._invalidate_cache(p_cwms_ts_id)
+        self._fingerprint_invalidate(p_cwms_ts_id)
         return True
 
-    @LD
+    @LD_FANOUT
     def delete_by_df(
         self,
         df,
@@ -1179,13 +2589,23 @@ class CwmsTsMixin:
         p_max_version="T",
         p_ts_item_mask=-1,
         p_db_office_id=None,
+        max_workers=1,
+        window_rows=DELETE_WINDOW_ROWS,
+        return_report=False,
     ):
         """Deletes time series data with a pandas.Core.DataFrame.
 
+        Contiguous times of a regular series are deleted with one time window
+        and the other times with as few `DATE_TABLE_TYPE` lists as the server
+        accepts.  The list size starts at `DELETE_BATCH_SIZE`, is halved when
+        a call fails with one of `DELETE_SIZE_ERRORS` and is remembered for
+        later calls; any other error is raised at once.
+
         Parameters
         ----------
         df : pandas.core.DataFrame
-            A pandas data frame with columns `ts_id` and `date_time`.
+            A pandas data frame with columns `ts_id`, `date_time` and
+            `time_zone`.
         p_override_protection : str
             A flag ('T' or 'F') specifying whether to override the protection
             flag on any existing data value.
@@ -1193,6 +2613,22 @@ class CwmsTsMixin:
             The version date of the data.
         p_db_office_code : type
             The unique numeric code that identifies the office that owns the time series.
+        max_workers : int
+            Number of time series deleted at the same time, each on its own
+            session when connected with `pool=True` (the default is 1).
+        window_rows : int
+            Minimum length of a run of regular values deleted as a time
+            window (the default is `DELETE_WINDOW_ROWS`).
+        return_report : boolean
+            Return the per time series report instead of the number of
+            failures.
+
+        Returns
+        -------
+        int or pandas.core.DataFrame
+            The number of time series that failed to delete, or a report with
+            columns `ts_id`, `time_zone`, `values`, `windows`, `calls`,
+            `seconds` and `error`.
 
         Examples
         -------
@@ -1203,36 +2639,138 @@ class CwmsTsMixin:
         >>> cwms.delete_by_df(df)
         """
 
-        grpd = df.groupby(["ts_id", "time_zone"])
-        for g, v in grpd:
-            p_cwms_ts_id, p_time_zone = g
+        groups = list(df.groupby(["ts_id", "time_zone"])["date_time"])
 
-            rows, _ = v.shape
+        def delete(item):
+            (p_cwms_ts_id, p_time_zone), date_time = item
+            started = time.perf_counter()
+            windows, calls, error = 0, 0, None
             try:
-                # The below for loop is necessary bc get a db error for more than 200 vals at a time
-                for i in range(int(1 + rows / 200)):
-                    date_times = list(
-                        pd.to_datetime(
-                            v["date_time"].iloc[i * 200 : (1 + i) * 200].values
-                        ).to_pydatetime()
-                    )
-                    self.delete_ts_values(
-                        p_cwms_ts_id,
-                        p_start_time=None,
-                        p_end_time=None,
-                        p_start_time_inclusive="T",
-                        p_end_time_inclusive="T",
-                        p_override_prot=p_override_prot,
-                        p_version_date=p_version_date,
-                        p_time_zone=p_time_zone,
-                        date_times=date_times,
-                        p_max_version=p_max_version,
-                        p_ts_item_mask=p_ts_item_mask,
-                        p_db_office_id=p_db_office_id,
-                    )
+                windows, calls = self._delete_group(
+                    p_cwms_ts_id,
+                    p_time_zone,
+                    date_time.values,
+                    p_override_prot,
+                    p_version_date,
+                    p_max_version,
+                    p_ts_item_mask,
+                    p_db_office_id,
+                    window_rows,
+                )
             except Exception as e:
+                LOGGER.error(f"Error in delete_by_df for {p_cwms_ts_id}")
                 LOGGER.error(e)
-                continue
+                error = e
+            return {
+                "ts_id": p_cwms_ts_id,
+                "time_zone": p_time_zone,
+                "values": len(date_time),
+                "windows": windows,
+                "calls": calls,
+                "seconds": time.perf_counter() - started,
+                "error": error,
+            }
+
+        report, _ = run_concurrent(delete, groups, max_workers=max_workers)
+        failures = sum(r["error"] is not None for r in report)
+        if return_report:
+            return pd.DataFrame(
+                report,
+                columns=[
+                    "ts_id",
+                    "time_zone",
+                    "values",
+                    "windows",
+                    "calls",
+                    "seconds",
+                    "error",
+                ],
+            )
+        return failures
+
+    @LD
+    def _delete_group(
+        self,
+        p_cwms_ts_id,
+        p_time_zone,
+        date_time,
+        p_override_prot,
+        p_version_date,
+        p_max_version,
+        p_ts_item_mask,
+        p_db_office_id,
+        window_rows=DELETE_WINDOW_ROWS,
+    ):
+        """Delete the times of one time series on one session.
+
+        Returns
+        -------
+        tuple
+            The number of windows and of `cwms_ts.delete_ts` calls.
+        """
+        windows, utc_times, local_times = _delete_plan(
+            date_time, p_time_zone, _interval_ms(p_cwms_ts_id), window_rows
+        )
+        date_table_type = self.object_type("CWMS_20.DATE_TABLE_TYPE")
+        calls = 0
+
+        def call(start, end, time_zone, date_times):
+            # the overload taking a date times table does nothing when it is
+            # null, time windows go to the one without it
+            args = [
+                p_cwms_ts_id,
+                p_override_prot,
+                start,
+                end,
+                "T",
+                "T",
+                p_version_date,
+                time_zone,
+            ]
+            if date_times is not None:
+                args += [
+                    date_table_type.newobject(date_times),
+                    p_max_version,
+                    p_ts_item_mask,
+                    p_db_office_id,
+                ]
+            with self.cursor() as cur:
+                cur.callproc("cwms_ts.delete_ts", args)
+
+        with _DELETE_SIZE_LOCK:
+            size = getattr(self, "_delete_batch_size", DELETE_BATCH_SIZE)
+        try:
+            for start, end in windows:
+                call(start, end, "UTC", None)
+                calls += 1
+            for time_zone, times in (("UTC", utc_times), (p_time_zone, local_times)):
+                i = 0
+                while i < len(times):
+                    batch = times[i : i + size]
+                    try:
+                        call(None, None, time_zone, batch)
+                    except Exception as e:
+                        too_large = DELETE_SIZE_ERRORS.search(str(e))
+                        if not too_large or len(batch) <= DELETE_SAFE_BATCH_SIZE:
+                            raise
+                        size = max(DELETE_SAFE_BATCH_SIZE, len(batch) // 2)
+                        with _DELETE_SIZE_LOCK:
+                            learned = getattr(
+                                self, "_delete_batch_size", DELETE_BATCH_SIZE
+                            )
+                            self._delete_batch_size = min(learned, size)
+                        LOGGER.info(f"Deleting at most {size} times per call: {e}")
+                        continue
+                    calls += 1
+                    i += size
+        finally:
+            self._invalidate_cache(p_cwms_ts_id)
+            self._fingerprint_invalidate(p_cwms_ts_id)
+        LOGGER.debug(
+            f"Deleted {len(date_time)} times of {p_cwms_ts_id} with "
+            f"{len(windows)} windows in {calls} calls"
+        )
+        return len(windows), calls
 
     @LD
     def get_extents(
@@ -1291,6 +2829,111 @@ class CwmsTsMixin:
 
         return min_date, max_date
 
+    @LD
+    def get_extents_bulk(
+        self,
+        ts_ids,
+        p_time_zone="UTC",
+        version_date="1111/11/11",
+        p_office_id=None,
+        batch_size=EXTENTS_BATCH_SIZE,
+    ):
+        """Retrieves the earliest and latest non-null time series data dates
+            for many time series with array-bound calls.
+
+        Every `batch_size` identifiers are sent in one `executemany` round
+        trip instead of two `callfunc` round trips per time series.
+
+        Parameters
+        ----------
+        ts_ids : list
+            The time series identifiers.
+        p_time_zone : str
+            The time zone in which to retrieve the dates
+            (the default is 'UTC').
+        version_date : str
+            The version date of the time series in the specified time zone
+            (the default is '1111/11/11' which represents non-versioned).
+        p_office_id : str
+            The office that owns the time series (the default is None).
+        batch_size : int
+            Number of identifiers bound per call (the default is 1000).
+
+        Returns
+        -------
+        pd.core.frame.DataFrame
+            `ts_id`, `min_date`, `max_date` and `error` columns in the order
+            of `ts_ids`.  Dates are NaT for identifiers that do not exist or
+            hold no data.  `error` is the message of any other error raised
+            for the identifier, a bad time zone for example, and None
+            otherwise.  Errors of the call itself, such as a lost
+            connection, are raised.
+
+        Examples
+        -------
+        ```python
+        >>> cwms.get_extents_bulk(['Some.Fully.Qualified.Cwms.Ts.ID',
+                                   'Another.Fully.Qualified.Cwms.Ts.ID'])
+                                       ts_id    min_date    max_date
+            0     Some.Fully.Qualified.Cwms.Ts.ID  1975-02-18  2019-08-16
+            1  Another.Fully.Qualified.Cwms.Ts.ID  1980-01-01  2019-08-16
+        ```
+        """
+        ts_ids = list(ts_ids)
+        p_version_date = datetime.datetime.strptime(version_date, "%Y/%m/%d")
+        min_dates = []
+        max_dates = []
+        errors = []
+
+        try:
+            # setinputsizes stays on the cursor, so it is not reused
+            with self.cursor(reuse=False) as cur:
+                for i in range(0, len(ts_ids), batch_size):
+                    batch = ts_ids[i : i + batch_size]
+                    min_date = cur.var(cx_Oracle.DATETIME, arraysize=len(batch))
+                    max_date = cur.var(cx_Oracle.DATETIME, arraysize=len(batch))
+                    error = cur.var(str, 4000, arraysize=len(batch))
+                    cur.setinputsizes(
+                        error=error,
+                        min_date=min_date,
+                        max_date=max_date,
+                        ts_id=str,
+                        time_zone=str,
+                        version_date=cx_Oracle.DATETIME,
+                        office_id=str,
+                    )
+                    cur.executemany(
+                        EXTENTS_SQL,
+                        [
+                            {
+                                "ts_id": ts_id,
+                                "time_zone": p_time_zone,
+                                "version_date": p_version_date,
+                                "office_id": p_office_id,
+                            }
+                            for ts_id in batch
+                        ],
+                    )
+                    min_dates += [min_date.getvalue(j) for j in range(len(batch))]
+                    max_dates += [max_date.getvalue(j) for j in range(len(batch))]
+                    errors += [error.getvalue(j) for j in range(len(batch))]
+        except Exception as e:
+            LOGGER.error("Error retrieving extents")
+            raise ValueError(e.__str__())
+        failed = sum(e is not None for e in errors)
+        if failed:
+            LOGGER.warning(f"Error retrieving extents for {failed} time series")
+        LOGGER.info(f"Retrieved extents for {len(ts_ids)} time series")
+
+        return pd.DataFrame(
+            {
+                "ts_id": ts_ids,
+                "min_date": pd.to_datetime(min_dates),
+                "max_date": pd.to_datetime(max_dates),
+                "error": errors,
+            }
+        )
+
     @LD
     def get_por(
         self,
@@ -1398,6 +3041,275 @@ class CwmsTsMixin:
 
         return por
 
+    def get_por_multi(
+        self,
+        p_cwms_ts_id_list,
+        p_units_list=None,
+        p_timezone="UTC",
+        p_trim="F",
+        p_start_inclusive="T",
+        p_end_inclusive="T",
+        p_previous="T",
+        p_next="F",
+        version_date="1111/11/11",
+        p_max_version="T",
+        p_office_id=None,
+        return_df=True,
+        max_workers=4,
+    ):
+        """Retrieves the period of record for a list of time series
+            identifiers with up to `max_workers` `get_por` calls at a time.
+
+        Connect with `pool=True` so every worker gets its own session, on a
+        single connection the calls are serialized by the driver.
+
+        Parameters
+        ----------
+        p_cwms_ts_id_list : list
+            List of time series identifiers.
+        p_units_list : list
+            Unit list to retrieve the data values in.
+        max_workers : int
+            Maximum number of series retrieved at the same time
+            (the default is 4).
+
+        The remaining parameters are the same as `get_por`.
+
+        Returns
+        -------
+        tuple of dict
+            The period of record of every series that was retrieved, keyed
+            by time series identifier in input order, and the exception
+            raised for every series that failed.
+
+        Examples
+        -------
+        ```python
+        >>> por, errors = cwms.get_por_multi(['Some.Fully.Qualified.Cwms.Ts.ID-RAW',
+                                              'Some.Fully.Qualified.Cwms.Ts.ID-REV'],
+                                             max_workers=2)
+        >>> errors
+            {}
+        ```
+        """
+        if not p_units_list:
+            p_units_list = [None] * len(p_cwms_ts_id_list)
+
+        def get_por(item):
+            p_cwms_ts_id, p_units = item
+            return self.get_por(
+                p_cwms_ts_id,
+                p_units=p_units,
+                p_timezone=p_timezone,
+                p_trim=p_trim,
+                p_start_inclusive=p_start_inclusive,
+                p_end_inclusive=p_end_inclusive,
+                p_previous=p_previous,
+                p_next=p_next,
+                version_date=version_date,
+                p_max_version=p_max_version,
+                p_office_id=p_office_id,
+                return_df=return_df,
+            )
+
+        items = list(zip(p_cwms_ts_id_list, p_units_list))
+        results, failed = run_concurrent(get_por, items, max_workers=max_workers)
+        errors = {}
+        for (p_cwms_ts_id, _), e in failed:
+            LOGGER.error(f"Error retrieving period of record for {p_cwms_ts_id}")
+            LOGGER.error(e)
+            errors[p_cwms_ts_id] = e
+        por = {
+            p_cwms_ts_id: result
+            for (p_cwms_ts_id, _), result in zip(items, results)
+            if p_cwms_ts_id not in errors
+        }
+        return por, errors
+
+    def iter_ts(
+        self,
+        p_cwms_ts_id,
+        start_time,
+        end_time,
+        window=ITER_WINDOW,
+        p_units=None,
+        p_timezone="UTC",
+        p_start_inclusive="T",
+        p_end_inclusive="T",
+        p_previous="T",
+        p_next="F",
+        version_date=None,
+        p_max_version="T",
+        p_office_id=None,
+        return_df=True,
+        prefetch=True,
+    ):
+        """Retrieves a time series window in bounded chunks.
+
+        The time window of `retrieve_ts` is split into sub-windows of
+        `window` length and each one is retrieved and yielded on its own, so
+        memory use does not grow with the length of the record.  With
+        `prefetch` the next sub-window is retrieved on a background thread
+        while the caller works on the current one.  Chunks do not overlap
+        and empty chunks are skipped.
+
+        Parameters
+        ----------
+        p_cwms_ts_id : str
+            The time series identifier to retrieve data for.
+        start_time : str "%Y/%m/%d"
+            The start time of the time window.
+        end_time : str "%Y/%m/%d"
+            The end time of the time window.
+        window : datetime.timedelta
+            Length of each sub-window (the default is 365 days).
+        prefetch : bool
+            Retrieve the next sub-window while the current one is being
+            processed (the default is True).  Use a pooled connection if the
+            loop body also calls the database.
+
+        The remaining parameters are passed to `retrieve_ts`.  `p_previous`
+        only applies to the first chunk and `p_next` to the last.
+
+        Yields
+        -------
+        list or pandas df
+            Time series data, date_time, value, quality_code.
+
+        Examples
+        -------
+        ```python
+        >>> for df in cwms.iter_ts('Some.Fully.Qualified.Ts.Id',
+                                   '1990/1/1', '2020/1/1',
+                                   window=datetime.timedelta(days=90)):
+        >>>     process(df)
+        ```
+        """
+        start = pd.to_datetime(start_time).to_pydatetime()
+        # retrieve_ts makes the end time inclusive to 24:00
+        end = (pd.to_datetime(end_time) + datetime.timedelta(days=1)).to_pydatetime()
+        windows = _split_window(start, end, window)
+        last = len(windows) - 1
+
+        def retrieve(i):
+            window_start, window_end = windows[i]
+            if i == last:
+                chunk_end, end_inclusive = end_time, p_end_inclusive
+            else:
+                # undo the day retrieve_ts adds, the next chunk owns window_end
+                chunk_end = window_end - datetime.timedelta(days=1)
+                end_inclusive = "F"
+            return self.retrieve_ts(
+                p_cwms_ts_id,
+                window_start,
+                chunk_end,
+                p_units=p_units,
+                p_timezone=p_timezone,
+                p_trim="F",
+                p_start_inclusive=p_start_inclusive if i == 0 else "T",
+                p_end_inclusive=end_inclusive,
+                p_previous=p_previous if i == 0 else "F",
+                p_next=p_next if i == last else "F",
+                version_date=version_date,
+                p_max_version=p_max_version,
+                p_office_id=p_office_id,
+                return_df=return_df,
+            )
+
+        if not prefetch:
+            for i in range(len(windows)):
+                chunk = retrieve(i)
+                if len(chunk):
+                    yield chunk
+            return
+
+        executor = ThreadPoolExecutor(max_workers=1)
+        try:
+            pending = executor.submit(retrieve, 0)
+            for i in range(len(windows)):
+                chunk = pending.result()
+                if i < last:
+                    pending = executor.submit(retrieve, i + 1)
+                if len(chunk):
+                    yield chunk
+        finally:
+            executor.shutdown(wait=True)
+
+    def iter_por(
+        self,
+        p_cwms_ts_id,
+        window=ITER_WINDOW,
+        p_units=None,
+        p_timezone="UTC",
+        p_start_inclusive="T",
+        p_end_inclusive="T",
+        p_previous="T",
+        p_next="F",
+        version_date="1111/11/11",
+        p_max_version="T",
+        p_office_id=None,
+        return_df=True,
+        prefetch=True,
+    ):
+        """Retrieves the period of record in bounded chunks.
+
+        Same as `get_por`, but the window found by `get_extents` is yielded
+        in chunks by `iter_ts`.
+
+        Parameters
+        ----------
+        p_cwms_ts_id : str
+            The time series identifier.
+        window : datetime.timedelta
+            Length of each sub-window (the default is 365 days).
+        prefetch : bool
+            Retrieve the next sub-window while the current one is being
+            processed (the default is True).
+
+        The remaining parameters are the same as `get_por`.
+
+        Yields
+        -------
+        list or pandas df
+            Time series data, date_time, value, quality_code.
+
+        Examples
+        -------
+        ```python
+        >>> total = 0
+        >>> for df in cwms.iter_por('Some.Fully.Qualified.Cwms.Ts.ID'):
+        >>>     total += df['value'].sum()
+        ```
+        """
+        mn, mx = self.get_extents(
+            p_cwms_ts_id=p_cwms_ts_id,
+            p_time_zone=p_timezone,
+            version_date=version_date,
+            p_office_id=p_office_id,
+        )
+
+        # To get a little overlap
+        mn = mn - datetime.timedelta(days=1)
+        mx = mx + datetime.timedelta(days=1)
+
+        return self.iter_ts(
+            p_cwms_ts_id,
+            mn.strftime("%Y/%m/%d"),
+            mx.strftime("%Y/%m/%d"),
+            window=window,
+            p_units=p_units,
+            p_timezone=p_timezone,
+            p_start_inclusive=p_start_inclusive,
+            p_end_inclusive=p_end_inclusive,
+            p_previous=p_previous,
+            p_next=p_next,
+            version_date=version_date,
+            p_max_version=p_max_version,
+            p_office_id=p_office_id,
+            return_df=return_df,
+            prefetch=prefetch,
+        )
+
     def compare_ts(
         self,
         p_cwms_ts_id_list,
@@ -1412,6 +3324,7 @@ class CwmsTsMixin:
         p_max_version="T",
         p_office_id=None,
         only_diffs=True,
+        max_workers=1,
     ):
         """
         Compares values across list of time series identifiers.
@@ -1450,6 +3363,11 @@ class CwmsTsMixin:
             Return data in local timezone.
         only_diffs : bool
             Return only differences in timestamp values (the default is True).
+        max_workers : int
+            Number of series retrieved at the same time, see `get_por_multi`
+            (the default is 1).  A ValueError naming every series that failed
+            to retrieve is raised after all were tried.  With fewer than two
+            series and `only_diffs` no rows are returned.
 
         Returns
         -------
@@ -1477,31 +3395,34 @@ class CwmsTsMixin:
             1961-06-11 23:00:00	14056.482648	0.0	12770.583181	3.0
         ```
         """
+        por, errors = self.get_por_multi(
+            p_cwms_ts_id_list,
+            p_units_list=p_units_list,
+            p_timezone=p_timezone,
+            p_trim=p_trim,
+            p_start_inclusive=p_start_inclusive,
+            p_end_inclusive=p_end_inclusive,
+            p_previous=p_previous,
+            p_next=p_next,
+            version_date=version_date,
+            p_max_version=p_max_version,
+            p_office_id=p_office_id,
+            return_df=True,
+            max_workers=max_workers,
+        )
+        if errors:
+            failed = ", ".join(f"{k}: {v}" for k, v in errors.items())
+            raise ValueError(f"Error retrieving time series to compare, {failed}")
+        p_cwms_ts_id_list = list(por)
         df_list = []
-        for idx, p_cwms_ts_id in enumerate(p_cwms_ts_id_list):
-            if p_units_list:
-                p_units = p_units_list[idx]
-            else:
-                p_units = None
-            df = self.get_por(
-                p_cwms_ts_id,
-                p_units=p_units,
-                p_timezone=p_timezone,
-                p_trim=p_trim,
-                p_start_inclusive=p_start_inclusive,
-                p_end_inclusive=p_end_inclusive,
-                p_previous=p_previous,
-                p_next=p_next,
-                version_date=version_date,
-                p_max_version=p_max_version,
-                p_office_id=p_office_id,
-                return_df=True,
-            )
+        for df in por.values():
             df.set_index("date_time", inplace=True)
             df_list.append(df)
 
         # reference: https://stackoverflow.com/a/47112033/4296857
         comp = pd.concat(df_list, axis="columns", keys=p_cwms_ts_id_list)
+        if only_diffs and len(p_cwms_ts_id_list) < 2:
+            return comp.iloc[:0]
         if only_diffs:
             df_list = []
             # np.isclose only accepts 2 arrays, getting a combination of all
@@ -1532,26 +3453,23 @@ class CwmsTsMixin:
         p_db_officeid=None,
     ):
 
-        cur = self.conn.cursor()
         try:
-
-            cur.callproc(
-                "cwms_ts.update_ts_id",
-                [
-                    p_cwms_ts_id,
-                    p_interval_utc_offset,
-                    p_snap_forward_minutes,
-                    p_snap_backward_minutes,
-                    p_local_reg_time_zone_id,
-                    p_ts_active_flag,
-                    p_db_officeid,
-                ],
-            )
+            with self.cursor() as cur:
+                cur.callproc(
+                    "cwms_ts.update_ts_id",
+                    [
+                        p_cwms_ts_id,
+                        p_interval_utc_offset,
+                        p_snap_forward_minutes,
+                        p_snap_backward_minutes,
+                        p_local_reg_time_zone_id,
+                        p_ts_active_flag,
+                        p_db_officeid,
+                    ],
+                )
         except Exception as e:
             LOGGER.error("Error in update_ts_id.")
-            cur.close()
             raise ValueError(e)
-        cur.close()
         return True
 
     @LD
@@ -1566,24 +3484,21 @@ class CwmsTsMixin:
         p_office_id=None,
     ):
 
-        cur = self.conn.cursor()
         try:
-
-            cur.callproc(
-                "cwms_ts.create_ts",
-                [
-                    p_cwms_ts_id,
-                    p_utc_offset,
-                    p_interval_forward,
-                    p_interval_backward,
-                    p_versioned,
-                    p_active_flag,
-                    p_office_id,
-                ],
-            )
+            with self.cursor() as cur:
+                cur.callproc(
+                    "cwms_ts.create_ts",
+                    [
+                        p_cwms_ts_id,
+                        p_utc_offset,
+                        p_interval_forward,
+                        p_interval_backward,
+                        p_versioned,
+                        p_active_flag,
+                        p_office_id,
+                    ],
+                )
         except Exception as e:
             LOGGER.error("Error in create_ts.")
-            cur.close()
             raise ValueError(e.__str__())
-        cur.close()
         return True
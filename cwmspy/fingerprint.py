@@ -0,0 +1,149 @@
+# -*- coding: utf-8 -*-
+"""
+Local fingerprints of stored time series data
+
+Assign a `TsFingerprints` to `CWMS.fingerprints` and `store_ts` and
+`store_by_df` skip every day whose times, values and quality codes hash the
+same as in the last successful store, without reading the data back.
+
+```python
+>>> from cwmspy import CWMS
+>>> from cwmspy.fingerprint import TsFingerprints
+>>> cwms = CWMS(fingerprints=TsFingerprints("/data/cwms_fingerprints.sqlite"))
+>>> cwms.connect()
+>>> cwms.store_by_df(df)  # stores everything
+>>> cwms.store_by_df(df)  # stores nothing, no round trips
+```
+
+Changes made to the database by anything else are not seen, delete the file
+or call `clear()` to start over.
+"""
+import hashlib
+import logging
+import sqlite3
+import threading
+
+import numpy as np
+
+
+LOGGER = logging.getLogger(__name__)
+
+MS_PER_DAY = 86400000
+
+
+class TsFingerprints:
+    """Per-day hashes of stored (time, value, quality code) rows in sqlite.
+
+    Rows are grouped by UTC day.  A day is only skipped when all of its rows
+    in a write hash the same as in the last confirmed write of that day,
+    partial days are compared like whole ones.
+
+    Parameters
+    ----------
+    path : str
+        sqlite database file, created if missing.  Use ":memory:" for an
+        index that lives as long as the process.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        with self._lock, self._db:
+            self._db.execute(
+                """create table if not exists fingerprints (
+                    ts_key text not null,
+                    day integer not null,
+                    hash text not null,
+                    primary key (ts_key, day)
+                )"""
+            )
+
+    def changed(self, key, millis, values, qualities):
+        """Rows of days that differ from the last confirmed write.
+
+        Parameters
+        ----------
+        key : tuple
+            (ts_id, units, version date, office) of the write.
+        millis, values, qualities : np.ndarray
+            UTC milliseconds, values and quality codes as sent to
+            `cwms_ts.store_ts`.
+
+        Returns
+        -------
+        tuple
+            Boolean mask of the rows to store and a `{day: hash}` dict to pass
+            to `update` once they are stored.
+        """
+        hashes, day_of_row = _day_hashes(millis, values, qualities)
+        if not hashes:
+            return np.zeros(0, dtype=bool), {}
+        ts_key = _ts_key(key)
+        with self._lock:
+            rows = self._db.execute(
+                "select day, hash from fingerprints "
+                "where ts_key = ? and day between ? and ?",
+                (ts_key, min(hashes), max(hashes)),
+            ).fetchall()
+        known = dict(rows)
+        changed = {day: h for day, h in hashes.items() if known.get(day) != h}
+        mask = np.isin(day_of_row, list(changed))
+        return mask, changed
+
+    def update(self, key, hashes):
+        """Record the hashes of a confirmed write."""
+        if not hashes:
+            return
+        ts_key = _ts_key(key)
+        with self._lock, self._db:
+            self._db.executemany(
+                "insert or replace into fingerprints values (?, ?, ?)",
+                [(ts_key, int(day), h) for day, h in hashes.items()],
+            )
+
+    def invalidate(self, ts_id):
+        """Forget every fingerprint of `ts_id`, for example after a delete."""
+        prefix = f"{ts_id.upper()}|"
+        with self._lock, self._db:
+            self._db.execute(
+                "delete from fingerprints where substr(ts_key, 1, ?) = ?",
+                (len(prefix), prefix),
+            )
+
+    def clear(self):
+        with self._lock, self._db:
+            self._db.execute("delete from fingerprints")
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+
+def _ts_key(key):
+    ts_id, units, version_date, office = key
+    return f"{ts_id.upper()}|{units}|{version_date}|{office}"
+
+
+def _day_hashes(millis, values, qualities):
+    """`{UTC day: hash}` of the rows and the day of every row."""
+    millis = np.asarray(millis, dtype="int64")
+    order = np.argsort(millis, kind="mergesort")
+    millis = millis[order]
+    values = np.asarray(values, dtype="float64")[order]
+    qualities = np.asarray(qualities, dtype="int64")[order]
+
+    days = millis // MS_PER_DAY
+    unique, starts = np.unique(days, return_index=True)
+    ends = np.append(starts[1:], len(days))
+    hashes = {}
+    for day, start, end in zip(unique.tolist(), starts, ends):
+        h = hashlib.blake2b(digest_size=16)
+        h.update(millis[start:end].tobytes())
+        h.update(values[start:end].tobytes())
+        h.update(qualities[start:end].tobytes())
+        hashes[day] = h.hexdigest()
+
+    day_of_row = np.empty_like(days)
+    day_of_row[order] = days
+    return hashes, day_of_row
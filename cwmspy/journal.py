@@ -0,0 +1,135 @@
+# -*- coding: utf-8 -*-
+"""
+Checkpoint journal for resumable bulk loads
+
+Pass a `LoadJournal` to `store_by_df` and every group it stores is recorded
+in an append-only JSON lines file.  When the same load is run again, for
+example after an outage, groups the journal marks as done are skipped without
+a round trip and a group that was being stored when the run died is compared
+with the database before it is stored again.
+
+```python
+>>> from cwmspy import CWMS
+>>> from cwmspy.journal import LoadJournal
+>>> cwms = CWMS()
+>>> cwms.connect()
+>>> journal = LoadJournal("/data/backfill.journal")
+>>> cwms.store_by_df(df, journal=journal)
+```
+"""
+import datetime
+import hashlib
+import json
+import logging
+import os
+import threading
+
+import numpy as np
+
+
+LOGGER = logging.getLogger(__name__)
+
+
+class LoadJournal:
+    """Append-only record of the groups stored by `store_by_df`.
+
+    Each group is identified by its ts_id, units, time zone, time window and a
+    hash of its times, values and quality codes, so a group whose input
+    changed between runs is stored again.  A `begin` line is written before a
+    group is stored and a `done` line after it succeeded; both are flushed to
+    disk before the load goes on.
+
+    Parameters
+    ----------
+    path : str
+        Journal file, created if missing and appended to otherwise.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._done = set()
+        self._in_flight = set()
+        if os.path.exists(path):
+            self._replay()
+        self._file = open(path, "a")
+
+    def entry(self, key, df):
+        """Journal entry of a `((ts_id, units, time_zone), df)` group."""
+        ts_id, units, time_zone = key
+        date_time = df["date_time"].values.astype("datetime64[ns]")
+        h = hashlib.blake2b(digest_size=16)
+        h.update(date_time.view("int64").tobytes())
+        h.update(np.asarray(df["value"].values, dtype="float64").tobytes())
+        h.update(np.asarray(df["quality_code"].values, dtype="int64").tobytes())
+        return (
+            ts_id,
+            units,
+            time_zone,
+            str(date_time.min()) if len(date_time) else None,
+            str(date_time.max()) if len(date_time) else None,
+            h.hexdigest(),
+        )
+
+    def is_done(self, entry):
+        with self._lock:
+            return entry in self._done
+
+    def was_in_flight(self, entry):
+        """Whether a previous run began storing `entry` without finishing."""
+        with self._lock:
+            return entry in self._in_flight
+
+    def begin(self, entry):
+        self._write("begin", entry)
+
+    def finish(self, entry):
+        self._write("done", entry)
+        with self._lock:
+            self._done.add(entry)
+            self._in_flight.discard(entry)
+
+    def close(self):
+        with self._lock:
+            self._file.close()
+
+    def _write(self, event, entry):
+        ts_id, units, time_zone, start, end, digest = entry
+        line = {
+            "event": event,
+            "ts_id": ts_id,
+            "units": units,
+            "time_zone": time_zone,
+            "start": start,
+            "end": end,
+            "hash": digest,
+            "logged": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        }
+        with self._lock:
+            self._file.write(json.dumps(line) + "\n")
+            self._file.flush()
+            os.fsync(self._file.fileno())
+
+    def _replay(self):
+        begun = set()
+        with open(self.path, "r") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    # the last line of a run that died while writing it
+                    LOGGER.warning(f"Ignoring incomplete line in {self.path}")
+                    continue
+                entry = tuple(
+                    record[k]
+                    for k in ("ts_id", "units", "time_zone", "start", "end", "hash")
+                )
+                if record["event"] == "done":
+                    self._done.add(entry)
+                else:
+                    begun.add(entry)
+        self._in_flight = begun - self._done
+        LOGGER.info(
+            f"Journal {self.path}: {len(self._done)} groups done, "
+            f"{len(self._in_flight)} in flight"
+        )
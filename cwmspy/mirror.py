@@ -0,0 +1,267 @@
+# -*- coding: utf-8 -*-
+"""
+Local Parquet mirror of time series data
+
+`TsMirror` keeps a copy of every series it has retrieved on disk, partitioned
+by year, and only asks the database for the part of a request it does not
+hold yet.  Writing Parquet needs the optional `pyarrow` dependency.
+
+```python
+>>> from cwmspy import CWMS
+>>> from cwmspy.mirror import TsMirror
+>>> cwms = CWMS()
+>>> cwms.connect()
+>>> mirror = TsMirror(cwms, "/data/cwms_mirror")
+>>> df = mirror.retrieve_ts('Some.Fully.Qualified.Ts.Id', '1990/1/1', '2020/1/1',
+                            p_units='cms')
+```
+"""
+import datetime
+import json
+import logging
+import os
+import threading
+from urllib.parse import quote
+
+import pandas as pd
+
+from .utils import log_decorator
+
+
+LOGGER = logging.getLogger(__name__)
+LD = log_decorator(LOGGER)
+
+EXTENTS_FILE = "extents.json"
+COLUMNS = ["date_time", "value", "quality_code"]
+
+
+class TsMirror:
+    """Incremental on-disk mirror around `CWMS.retrieve_ts`.
+
+    Every (ts_id, units, time zone, version date, office) combination gets a
+    directory holding one Parquet file per year plus `extents.json`, the
+    window of the database already copied.  A request inside that window is
+    answered from disk without touching Oracle.  Otherwise only the missing
+    head and tail are retrieved, and the tail is cut at `get_ts_max_date` so
+    values stored later are picked up by the next request.
+
+    Files are replaced atomically and the extents are written last, so
+    readers in other threads or processes always see complete partitions.
+    Writers are serialized per series within a process.
+
+    Parameters
+    ----------
+    cwms : cwmspy.CWMS
+        Connected instance used for database retrievals.
+    path : str
+        Root directory of the mirror.
+    """
+
+    def __init__(self, cwms, path):
+        self.cwms = cwms
+        self.path = path
+        self._locks = {}
+        self._locks_lock = threading.Lock()
+
+    @LD
+    def retrieve_ts(
+        self,
+        p_cwms_ts_id,
+        start_time,
+        end_time,
+        p_units=None,
+        p_timezone="UTC",
+        version_date=None,
+        p_office_id=None,
+    ):
+        """Retrieves time series data for a time window through the mirror.
+
+        Parameters
+        ----------
+        p_cwms_ts_id : str
+            The time series identifier to retrieve data for.
+        start_time : str "%Y/%m/%d"
+            The start time of the time window.
+        end_time : str "%Y/%m/%d"
+            The end time of the time window, inclusive to 24:00 like
+            `retrieve_ts`.
+        p_units : str
+            The unit to retrieve the data values in.
+        p_timezone : str
+            The time zone for the time window and retrieved times.
+        version_date : str
+            The version date of the data to retrieve.
+        p_office_id : str
+            The office that owns the time series.
+
+        Returns
+        -------
+        pandas df
+            Time series data with the same columns as `retrieve_ts`.
+        """
+        version_date = version_date or "1111/11/11"
+        start = pd.to_datetime(start_time)
+        end = pd.to_datetime(end_time) + datetime.timedelta(days=1)
+        key = (p_cwms_ts_id, p_units, p_timezone, version_date, p_office_id)
+        directory = self._directory(*key)
+
+        held = self._read_extents(directory)
+        if held is None or start < held[0] or end > held[1]:
+            with self._lock(key):
+                self._update(key, directory, start, end)
+
+        df = self._read(directory, start, end)
+        df["time_zone"] = p_timezone
+        df["ts_id"] = p_cwms_ts_id
+        if p_units:
+            df["units"] = p_units
+        return df
+
+    def _update(self, key, directory, start, end):
+        p_cwms_ts_id, p_units, p_timezone, version_date, p_office_id = key
+        # another writer may have filled the gap while we waited on the lock
+        held = self._read_extents(directory)
+
+        if held is not None and held[0] <= start and end <= held[1]:
+            return
+
+        if held is None or end > held[1]:
+            max_date = self.cwms.get_ts_max_date(
+                p_cwms_ts_id,
+                p_time_zone=p_timezone,
+                version_date=version_date,
+                p_office_id=p_office_id,
+            )
+            if max_date is not None:
+                end = min(end, pd.Timestamp(max_date))
+            if held is None and (max_date is None or end < start):
+                LOGGER.info(f"No data in the database for {p_cwms_ts_id}")
+                return
+
+        pieces = []
+        if held is None:
+            pieces.append(self._fetch(key, start, end, "T"))
+            held = (start, end)
+        else:
+            if start < held[0]:
+                # head, up to but not including the held start
+                pieces.append(self._fetch(key, start, held[0], "F", head=True))
+            if end > held[1]:
+                pieces.append(self._fetch(key, held[1], end, "T", tail=True))
+            held = (min(start, held[0]), max(end, held[1]))
+
+        pieces = [p for p in pieces if len(p)]
+        if pieces:
+            self._write(directory, pieces, p_timezone)
+        self._write_extents(directory, held)
+        LOGGER.info(f"Mirror of {p_cwms_ts_id} now holds {held[0]} to {held[1]}")
+
+    def _fetch(self, key, start, end, end_inclusive, head=False, tail=False):
+        p_cwms_ts_id, p_units, p_timezone, version_date, p_office_id = key
+        LOGGER.info(f"Mirror fetching {p_cwms_ts_id} from {start} to {end}")
+        df = self.cwms.retrieve_ts(
+            p_cwms_ts_id,
+            start.to_pydatetime(),
+            # retrieve_ts adds a day to make the end inclusive to 24:00
+            (end - datetime.timedelta(days=1)).to_pydatetime(),
+            p_units=p_units,
+            p_timezone=p_timezone,
+            p_trim="F",
+            p_start_inclusive="F" if tail else "T",
+            p_end_inclusive="F" if head else end_inclusive,
+            p_previous="F",
+            p_next="F",
+            version_date=None if version_date == "1111/11/11" else version_date,
+            p_office_id=p_office_id,
+        )
+        return df[COLUMNS]
+
+    def _directory(self, p_cwms_ts_id, p_units, p_timezone, version_date, office):
+        parts = [
+            p_cwms_ts_id,
+            f"units={p_units}",
+            f"tz={p_timezone}",
+            f"version={version_date}",
+            f"office={office}",
+        ]
+        return os.path.join(self.path, *[quote(str(p), safe="=") for p in parts])
+
+    def _lock(self, key):
+        with self._locks_lock:
+            return self._locks.setdefault(key, threading.Lock())
+
+    def _read_extents(self, directory):
+        try:
+            with open(os.path.join(directory, EXTENTS_FILE), "r") as f:
+                extents = json.load(f)
+        except FileNotFoundError:
+            return None
+        return pd.Timestamp(extents["start"]), pd.Timestamp(extents["end"])
+
+    def _write_extents(self, directory, held):
+        extents = {"start": held[0].isoformat(), "end": held[1].isoformat()}
+        path = os.path.join(directory, EXTENTS_FILE)
+
+        def write(tmp):
+            with open(tmp, "w") as f:
+                json.dump(extents, f)
+
+        _replace(path, write)
+
+    def _partition(self, directory, year):
+        return os.path.join(directory, f"year={year}.parquet")
+
+    def _read(self, directory, start, end):
+        df_list = []
+        for year in range(start.year, end.year + 1):
+            path = self._partition(directory, year)
+            if os.path.exists(path):
+                df_list.append(pd.read_parquet(path))
+        if not df_list:
+            return pd.DataFrame(columns=COLUMNS)
+        df = pd.concat(df_list, ignore_index=True)
+        in_window = (df["date_time"] >= start) & (df["date_time"] <= end)
+        return df[in_window].reset_index(drop=True)
+
+    def _write(self, directory, pieces, p_timezone):
+        """Merge retrieved pieces, each in time order, into the partitions.
+
+        Rows are matched on their UTC instant, the local times of the hour
+        repeated at the fall back transition would collide.
+        """
+        os.makedirs(directory, exist_ok=True)
+        df = pd.concat([_with_utc(p, p_timezone) for p in pieces])
+        for year, new in df.groupby(df["date_time"].dt.year):
+            path = self._partition(directory, year)
+            if os.path.exists(path):
+                held = _with_utc(pd.read_parquet(path), p_timezone)
+                new = pd.concat([held, new])
+            new = (
+                new.drop_duplicates("utc", keep="last")
+                .sort_values("utc", kind="mergesort")
+                .reset_index(drop=True)[COLUMNS]
+            )
+            _replace(path, lambda tmp: new.to_parquet(tmp, index=False))
+
+
+def _with_utc(df, p_timezone):
+    """`df` with a `utc` column for its local `date_time` in time order.
+
+    A local time of the hour repeated at the fall back transition is
+    standard time once an equal or later local time came before it, and
+    daylight saving time otherwise.
+    """
+    date_time = df["date_time"]
+    dst = ~(date_time <= date_time.cummax().shift())
+    utc = date_time.dt.tz_localize(
+        p_timezone, ambiguous=dst.values, nonexistent="shift_forward"
+    )
+    return df.assign(utc=utc.dt.tz_convert("UTC"))
+
+
+def _replace(path, write):
+    """Write through a temporary file and atomically move it over `path`."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    write(tmp)
+    os.replace(tmp, path)
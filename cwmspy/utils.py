@@ -1,16 +1,79 @@
+from concurrent.futures import ThreadPoolExecutor
 from functools import wraps
 
 
-def log_decorator(logger):
+def log_decorator(logger, session=False):
+    """Log the start and end of a method.
+
+    With `session=True` the method also runs inside `self.session()`, so a
+    pooled `CWMS` acquires a session for the call and releases it after.
+    When `self.track_cursors` is set, a warning is logged for cursors taken
+    with `self.cursor()` or `self.ref_cursor()` that are still open after
+    the call returns.
+    """
+
     def real_decorator(function):
         @wraps(function)
         def wrapper(*args, **kwargs):
             name = function.__name__
             logger.debug(f"Start {name}")
-            out = function(*args, **kwargs)
+            track = args and getattr(args[0], "track_cursors", False)
+            if track:
+                before = args[0]._thread_cursors()
+            if session and args and hasattr(args[0], "session"):
+                with args[0].session():
+                    out = function(*args, **kwargs)
+            else:
+                out = function(*args, **kwargs)
+            if track:
+                leaked = args[0]._thread_cursors() - before
+                if leaked > 0:
+                    logger.warning(f"{leaked} cursor(s) outlived {name}")
             logger.debug(f"End {name}")
             return out
 
         return wrapper
 
     return real_decorator
+
+
+def run_concurrent(function, items, max_workers=1):
+    """Call `function(item)` for every item on a bounded thread pool.
+
+    A failing call does not stop the others, its exception is collected and
+    its result is left as `None`.  With `max_workers=1` the calls run one
+    after another on the calling thread.
+
+    Parameters
+    ----------
+    function : callable
+        Called once per item.
+    items : list
+        Arguments for `function`.
+    max_workers : int
+        Maximum number of calls running at the same time (the default is 1).
+
+    Returns
+    -------
+    tuple of list
+        The results in the order of `items` and a list of
+        `(item, exception)` pairs for the calls that raised.
+    """
+    items = list(items)
+    results = [None] * len(items)
+    errors = []
+
+    def call(i):
+        try:
+            results[i] = function(items[i])
+        except Exception as e:
+            errors.append((i, e))
+
+    if max_workers is None or max_workers <= 1 or len(items) <= 1:
+        for i in range(len(items)):
+            call(i)
+    else:
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(items))) as executor:
+            list(executor.map(call, range(len(items))))
+
+    return results, [(items[i], e) for i, e in sorted(errors, key=lambda x: x[0])]
@@ -0,0 +1,332 @@
+# -*- coding: utf-8 -*-
+"""
+Write-behind buffer for many small stores
+
+A `BufferedWriter` collects values per time series in memory and stores them
+from a background thread through `store_by_df(multi=True)`, many series per
+round trip.  Create one with `CWMS.buffered_writer`.
+
+```python
+>>> from cwmspy import CWMS
+>>> cwms = CWMS()
+>>> cwms.connect(pool=True)
+>>> with cwms.buffered_writer(max_age=10) as writer:
+...     for message in telemetry:
+...         writer.write(message.ts_id, "cms", [message.time], [message.value])
+>>> writer.stats()
+    {'queued_rows': 0, 'queued_bytes': 0, 'series': 0, 'flushes': 12, ...}
+```
+"""
+import logging
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+
+LOGGER = logging.getLogger(__name__)
+
+# Memory estimate per buffered row: datetime64, float64 and int64
+ROW_BYTES = 24
+# Wait before the background thread retries a failed flush, doubled for
+# every further failed flush up to the maximum
+RETRY_DELAY = 1.0
+MAX_RETRY_DELAY = 60.0
+
+
+class BufferedWriter:
+    """Coalesce `store_ts` sized writes into bulk stores.
+
+    Values are flushed when the buffer holds `max_rows` rows or `max_bytes`
+    bytes, or when the oldest buffered value is `max_age` seconds old.  A call
+    to `write` blocks while `max_pending_rows` rows are buffered or being
+    stored, so producers slow down when the database falls behind.  Groups
+    that fail to store are put back into the buffer and dropped with an error
+    after `max_retries` failed flushes.  After a failed flush the background
+    thread waits `RETRY_DELAY` seconds before the next one, doubling up to
+    `MAX_RETRY_DELAY`.  Values `close` cannot store are returned by it.
+
+    Parameters
+    ----------
+    cwms : cwmspy.CWMS
+        Connected instance, preferably with `pool=True` so flushes run on
+        their own session.
+    max_rows, max_bytes, max_age
+        Flush thresholds in rows, bytes and seconds.
+    max_pending_rows : int
+        Rows buffered or in flight before `write` blocks
+        (the default is four times `max_rows`).
+    max_retries : int
+        Failed flushes after which the rows of a series are dropped.
+    **store_kwargs
+        Passed to `store_by_df`, e.g. `p_store_rule` or `p_office_id`.
+    """
+
+    def __init__(
+        self,
+        cwms,
+        max_rows=10000,
+        max_bytes=16 * 1024 ** 2,
+        max_age=5.0,
+        max_pending_rows=None,
+        max_retries=3,
+        **store_kwargs,
+    ):
+        self.cwms = cwms
+        self.max_rows = max_rows
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.max_pending_rows = max_pending_rows or 4 * max_rows
+        self.max_retries = max_retries
+        self.store_kwargs = store_kwargs
+
+        self._buffer = {}
+        self._attempts = {}
+        self._rows = 0
+        self._in_flight = 0
+        self._oldest = None
+        self._failures = 0
+        self._retry_at = None
+        self._closed = False
+        self._condition = threading.Condition()
+        self._flush_lock = threading.Lock()
+        self._counters = {
+            "flushes": 0,
+            "rows_flushed": 0,
+            "rows_dropped": 0,
+            "flush_seconds": 0.0,
+            "last_flush_seconds": 0.0,
+        }
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def write(self, ts_id, units, times, values, qualities=None, timezone="UTC"):
+        """Buffer values of one time series, blocking while the buffer is full.
+
+        Parameters
+        ----------
+        ts_id : str
+            The time series identifier.
+        units : str
+            The unit of the values.
+        times : list
+            The times of the values, strings or datetimes in `timezone`.
+        values : list
+            The values.
+        qualities : list
+            The quality codes, 0 when not given.
+        timezone : str
+            Time zone of `times`.
+        """
+        date_time = pd.to_datetime(times)
+        if getattr(date_time, "tz", None) is not None:
+            date_time = date_time.tz_localize(None)
+        date_time = np.asarray(date_time, dtype="datetime64[ns]")
+        values = np.asarray(values, dtype="float64")
+        if qualities is None:
+            qualities = np.zeros(len(values), dtype="int64")
+        qualities = np.asarray(qualities, dtype="int64")
+
+        with self._condition:
+            if self._closed:
+                raise ValueError("BufferedWriter is closed")
+            while self._rows + self._in_flight >= self.max_pending_rows:
+                self._condition.notify_all()
+                self._condition.wait()
+                # closed while waiting, nothing would store these values
+                if self._closed:
+                    raise ValueError("BufferedWriter is closed")
+            key = (ts_id, units, timezone)
+            self._buffer.setdefault(key, []).append((date_time, values, qualities))
+            self._rows += len(values)
+            if self._oldest is None:
+                self._oldest = time.monotonic()
+            if self._due():
+                self._condition.notify_all()
+
+    def flush(self):
+        """Store everything buffered now, on the calling thread."""
+        with self._flush_lock:
+            with self._condition:
+                buffer, self._buffer = self._buffer, {}
+                rows, self._rows = self._rows, 0
+                self._in_flight += rows
+                self._oldest = None
+            if not buffer:
+                return
+            try:
+                self._store(buffer, rows)
+            finally:
+                with self._condition:
+                    self._in_flight -= rows
+                    self._condition.notify_all()
+
+    def close(self):
+        """Stop the background thread and flush what is left.
+
+        Returns
+        -------
+        pandas df
+            The values of the series whose final flush failed, with the
+            `store_by_df` columns, empty when everything was stored.
+        """
+        with self._condition:
+            if self._closed:
+                return _frame({})
+            self._closed = True
+            self._condition.notify_all()
+        self._thread.join()
+        self.flush()
+        with self._condition:
+            pending, self._buffer = self._buffer, {}
+            rows, self._rows = self._rows, 0
+            self._oldest = None
+            self._attempts.clear()
+        if pending:
+            LOGGER.error(
+                f"BufferedWriter closed with {rows} values of "
+                f"{len(pending)} series not stored"
+            )
+        return _frame(pending)
+
+    def stats(self):
+        """Queue depth, flush counters, latency and rows per second."""
+        with self._condition:
+            stats = dict(self._counters)
+            stats["queued_rows"] = self._rows
+            stats["queued_bytes"] = self._rows * ROW_BYTES
+            stats["in_flight_rows"] = self._in_flight
+            stats["series"] = len(self._buffer)
+        seconds = stats["flush_seconds"]
+        stats["rows_per_second"] = stats["rows_flushed"] / seconds if seconds else 0.0
+        return stats
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def _due(self):
+        rows = min(self.max_rows, self.max_pending_rows)
+        if self._rows >= rows or self._rows * ROW_BYTES >= self.max_bytes:
+            return True
+        return (
+            self._oldest is not None and time.monotonic() - self._oldest >= self.max_age
+        )
+
+    def _wait(self):
+        """Seconds until the next background flush, None while idle."""
+        now = time.monotonic()
+        if self._due():
+            wait = 0.0
+        elif self._oldest is None:
+            return None
+        else:
+            wait = self.max_age - (now - self._oldest)
+        if self._retry_at is not None:
+            wait = max(wait, self._retry_at - now)
+        return wait
+
+    def _run(self):
+        while True:
+            with self._condition:
+                while not self._closed:
+                    timeout = self._wait()
+                    if timeout is not None and timeout <= 0:
+                        break
+                    self._condition.wait(timeout=timeout)
+                if self._closed:
+                    return
+            try:
+                self.flush()
+            except Exception as e:
+                LOGGER.error("Error in BufferedWriter flush")
+                LOGGER.error(e)
+
+    def _store(self, buffer, rows):
+        df = _frame(buffer)
+
+        started = time.perf_counter()
+        kwargs = dict(only_add_different=False, multi=True)
+        kwargs.update(self.store_kwargs)
+        try:
+            report = self.cwms.store_by_df(df, return_report=True, **kwargs)
+            failed = report[report["error"].notnull()]
+            failed = list(zip(failed["ts_id"], failed["units"], failed["time_zone"]))
+        except Exception as e:
+            LOGGER.error("Error in BufferedWriter flush")
+            LOGGER.error(e)
+            failed = list(buffer)
+        seconds = time.perf_counter() - started
+
+        requeue = {}
+        dropped = 0
+        for key in buffer:
+            if key not in failed:
+                self._attempts.pop(key, None)
+                continue
+            attempts = self._attempts.get(key, 0) + 1
+            if attempts >= self.max_retries:
+                LOGGER.error(
+                    f"Dropping buffered values of {key[0]} after {attempts} failures"
+                )
+                self._attempts.pop(key, None)
+                dropped += sum(len(c[1]) for c in buffer[key])
+            else:
+                self._attempts[key] = attempts
+                requeue[key] = buffer[key]
+
+        with self._condition:
+            for key, chunks in requeue.items():
+                self._buffer[key] = chunks + self._buffer.get(key, [])
+                n = sum(len(c[1]) for c in chunks)
+                self._rows += n
+                if self._oldest is None:
+                    self._oldest = time.monotonic()
+            stored = (
+                rows
+                - dropped
+                - sum(sum(len(c[1]) for c in chunks) for chunks in requeue.values())
+            )
+            if requeue:
+                self._failures += 1
+                delay = min(RETRY_DELAY * 2 ** (self._failures - 1), MAX_RETRY_DELAY)
+                self._retry_at = time.monotonic() + delay
+            else:
+                self._failures = 0
+                self._retry_at = None
+            self._counters["flushes"] += 1
+            self._counters["rows_flushed"] += stored
+            self._counters["rows_dropped"] += dropped
+            self._counters["flush_seconds"] += seconds
+            self._counters["last_flush_seconds"] = seconds
+        LOGGER.debug(f"Flushed {stored} rows of {len(buffer)} series in {seconds:.2f}s")
+
+
+def _frame(buffer):
+    """`store_by_df` input of buffered `{(ts_id, units, time_zone): chunks}`."""
+    df_list = []
+    for (ts_id, units, timezone), chunks in buffer.items():
+        date_time, values, qualities = [np.concatenate(c) for c in zip(*chunks)]
+        df = pd.DataFrame(
+            {"date_time": date_time, "value": values, "quality_code": qualities},
+            copy=False,
+        )
+        df["ts_id"] = ts_id
+        df["units"] = units
+        df["time_zone"] = timezone
+        df_list.append(df)
+    if not df_list:
+        return pd.DataFrame(
+            columns=[
+                "date_time",
+                "value",
+                "quality_code",
+                "ts_id",
+                "units",
+                "time_zone",
+            ]
+        )
+    return pd.concat(df_list, ignore_index=True)
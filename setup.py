@@ -23,7 +23,12 @@ REQUIRED = ["cx_oracle", "pandas", "python-dotenv", "pyyaml"]
 
 
 # What packages are optional?
-EXTRAS = {"Auto documentation with pdoc": ["pdoc"], "Tests": ["pytest"]}
+EXTRAS = {
+    "Auto documentation with pdoc": ["pdoc"],
+    "Tests": ["pytest"],
+    "Parquet mirror": ["pyarrow"],
+    "Fast JSON decoding": ["orjson"],
+}
 
 # The rest you shouldn't have to touch too much :)
 # ------------------------------------------------
@@ -0,0 +1,45 @@
+# -*- coding: utf-8 -*-
+import pytest
+
+from cwmspy import CWMS
+
+
+def _drop_location(cwms):
+    try:
+        cwms.delete_location("CWMSPY", "DELETE TS DATA")
+        cwms.delete_location("CWMSPY", "DELETE TS ID")
+        cwms.delete_location("CWMSPY")
+    except:
+        pass
+
+
+@pytest.fixture(scope="function")
+def connection(name):
+    cwms = CWMS(verbose=True)
+    cwms.connect(name=name)
+    yield cwms
+    cwms.close()
+
+
+@pytest.fixture(scope="function")
+def pool_connection(name):
+    cwms = CWMS(verbose=True)
+    cwms.connect(name=name, pool=True)
+    yield cwms
+    cwms.close()
+
+
+@pytest.fixture(scope="function")
+def location(connection):
+    _drop_location(connection)
+    connection.store_location("CWMSPY")
+    yield connection
+    _drop_location(connection)
+
+
+@pytest.fixture(scope="function")
+def pool_location(pool_connection):
+    _drop_location(pool_connection)
+    pool_connection.store_location("CWMSPY")
+    yield pool_connection
+    _drop_location(pool_connection)
@@ -0,0 +1,103 @@
+# -*- coding: utf-8 -*-
+from datetime import datetime
+
+import pandas as pd
+
+from cwmspy.cache import TsCache
+
+
+KEY = ("CWMSPY.Flow.Inst.1Hour.0.CACHE", "cms", "UTC", None, None, None)
+
+
+class Database(object):
+    """Hourly rows served like `cwms_ts.retrieve_ts`, counting the fetches."""
+
+    def __init__(self, date_time):
+        self.rows = pd.DataFrame(
+            {
+                "date_time": date_time,
+                "value": [float(i) for i in range(len(date_time))],
+                "quality_code": 0,
+            }
+        )
+        self.fetches = []
+
+    def fetch(self, start, end):
+        self.fetches.append((start, end))
+        times = self.rows["date_time"]
+        before = self.rows[times < start].tail(1)
+        return pd.concat([before, self.rows[(times >= start) & (times <= end)]])
+
+
+class TestClass(object):
+    def test_hit_inside_cached_window(self):
+        db = Database(pd.date_range("2019-01-01", periods=48, freq="h"))
+        cache = TsCache()
+        df = cache.retrieve(
+            KEY, datetime(2019, 1, 1), datetime(2019, 1, 2), False, db.fetch
+        )
+        assert len(df) == 25
+        df = cache.retrieve(
+            KEY, datetime(2019, 1, 1, 6), datetime(2019, 1, 1, 8), True, db.fetch
+        )
+        # the previous row comes from inside the cached window
+        assert list(df["value"]) == [5.0, 6.0, 7.0, 8.0]
+        assert len(db.fetches) == 1
+        stats = cache.stats()
+        assert stats["misses"] == 1
+        assert stats["hits"] == 1
+
+    def test_partial_hit_fetches_only_the_gap(self):
+        db = Database(pd.date_range("2019-01-01", periods=48, freq="h"))
+        cache = TsCache()
+        cache.retrieve(
+            KEY, datetime(2019, 1, 1), datetime(2019, 1, 1, 12), False, db.fetch
+        )
+        df = cache.retrieve(
+            KEY, datetime(2019, 1, 1, 6), datetime(2019, 1, 1, 18), False, db.fetch
+        )
+        assert db.fetches[1] == (datetime(2019, 1, 1, 12), datetime(2019, 1, 1, 18))
+        assert list(df["value"]) == [float(i) for i in range(6, 19)]
+        assert cache.stats()["partial_hits"] == 1
+        assert cache.stats()["entries"] == 1
+
+    def test_repeated_local_times_keep_database_order(self):
+        # the fall back hour of US/Central in local time, as the database
+        # returns it: 01:00 and 01:30 twice
+        date_time = pd.to_datetime(
+            [
+                "2019-11-03 00:30",
+                "2019-11-03 01:00",
+                "2019-11-03 01:30",
+                "2019-11-03 01:00",
+                "2019-11-03 01:30",
+                "2019-11-03 02:00",
+            ]
+        )
+        db = Database(date_time)
+        cache = TsCache()
+        cache.retrieve(
+            KEY, datetime(2019, 11, 3), datetime(2019, 11, 3, 3), False, db.fetch
+        )
+        df = cache.retrieve(
+            KEY, datetime(2019, 11, 3, 1), datetime(2019, 11, 3, 2), False, db.fetch
+        )
+        assert list(df["value"]) == [1.0, 2.0, 3.0, 4.0, 5.0]
+        assert len(db.fetches) == 1
+
+    def test_invalidate_and_evict(self):
+        db = Database(pd.date_range("2019-01-01", periods=48, freq="h"))
+        cache = TsCache()
+        cache.retrieve(KEY, datetime(2019, 1, 1), datetime(2019, 1, 2), False, db.fetch)
+        cache.invalidate(KEY[0].lower())
+        assert cache.stats()["entries"] == 0
+        assert cache.stats()["bytes"] == 0
+
+        cache = TsCache(max_bytes=1)
+        df = cache.retrieve(
+            KEY, datetime(2019, 1, 1), datetime(2019, 1, 2), False, db.fetch
+        )
+        # a window larger than max_bytes is evicted, the rows are still returned
+        assert len(df) == 25
+        assert cache.stats()["evictions"] == 1
+        assert cache.stats()["entries"] == 0
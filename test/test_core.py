@@ -5,6 +5,7 @@ import pytest
 import os
 import random
 from cwmspy import CWMS
+from cwmspy.core import OBJECT_TYPES
 from dotenv import load_dotenv
 
 
@@ -63,3 +64,145 @@ class TestClass(object):
 
         assert c == True
 
+
+    def test_connect_pool(self, cwms):
+        """
+        connect: Testing pooled connection to db
+        """
+
+        c = cwms.connect(
+            host=self.host,
+            service_name=self.service_name,
+            port=1521,
+            user=self.user,
+            password=self.password,
+            pool=True,
+            pool_min=1,
+            pool_max=2,
+        )
+
+        assert c == True
+        assert cwms.is_open()
+        stats = cwms.pool_stats()
+        assert stats["max"] == 2
+        assert stats["busy"] == 0
+        assert stats["acquired"] >= 1
+
+    def test_object_type_cache(self, cwms):
+        """
+        object_type: Testing types are described once per connection
+        """
+
+        c = cwms.connect(
+            host=self.host,
+            service_name=self.service_name,
+            port=1521,
+            user=self.user,
+            password=self.password,
+        )
+
+        assert c == True
+        warmed = cwms.type_cache_stats()
+        assert warmed["types"] == len(OBJECT_TYPES)
+        date_table_type = cwms.object_type("CWMS_20.DATE_TABLE_TYPE")
+        assert cwms.object_type("CWMS_20.DATE_TABLE_TYPE") is date_table_type
+        stats = cwms.type_cache_stats()
+        assert stats["describes"] == warmed["describes"]
+        assert stats["hits"] == warmed["hits"] + 2
+
+    def test_object_type_cache_pool(self, cwms):
+        """
+        object_type: Testing types are described once per pool
+        """
+
+        c = cwms.connect(
+            host=self.host,
+            service_name=self.service_name,
+            port=1521,
+            user=self.user,
+            password=self.password,
+            pool=True,
+            pool_min=1,
+            pool_max=2,
+        )
+
+        assert c == True
+        warmed = cwms.type_cache_stats()
+        assert warmed["types"] == len(OBJECT_TYPES)
+        date_table_type = cwms.object_type("CWMS_20.DATE_TABLE_TYPE")
+        for _ in range(2):
+            with cwms.session():
+                assert cwms.object_type("CWMS_20.DATE_TABLE_TYPE") is date_table_type
+        assert cwms.type_cache_stats()["describes"] == warmed["describes"]
+        assert cwms.statement_cache_stats()["cursors_opened"] >= 1
+        assert cwms.pool_stats()["busy"] == 0
+
+    def test_cursor_reuse(self, cwms):
+        """
+        cursor: Testing cursors are reused and stmtcachesize is applied
+        """
+
+        c = cwms.connect(
+            host=self.host,
+            service_name=self.service_name,
+            port=1521,
+            user=self.user,
+            password=self.password,
+            stmtcachesize=60,
+        )
+
+        assert c == True
+        for _ in range(3):
+            with cwms.cursor() as cur:
+                cur.execute("select 1 from dual")
+        stats = cwms.statement_cache_stats()
+        assert stats["stmtcachesize"] == 60
+        assert stats["cursors_reused"] >= 2
+
+    def test_track_cursors(self):
+        """
+        track_cursors: Testing no cursor is left open after a call
+        """
+
+        cwms = CWMS(track_cursors=True)
+        c = cwms.connect(
+            host=self.host,
+            service_name=self.service_name,
+            port=1521,
+            user=self.user,
+            password=self.password,
+        )
+
+        assert c == True
+        with cwms.cursor() as cur:
+            assert cwms.open_cursors() == 1
+            cur.execute("select 1 from dual")
+        cwms.statement_cache_stats()
+        assert cwms.open_cursors() == 0
+        cwms.close()
+
+    def test_health(self, cwms):
+        """
+        health: Testing liveness is tracked without extra pings
+        """
+
+        c = cwms.connect(
+            host=self.host,
+            service_name=self.service_name,
+            port=1521,
+            user=self.user,
+            password=self.password,
+        )
+
+        assert c == True
+        assert cwms.health()["alive"] == True
+        pings = cwms.health()["pings"]
+        assert cwms.is_open()
+        assert not cwms.is_closed()
+        assert cwms.health()["pings"] == pings
+        assert cwms.ping()
+        health = cwms.health()
+        assert health["pings"] == pings + 1
+        assert health["ping_latency"] is not None
+        cwms.close()
+        assert not cwms.is_open()
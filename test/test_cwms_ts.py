@@ -1,6 +1,6 @@
 # -*- coding: utf-8 -*-
 import os
-from datetime import datetime
+from datetime import datetime, timedelta
 import math
 import logging
 
@@ -9,6 +9,16 @@ import pytest
 import numpy as np
 
 from cwmspy import CWMS
+from cwmspy.cache import TsCache
+from cwmspy.cwms_ts import (
+    _changed_rows,
+    _delete_plan,
+    _parse_time_series,
+    _plan_runs,
+    _store_groups,
+)
+from cwmspy.fingerprint import TsFingerprints
+from cwmspy.journal import LoadJournal
 
 
 @pytest.fixture(scope="function")
@@ -154,6 +164,20 @@ class TestClass(object):
             np.round(float(x)) for x in values
         ]
 
+    @pytest.mark.parametrize(
+        "name, units, tz", data_tests,
+    )
+    def test_retrieve_time_series_batched(self, name, units, tz, cwms_data):
+        cwms, times, values, p_cwms_ts_id, units, tz = cwms_data
+        kwargs = dict(
+            units=[units], p_start="2015-12-01", p_end="2020-01-02", p_timezone=tz
+        )
+        df = cwms.retrieve_time_series([p_cwms_ts_id], **kwargs)
+        batched = cwms.retrieve_time_series(
+            [p_cwms_ts_id, p_cwms_ts_id], batch_size=1, max_workers=2, **kwargs
+        )
+        pd.testing.assert_frame_equal(batched, pd.concat([df, df], ignore_index=True))
+
     @pytest.mark.parametrize(
         "name, units, tz", data_tests,
     )
@@ -323,3 +347,476 @@ class TestClass(object):
             retrieved_df[["value"]].dropna().reset_index(drop=True)
         )
 
+
+    @pytest.mark.parametrize(
+        "name", loc_tests,
+    )
+    def test_delete_by_df_windows(self, name, cwms_loc):
+        cwms = cwms_loc
+
+        df = pd.read_json("test/data/data.json")
+        df = df.head(n=2500).copy()
+        cwms.store_by_df(df)
+        ts_id = df["ts_id"].values[0]
+        start = df["date_time"].min()
+        end = df["date_time"].max()
+        units = df["units"].values[0]
+        # one contiguous run deleted as a window plus scattered times
+        rows = list(range(1500)) + list(range(1600, 2500, 7))
+        report = cwms.delete_by_df(df.iloc[rows, :], max_workers=2, return_report=True)
+        assert report["error"].isnull().all()
+        assert report["windows"].sum() >= 1
+        dropped_df = df.drop(rows).copy().reset_index(drop=True).dropna()
+
+        retrieved_df = cwms.retrieve_ts(
+            ts_id, p_units=units, start_time=start, end_time=end, p_office_id=None,
+        )
+        assert dropped_df.dropna()[["value"]].equals(
+            retrieved_df[["value"]].dropna().reset_index(drop=True)
+        )
+
+    @pytest.mark.parametrize(
+        "name, units, tz", data_tests,
+    )
+    def test_iter_ts(self, name, units, tz, cwms_data):
+        cwms, times, values, p_cwms_ts_id, units, tz = cwms_data
+        chunks = list(
+            cwms.iter_ts(
+                p_cwms_ts_id,
+                "2016/12/31",
+                "2018/02/03",
+                window=timedelta(days=30),
+                p_units=units,
+                p_timezone=tz,
+                p_previous="F",
+            )
+        )
+        assert len(chunks) > 1
+        df = pd.concat(chunks)
+        assert [x.strftime("%Y/%m/%d") for x in df["date_time"]] == times
+
+    @pytest.mark.parametrize(
+        "name, units, tz", data_tests,
+    )
+    def test_retrieve_ts_multi(self, name, units, tz, cwms_data):
+        cwms, times, values, p_cwms_ts_id, units, tz = cwms_data
+        df = cwms.retrieve_ts_multi(
+            [p_cwms_ts_id], "2015-12-01", "2020/01/02", units=units, p_timezone=tz,
+        )
+        single = cwms.retrieve_ts(
+            p_cwms_ts_id,
+            p_units=units,
+            start_time="2015-12-01",
+            end_time="2020/01/02",
+            p_timezone=tz,
+        )
+        assert list(df.columns) == list(single.columns)
+        assert (df["ts_id"] == p_cwms_ts_id).all()
+        assert [x.strftime("%Y/%m/%d") for x in df["date_time"]] == times
+        assert df[["value"]].equals(single[["value"]])
+
+    @pytest.mark.parametrize(
+        "name, units, tz", data_tests,
+    )
+    def test_retrieve_ts_multi_closes_cursors(self, name, units, tz, cwms_data):
+        cwms, times, values, p_cwms_ts_id, units, tz = cwms_data
+        cwms.track_cursors = True
+        df = cwms.retrieve_ts_multi(
+            [p_cwms_ts_id], "2015-12-01", "2020/01/02", units=units, p_timezone=tz,
+        )
+        assert [x.strftime("%Y/%m/%d") for x in df["date_time"]] == times
+        assert cwms.open_cursors() == 0
+        # the reused cursor still works after the nested cursors were drained
+        df = cwms.retrieve_ts_multi(
+            [p_cwms_ts_id], "2015-12-01", "2020/01/02", units=units, p_timezone=tz,
+        )
+        assert len(df) == len(times)
+
+    @pytest.mark.parametrize(
+        "name, units, tz", data_tests,
+    )
+    def test_get_extents_bulk(self, name, units, tz, cwms_data):
+        cwms, times, values, p_cwms_ts_id, units, tz = cwms_data
+        df = cwms.get_extents_bulk(
+            [p_cwms_ts_id, "CWMSPY.Flow.Inst.0.0.MISSING"], p_time_zone=tz
+        )
+        mn, mx = cwms.get_extents(p_cwms_ts_id, p_time_zone=tz)
+        assert list(df["ts_id"]) == [p_cwms_ts_id, "CWMSPY.Flow.Inst.0.0.MISSING"]
+        assert df["min_date"][0] == mn
+        assert df["max_date"][0] == mx
+        assert df[["min_date", "max_date"]].iloc[1].isna().all()
+        assert df["error"].isnull().all()
+        df = cwms.get_extents_bulk([p_cwms_ts_id], p_time_zone="Not/AZone")
+        assert df["error"][0] is not None
+
+    @pytest.mark.parametrize(
+        "name, units, tz", data_tests,
+    )
+    def test_retrieve_ts_cache(self, name, units, tz, cwms_data):
+        cwms, times, values, p_cwms_ts_id, units, tz = cwms_data
+        cwms.ts_cache = TsCache()
+        kwargs = dict(p_units=units, p_timezone=tz, p_office_id=None)
+        full = cwms.retrieve_ts(p_cwms_ts_id, "2017/01/01", "2017/12/31", **kwargs)
+        part = cwms.retrieve_ts(p_cwms_ts_id, "2017/03/01", "2017/04/01", **kwargs)
+        assert cwms.ts_cache.stats()["hits"] == 1
+        cwms.ts_cache = None
+        expected = cwms.retrieve_ts(p_cwms_ts_id, "2017/03/01", "2017/04/01", **kwargs)
+        assert part.equals(expected)
+
+    @pytest.mark.parametrize(
+        "name", loc_tests,
+    )
+    def test_store_ts_chunked(self, name, cwms_loc):
+        cwms = cwms_loc
+        p_cwms_ts_id = "CWMSPY.Flow.Inst.1Hour.0.CHUNKED"
+        times = pd.date_range("2019-01-01", periods=5000, freq="H")
+        values = np.arange(len(times), dtype=float)
+        report = cwms.store_ts_chunked(
+            p_cwms_ts_id,
+            "cms",
+            times,
+            values,
+            "UTC",
+            chunk_size=1000,
+            min_chunk_size=500,
+        )
+        assert report["values"].sum() == len(values)
+        df = cwms.retrieve_ts(
+            p_cwms_ts_id, "2019/01/01", "2019/12/31", p_units="cms", p_previous="F",
+        )
+        assert list(df["value"]) == list(values)
+
+    @pytest.mark.parametrize(
+        "name", loc_tests,
+    )
+    def test_store_by_df_multi(self, name, cwms_loc):
+        cwms = cwms_loc
+        df = pd.read_json("test/data/data.json")
+        df["date_time"] = pd.to_datetime(df["date_time"])
+        assert cwms.store_by_df(df, timezone="UTC", multi=True) == 0
+        p_start = df["date_time"].min().strftime("%Y/%m/%d")
+        p_end = df["date_time"].max().strftime("%Y/%m/%d")
+        for (ts_id, units), v in df.groupby(["ts_id", "units"]):
+            stored = cwms.retrieve_ts(
+                ts_id, p_start, p_end, p_units=units, p_previous="F"
+            ).dropna(subset=["value"])
+            expected = v.dropna(subset=["value"]).sort_values("date_time")
+            assert np.allclose(stored["value"].values, expected["value"].values)
+
+    @pytest.mark.parametrize(
+        "name", loc_tests,
+    )
+    def test_store_by_df_tolerance(self, name, cwms_loc):
+        cwms = cwms_loc
+        df = pd.read_json("test/data/data.json")
+        cwms.store_by_df(df, timezone="UTC")
+        df["value"] = df["value"] + 1e-6
+        with self._caplog.at_level(logging.INFO):
+            cwms.store_by_df(df, timezone="UTC", tolerance=1e-3)
+            assert "No new data to load for" in self._caplog.records[-1].message
+
+    @pytest.mark.parametrize(
+        "name", loc_tests,
+    )
+    def test_store_by_df_bulk_comparison(self, name, cwms_loc):
+        cwms = cwms_loc
+        df = pd.read_json("test/data/data.json")
+        stage = df["ts_id"].str.startswith("CWMSPY.Stage")
+        df.loc[stage, "time_zone"] = "US/Central"
+        cwms.store_by_df(df)
+        calls = []
+
+        def counted(function):
+            def wrapper(*args, **kwargs):
+                calls.append(function.__name__)
+                return function(*args, **kwargs)
+
+            return wrapper
+
+        cwms.retrieve_ts = counted(cwms.retrieve_ts)
+        cwms.retrieve_ts_multi = counted(cwms.retrieve_ts_multi)
+        df["value"] = df["value"] + 1
+        report = cwms.store_by_df(df, return_report=True)
+        assert report["error"].isnull().all()
+        assert calls == ["retrieve_ts_multi"] * df["time_zone"].nunique()
+
+    @pytest.mark.parametrize(
+        "name", loc_tests,
+    )
+    def test_store_by_df_max_workers(self, name, cwms_loc):
+        cwms = cwms_loc
+        df = pd.read_json("test/data/data.json")
+        report = cwms.store_by_df(df, timezone="UTC", max_workers=2, return_report=True)
+        assert set(report["ts_id"]) == set(df["ts_id"])
+        assert report["error"].isnull().all()
+
+    @pytest.mark.parametrize(
+        "name", loc_tests,
+    )
+    def test_store_by_df_fingerprints(self, name, cwms_loc, tmp_path):
+        cwms = cwms_loc
+        cwms.fingerprints = TsFingerprints(str(tmp_path / "fingerprints.sqlite"))
+        df = pd.read_json("test/data/data.json")
+        cwms.store_by_df(df, timezone="UTC", only_add_different=False)
+        with self._caplog.at_level(logging.INFO):
+            report = cwms.store_by_df(
+                df, timezone="UTC", only_add_different=False, return_report=True
+            )
+            assert report.empty
+            assert "No new data to load for" in self._caplog.records[-1].message
+        cwms.fingerprints.close()
+
+    @pytest.mark.parametrize(
+        "name", loc_tests,
+    )
+    def test_store_by_df_fingerprints_no_read_back(self, name, cwms_loc, tmp_path):
+        cwms = cwms_loc
+        cwms.fingerprints = TsFingerprints(str(tmp_path / "fingerprints.sqlite"))
+        df = pd.read_json("test/data/data.json")
+        cwms.store_by_df(df, timezone="UTC")
+        calls = []
+
+        def counted(function):
+            def wrapper(*args, **kwargs):
+                calls.append(function.__name__)
+                return function(*args, **kwargs)
+
+            return wrapper
+
+        cwms.retrieve_ts = counted(cwms.retrieve_ts)
+        cwms.retrieve_ts_multi = counted(cwms.retrieve_ts_multi)
+        report = cwms.store_by_df(df, timezone="UTC", return_report=True)
+        assert report.empty
+        assert calls == []
+        cwms.fingerprints.close()
+
+    @pytest.mark.parametrize(
+        "name", loc_tests,
+    )
+    def test_store_by_df_plan_runs(self, name, cwms_loc):
+        cwms = cwms_loc
+        df = pd.read_json("test/data/data.json")
+        df["date_time"] = pd.to_datetime(df["date_time"])
+        cwms.store_by_df(df, timezone="UTC")
+        df.loc[df.index[:10], "value"] = df["value"][:10] + 1
+        report = cwms.store_by_df(
+            df, timezone="UTC", plan_runs=True, block_rows=2, return_report=True
+        )
+        assert report["error"].isnull().all()
+        assert report["values"].sum() == df["value"][:10].notnull().sum()
+        for _, row in report.iterrows():
+            assert sum(run["rows"] for run in row["plan"]) == row["values"]
+
+    @pytest.mark.parametrize(
+        "name", loc_tests,
+    )
+    def test_store_by_df_journal(self, name, cwms_loc, tmp_path):
+        cwms = cwms_loc
+        path = str(tmp_path / "load.journal")
+        df = pd.read_json("test/data/data.json")
+        journal = LoadJournal(path)
+        cwms.store_by_df(df, timezone="UTC", journal=journal)
+        journal.close()
+        # a restarted load skips everything the journal recorded
+        journal = LoadJournal(path)
+        report = cwms.store_by_df(
+            df, timezone="UTC", journal=journal, return_report=True
+        )
+        journal.close()
+        assert report.empty
+
+
+class TestTsHelpers(object):
+    """Offline tests of the frame and plan helpers, no database needed."""
+
+    def test_store_groups_sorts_unsorted_input(self):
+        df = pd.DataFrame(
+            {
+                "ts_id": ["B", "A", "B", "A", None],
+                "units": "cms",
+                "date_time": pd.to_datetime(
+                    [
+                        "2019-01-02",
+                        "2019-01-03",
+                        "2019-01-01",
+                        "2019-01-01",
+                        "2019-01-01",
+                    ]
+                ),
+                "value": [2, 3, 1, 1, 9],
+            }
+        )
+        groups = _store_groups(df, "UTC")
+        assert [g for g, _ in groups] == [("A", "cms", "UTC"), ("B", "cms", "UTC")]
+        a = groups[0][1]
+        assert list(a["date_time"]) == list(
+            pd.to_datetime(["2019-01-01", "2019-01-03"])
+        )
+        assert list(a["value"]) == [1.0, 3.0]
+        assert list(a["quality_code"]) == [0, 0]
+        assert list(groups[1][1]["value"]) == [1.0, 2.0]
+
+    def test_store_groups_keeps_local_time_of_aware_input(self):
+        date_time = pd.date_range(
+            "2019-11-03 00:00", periods=4, freq="h", tz="US/Central"
+        )
+        df = pd.DataFrame(
+            {
+                "ts_id": "A",
+                "units": "cms",
+                "time_zone": "US/Central",
+                "date_time": date_time,
+                "value": range(4),
+                "quality_code": [0, 3, None, 3],
+            }
+        )
+        ((_, group),) = _store_groups(df)
+        # the fall back hour repeats 01:00 in local time
+        assert list(group["date_time"].dt.hour) == [0, 1, 1, 2]
+        assert list(group["quality_code"]) == [0, 3, 0, 3]
+
+    def test_changed_rows(self):
+        current = pd.DataFrame(
+            {
+                "date_time": pd.to_datetime(
+                    ["2019-01-01", "2019-01-02", "2019-01-03", "2019-01-04"]
+                ),
+                "value": [1.0, 2.0, 3.0, np.nan],
+                "quality_code": [0, 0, 0, 5],
+            }
+        )
+        # unsorted, with a new time, a changed value, a value within the
+        # tolerance, a changed quality and two missing values
+        new = pd.DataFrame(
+            {
+                "date_time": pd.to_datetime(
+                    [
+                        "2019-01-05",
+                        "2019-01-04",
+                        "2019-01-03",
+                        "2019-01-02",
+                        "2019-01-01",
+                    ]
+                ),
+                "value": [5.0, np.nan, 3.0, 2.005, 1.5],
+                "quality_code": [0, 0, 3, 0, 0],
+            }
+        )
+        changed = _changed_rows(new, current, tolerance=0.01)
+        assert list(changed["date_time"].dt.day) == [1, 3, 5]
+        assert _changed_rows(new, None) is new
+
+    def test_plan_runs(self):
+        date_time = pd.date_range("2019-01-01", periods=10, freq="h")
+        group = pd.DataFrame({"date_time": date_time, "value": range(10)})
+        # row 3 is unchanged and a time step is missing after row 7
+        new_data = group.drop(index=3)
+        new_data.loc[8:, "date_time"] += pd.Timedelta(hours=1)
+        runs = _plan_runs(new_data, 3600000, "REPLACE ALL", block_rows=4)
+        assert [(r["start"], r["end"], r["rows"]) for r in runs] == [
+            (0, 3, 3),
+            (3, 7, 4),
+            (7, 9, 2),
+        ]
+        assert [r["action"] for r in runs] == [
+            "REPLACE ALL",
+            "DELETE INSERT",
+            "REPLACE ALL",
+        ]
+        assert runs[1]["start_time"] == date_time[4]
+        assert runs[1]["end_time"] == date_time[7]
+
+        # irregular series only break where rows were dropped
+        runs = _plan_runs(new_data, None, "REPLACE ALL", block_rows=4)
+        assert [r["rows"] for r in runs] == [3, 6]
+        assert {r["action"] for r in runs} == {"REPLACE ALL"}
+        runs = _plan_runs(new_data, 3600000, "DO NOT REPLACE", block_rows=4)
+        assert {r["action"] for r in runs} == {"DO NOT REPLACE"}
+
+    def test_delete_plan_dst(self):
+        local = pd.to_datetime(
+            [
+                "2019-11-03 04:00",
+                "2019-11-03 00:00",
+                "2019-03-10 02:00",
+                "2019-11-03 02:00",
+                "2019-11-03 01:00",
+                "2019-11-03 03:00",
+                "2019-11-03 03:00",
+            ]
+        )
+        windows, others, unknown = _delete_plan(
+            local, "US/Central", 3600000, window_rows=3
+        )
+        # 00:00 CDT, then 02:00 to 04:00 CST, an hour after the repeated 01:00
+        assert windows == [(datetime(2019, 11, 3, 8), datetime(2019, 11, 3, 10))]
+        assert others == [datetime(2019, 11, 3, 5)]
+        # missing (spring forward) and ambiguous (fall back) local times
+        assert unknown == [datetime(2019, 3, 10, 2), datetime(2019, 11, 3, 1)]
+
+    def test_delete_plan_unknown_time_zone(self):
+        local = pd.to_datetime(["2019-01-02", "2019-01-01", "2019-01-02"])
+        assert _delete_plan(local, "Not/AZone", 3600000) == (
+            [],
+            [],
+            [datetime(2019, 1, 1), datetime(2019, 1, 2)],
+        )
+
+    def test_parse_time_series(self):
+        ts = [
+            {
+                "name": "A",
+                "regular-interval-values": {
+                    "unit": "cms unit=cms",
+                    "segments": [
+                        # hourly across the fall back hour
+                        {
+                            "first-time": "2019-11-03T00:00:00-05:00",
+                            "last-time": "2019-11-03T02:00:00-06:00",
+                            "value-count": 4,
+                            "values": [[0, 0], [1, 0], [2, 3], [3, 0]],
+                        }
+                    ],
+                },
+            },
+            {
+                "name": "B",
+                "irregular-interval-values": {
+                    "unit": "ft",
+                    "values": [
+                        ["2019-11-03T01:30:00-05:00", 5.5, 0],
+                        ["2019-11-03T01:30:00-06:00", 6.5, None],
+                    ],
+                },
+            },
+        ]
+        df = _parse_time_series(ts, "US/Central")
+        assert list(df["ts_id"]) == ["A"] * 4 + ["B"] * 2
+        assert list(df["units"]) == ["cms"] * 4 + ["ft"] * 2
+        assert (df["time_zone"] == "US/Central").all()
+        utc = df["date_time"].dt.tz_convert("UTC").dt.tz_localize(None)
+        expected = list(pd.date_range("2019-11-03 05:00", periods=4, freq="h")) + [
+            pd.Timestamp("2019-11-03 06:30"),
+            pd.Timestamp("2019-11-03 07:30"),
+        ]
+        assert list(utc) == expected
+        assert list(df["value"]) == [0.0, 1.0, 2.0, 3.0, 5.5, 6.5]
+        assert list(df["quality_code"]) == [0, 0, 3, 0, 0, 0]
+
+    def test_parse_time_series_keeps_payload_offset(self):
+        ts = [
+            {
+                "name": "A",
+                "irregular-interval-values": {
+                    "unit": "cms",
+                    "values": [
+                        ["2019-01-01T00:00:00-08:00", 1.0, 0],
+                        ["2019-01-01T06:00:00-08:00", 2.0, 0],
+                    ],
+                },
+            }
+        ]
+        df = _parse_time_series(ts, "UTC")
+        assert list(df["date_time"].dt.hour) == [0, 6]
+        assert df["date_time"].dt.tz.utcoffset(None) == timedelta(hours=-8)
+        assert _parse_time_series([], "UTC").empty
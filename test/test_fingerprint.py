@@ -0,0 +1,75 @@
+# -*- coding: utf-8 -*-
+import numpy as np
+import pandas as pd
+import pytest
+
+from cwmspy.fingerprint import TsFingerprints
+
+
+KEY = ("CWMSPY.Flow.Inst.1Hour.0.FINGERPRINT", "cms", None, None)
+
+
+@pytest.fixture(scope="function")
+def fingerprints(tmp_path):
+    fingerprints = TsFingerprints(str(tmp_path / "fingerprints.sqlite"))
+    yield fingerprints
+    fingerprints.close()
+
+
+def rows(periods=72):
+    """Hourly UTC milliseconds, values and quality codes over three days."""
+    times = pd.date_range("2019-01-01", periods=periods, freq="h")
+    millis = times.values.astype("datetime64[ms]").view("int64")
+    values = np.arange(periods, dtype="float64")
+    qualities = np.zeros(periods, dtype="int64")
+    return millis, values, qualities
+
+
+class TestClass(object):
+    def test_unchanged_days_are_skipped(self, fingerprints):
+        millis, values, qualities = rows()
+        mask, hashes = fingerprints.changed(KEY, millis, values, qualities)
+        assert mask.all()
+        assert len(hashes) == 3
+        fingerprints.update(KEY, hashes)
+
+        mask, hashes = fingerprints.changed(KEY, millis, values, qualities)
+        assert not mask.any()
+        assert hashes == {}
+
+        # a changed value only marks the rows of its own day
+        values[30] = -1.0
+        mask, hashes = fingerprints.changed(KEY, millis, values, qualities)
+        assert list(np.flatnonzero(mask)) == list(range(24, 48))
+        assert len(hashes) == 1
+
+    def test_unsorted_rows_hash_like_sorted_rows(self, fingerprints):
+        millis, values, qualities = rows()
+        _, hashes = fingerprints.changed(KEY, millis, values, qualities)
+        fingerprints.update(KEY, hashes)
+
+        order = np.random.RandomState(0).permutation(len(millis))
+        mask, _ = fingerprints.changed(
+            KEY, millis[order], values[order], qualities[order]
+        )
+        assert not mask.any()
+
+    def test_keys_and_invalidate(self, fingerprints):
+        millis, values, qualities = rows()
+        _, hashes = fingerprints.changed(KEY, millis, values, qualities)
+        fingerprints.update(KEY, hashes)
+
+        # other units are another key, the identifier is case insensitive
+        other = (KEY[0], "cfs", None, None)
+        assert fingerprints.changed(other, millis, values, qualities)[0].all()
+        lower = (KEY[0].lower(),) + KEY[1:]
+        assert not fingerprints.changed(lower, millis, values, qualities)[0].any()
+
+        fingerprints.invalidate(KEY[0].lower())
+        assert fingerprints.changed(KEY, millis, values, qualities)[0].all()
+
+    def test_no_rows(self, fingerprints):
+        empty = np.zeros(0, dtype="int64")
+        mask, hashes = fingerprints.changed(KEY, empty, empty, empty)
+        assert len(mask) == 0
+        assert hashes == {}
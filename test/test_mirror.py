@@ -0,0 +1,52 @@
+# -*- coding: utf-8 -*-
+from datetime import datetime
+import math
+
+import pandas as pd
+import pytest
+
+from cwmspy.mirror import TsMirror
+
+
+@pytest.fixture(scope="function")
+def cwms_data(location):
+    connection = location
+    p_cwms_ts_id = "CWMSPY.Flow.Inst.0.0.REV"
+    times = pd.date_range(datetime(2016, 12, 31), periods=400)
+    values = [math.sin(x) for x in range(len(times))]
+    connection.store_ts(
+        p_cwms_ts_id=p_cwms_ts_id,
+        p_units="cms",
+        times=list(times),
+        values=values,
+        p_override_prot="T",
+        timezone="UTC",
+    )
+    yield connection, p_cwms_ts_id
+
+
+class TestClass(object):
+    @pytest.mark.parametrize(
+        "name", [("pm3"), ("pt7")],
+    )
+    def test_mirror_matches_database(self, name, cwms_data, tmp_path):
+        cwms, p_cwms_ts_id = cwms_data
+        mirror = TsMirror(cwms, str(tmp_path))
+        mirror.retrieve_ts(p_cwms_ts_id, "2017/03/01", "2017/06/01", p_units="cms")
+        df = mirror.retrieve_ts(p_cwms_ts_id, "2017/01/01", "2017/12/31", p_units="cms")
+        expected = cwms.retrieve_ts(
+            p_cwms_ts_id, "2017/01/01", "2017/12/31", p_units="cms", p_previous="F",
+        )
+        assert df[["date_time", "value"]].equals(expected[["date_time", "value"]])
+
+    @pytest.mark.parametrize(
+        "name", [("pm3"), ("pt7")],
+    )
+    def test_mirror_reads_held_window_from_disk(self, name, cwms_data, tmp_path):
+        cwms, p_cwms_ts_id = cwms_data
+        mirror = TsMirror(cwms, str(tmp_path))
+        df = mirror.retrieve_ts(p_cwms_ts_id, "2017/01/01", "2017/12/31")
+        cwms.close()
+        cached = mirror.retrieve_ts(p_cwms_ts_id, "2017/02/01", "2017/02/28")
+        assert cached["date_time"].min() == pd.Timestamp("2017-02-01")
+        assert len(cached) == 29
@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+import threading
+from datetime import datetime, timedelta
+
+import pandas as pd
+import pytest
+
+from cwmspy.writer import BufferedWriter
+
+
+class BlockingStore(object):
+    """Stands in for a connected instance whose stores wait for `release`."""
+
+    def __init__(self):
+        self.release = threading.Event()
+
+    def store_by_df(self, df, return_report=True, **kwargs):
+        self.release.wait(10)
+        return pd.DataFrame(columns=["ts_id", "units", "time_zone", "error"])
+
+
+class TestClass(object):
+    def test_write_blocked_by_backpressure_raises_on_close(self):
+        cwms = BlockingStore()
+        writer = BufferedWriter(cwms, max_rows=1, max_age=60, max_pending_rows=1)
+        start = datetime(2019, 1, 1)
+        writer.write("CWMSPY.Flow.Inst.1Hour.0.BUFFERED", "cms", [start], [0])
+        errors = []
+
+        def write():
+            try:
+                writer.write(
+                    "CWMSPY.Flow.Inst.1Hour.0.BUFFERED",
+                    "cms",
+                    [start + timedelta(hours=1)],
+                    [1],
+                )
+            except ValueError as e:
+                errors.append(e)
+
+        blocked = threading.Thread(target=write)
+        blocked.start()
+        closing = threading.Thread(target=writer.close)
+        closing.start()
+        blocked.join(5)
+        assert not blocked.is_alive()
+        assert [str(e) for e in errors] == ["BufferedWriter is closed"]
+        cwms.release.set()
+        closing.join(5)
+        assert writer.stats()["rows_flushed"] == 1
+
+    @pytest.mark.parametrize(
+        "name", [("pm3"), ("pt7")],
+    )
+    def test_buffered_writer(self, name, pool_location):
+        cwms = pool_location
+        p_cwms_ts_id = "CWMSPY.Flow.Inst.1Hour.0.BUFFERED"
+        start = datetime(2019, 1, 1)
+        with cwms.buffered_writer(max_rows=100, max_age=0.5) as writer:
+            for i in range(250):
+                writer.write(p_cwms_ts_id, "cms", [start + timedelta(hours=i)], [i])
+        stats = writer.stats()
+        assert stats["rows_flushed"] == 250
+        assert stats["queued_rows"] == 0
+
+        df = cwms.retrieve_ts(
+            p_cwms_ts_id, "2019/01/01", "2019/01/31", p_units="cms", p_previous="F"
+        )
+        assert list(df["value"]) == [float(i) for i in range(250)]